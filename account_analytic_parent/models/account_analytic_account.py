@@ -7,6 +7,8 @@
 # Copyright 2019 Pesol
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
+from collections import defaultdict
+
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
 
@@ -42,52 +44,59 @@ class AccountAnalyticAccount(models.Model):
         """
         res = super()._compute_debit_credit_balance()
 
-        ResCurrency = self.env["res.currency"]
-        AccountAnalyticLine = self.env["account.analytic.line"]
-        user_currency_id = self.env.user.company_id.currency_id
-
         # Re-compute only accounts with children
-        for account in self.filtered("child_ids"):
-            domain = [("account_id", "child_of", account.id)]
-
-            credit_groups = AccountAnalyticLine.read_group(
-                domain=domain + [("amount", ">=", 0.0)],
-                fields=["currency_id", "amount"],
-                groupby=["currency_id"],
-                lazy=False,
-            )
-            credit = sum(
-                map(
-                    lambda x: ResCurrency.browse(x["currency_id"][0])._convert(
-                        x["amount"],
-                        user_currency_id,
-                        self.env.user.company_id,
-                        fields.Date.today(),
-                    ),
-                    credit_groups,
-                )
-            )
+        accounts = self.filtered("child_ids")
+        if not accounts:
+            return res
+        company = self.env.user.company_id
+        user_currency_id = company.currency_id
+        AccountAnalyticLine = self.env["account.analytic.line"]
 
-            debit_groups = AccountAnalyticLine.read_group(
-                domain=domain + [("amount", "<", 0.0)],
-                fields=["currency_id", "amount"],
-                groupby=["currency_id"],
-                lazy=False,
-            )
-            debit = sum(
-                map(
-                    lambda x: ResCurrency.browse(x["currency_id"][0])._convert(
-                        x["amount"],
-                        user_currency_id,
-                        self.env.user.company_id,
-                        fields.Date.today(),
-                    ),
-                    debit_groups,
+        # Amounts of the lines of the whole subtrees, grouped once by account
+        domain = [("account_id", "child_of", accounts.ids)]
+        amounts = defaultdict(lambda: defaultdict(float))
+        for field_name, sign_domain in (
+            ("credit", [("amount", ">=", 0.0)]),
+            ("debit", [("amount", "<", 0.0)]),
+        ):
+            for line_account, currency, amount in AccountAnalyticLine._read_group(
+                domain=domain + sign_domain,
+                groupby=["account_id", "currency_id"],
+                aggregates=["amount:sum"],
+            ):
+                amounts[(line_account, currency)][field_name] += amount
+
+        # Distribute the amounts of each account to its ancestors
+        totals = defaultdict(lambda: defaultdict(float))
+        account_ids = set(accounts.ids)
+        for (line_account, currency), values in amounts.items():
+            ancestor_ids = [
+                int(account_id)
+                for account_id in (line_account.parent_path or "").split("/")
+                if account_id and int(account_id) in account_ids
+            ]
+            for field_name, amount in values.items():
+                for ancestor_id in ancestor_ids:
+                    totals[ancestor_id][(field_name, currency)] += amount
+
+        # Conversion rate fetched once per currency
+        rates = {}
+        for __, currency in amounts:
+            if currency not in rates:
+                rates[currency] = (
+                    currency._get_conversion_rate(
+                        currency, user_currency_id, company, fields.Date.today()
+                    )
+                    if currency and currency != user_currency_id
+                    else 1.0
                 )
-            )
 
-            account.debit = abs(debit)
-            account.credit = credit
+        for account in accounts:
+            balances = {"debit": 0.0, "credit": 0.0}
+            for (field_name, currency), amount in totals[account.id].items():
+                balances[field_name] += user_currency_id.round(amount * rates[currency])
+            account.debit = abs(balances["debit"])
+            account.credit = balances["credit"]
             account.balance = account.credit - account.debit
         return res
 
@@ -135,3 +135,20 @@ class TestAccountAnalyticRecursion(TransactionCase):
         display_name = f"[{self.analytic_son.code}] parent aa / son aa"
         self.assertEqual(self.analytic_son.complete_name, "parent aa / son aa")
         self.assertEqual(self.analytic_son.display_name, display_name)
+
+    def test_debit_credit_balance_grandchild(self):
+        grandchild = self.create_analytic_account(
+            {
+                "name": "grandchild aa",
+                "code": "03",
+                "parent_id": self.analytic_son.id,
+                "plan_id": self.plan.id,
+            }
+        )
+        self.create_analytic_line("Analytic line grandchild", grandchild, 20)
+        self.create_analytic_line("Analytic line grandchild 2", grandchild, -5)
+        accounts = self.analytic_parent1 | self.analytic_son | grandchild
+        accounts.invalidate_recordset(["debit", "credit", "balance"])
+        self.assertEqual(accounts.mapped("credit"), [170, 70, 20])
+        self.assertEqual(accounts.mapped("debit"), [5, 5, 5])
+        self.assertEqual(accounts.mapped("balance"), [165, 65, 15])
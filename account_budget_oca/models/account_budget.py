@@ -2,6 +2,7 @@
 
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
 
 from_string = fields.Datetime.from_string
 
@@ -130,6 +131,16 @@ class CrossoveredBudgetLines(models.Model):
     paid_date = fields.Date()
     planned_amount = fields.Float(required=True, digits=0)
     practical_amount = fields.Float(compute="_compute_practical_amount", digits=0)
+    practical_amount_cached = fields.Float(
+        string="Practical Amount (Cached)",
+        digits=0,
+        readonly=True,
+        help="Practical amount stored by the 'Refresh budget practical amounts' "
+        "scheduled action.",
+    )
+    practical_amount_date = fields.Datetime(
+        string="Practical Amount Refreshed On", readonly=True
+    )
     theoretical_amount = fields.Float(compute="_compute_theoretical_amount", digits=0)
     percentage = fields.Float(compute="_compute_percentage", string="Achievement")
     company_id = fields.Many2one(
@@ -140,24 +151,63 @@ class CrossoveredBudgetLines(models.Model):
         "general_budget_id.account_ids", "date_from", "date_to", "analytic_account_id"
     )
     def _compute_practical_amount(self):
-        for line in self:
-            result = 0.0
-            acc_ids = line.general_budget_id.account_ids.ids
-            date_to = line.date_to
-            date_from = line.date_from
-            if line.analytic_account_id.id and date_from and date_to:
-                self.env.cr.execute(
-                    """
-                    SELECT SUM(amount)
-                    FROM account_analytic_line
-                    WHERE account_id=%s
-                        AND (date between %s
-                        AND %s)
-                        AND general_account_id=ANY(%s)""",
-                    (line.analytic_account_id.id, date_from, date_to, acc_ids),
+        amounts = self._get_practical_amounts()
+        for index, line in enumerate(self):
+            line.practical_amount = amounts.get(index, 0.0)
+
+    def _get_practical_amounts(self):
+        """Sum of the analytic lines of each budget line, indexed by position in
+        ``self``, read with a single query for the whole recordset.
+        """
+        values = [
+            SQL(
+                "(%s, %s, %s::date, %s::date, %s::integer[])",
+                index,
+                line.analytic_account_id.id,
+                line.date_from,
+                line.date_to,
+                line.general_budget_id.account_ids.ids,
+            )
+            for index, line in enumerate(self)
+            if line.analytic_account_id.id and line.date_from and line.date_to
+        ]
+        if not values:
+            return {}
+        self.env["account.analytic.line"].flush_model(
+            ["account_id", "date", "general_account_id", "amount"]
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT budget_line.line_index, SUM(aal.amount)
+                FROM (VALUES %s) AS budget_line(
+                    line_index, account_id, date_from, date_to, general_account_ids
                 )
-                result = self.env.cr.fetchone()[0] or 0.0
-            line.practical_amount = result
+                JOIN account_analytic_line aal
+                    ON aal.account_id = budget_line.account_id
+                    AND aal.date BETWEEN budget_line.date_from AND budget_line.date_to
+                    AND aal.general_account_id = ANY(budget_line.general_account_ids)
+                GROUP BY budget_line.line_index
+                """,
+                SQL(", ").join(values),
+            )
+        )
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _cron_refresh_practical_amount(self):
+        lines = self.search(
+            [("crossovered_budget_id.state", "not in", ["cancel", "done"])]
+        )
+        amounts = lines._get_practical_amounts()
+        now = fields.Datetime.now()
+        for index, line in enumerate(lines):
+            line.write(
+                {
+                    "practical_amount_cached": amounts.get(index, 0.0),
+                    "practical_amount_date": now,
+                }
+            )
 
     @api.depends("paid_date", "date_from", "date_to", "planned_amount")
     def _compute_theoretical_amount(self):
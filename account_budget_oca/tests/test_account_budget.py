@@ -85,3 +85,37 @@ class TestAccountBudget(TestAccountBudgetCommon):
 
         # I check that budget is in "done" state
         self.assertEqual(budget.state, "done")
+
+    def test_practical_amount(self):
+        year = datetime.datetime.now().year + 1
+        analytic_account = self.env["account.analytic.account"].browse(
+            self.ref("analytic.analytic_partners_camp_to_camp")
+        )
+        account = self.account_budget_post_sales0.account_ids[:1]
+        for date, amount in (("01-10", 100.0), ("01-20", 50.0), ("02-10", 30.0)):
+            self.env["account.analytic.line"].create(
+                {
+                    "name": "Budget test",
+                    "account_id": analytic_account.id,
+                    "general_account_id": account.id,
+                    "date": f"{year}-{date}",
+                    "amount": amount,
+                }
+            )
+        lines = self.env["crossovered.budget.lines"].search(
+            [
+                ("analytic_account_id", "=", analytic_account.id),
+                ("general_budget_id", "=", self.account_budget_post_sales0.id),
+            ],
+            order="date_from",
+        )
+        lines.invalidate_recordset(["practical_amount"])
+        queries_before = self.env.cr.sql_log_count
+        lines.mapped("practical_amount")
+        self.assertLessEqual(self.env.cr.sql_log_count - queries_before, 3)
+        self.assertEqual(lines.mapped("practical_amount")[:3], [150.0, 30.0, 0.0])
+        lines._cron_refresh_practical_amount()
+        self.assertEqual(
+            lines.mapped("practical_amount_cached"), lines.mapped("practical_amount")
+        )
+        self.assertTrue(all(lines.mapped("practical_amount_date")))
@@ -19,6 +19,7 @@
     "data": [
         "security/ir.model.access.csv",
         "security/security.xml",
+        "data/ir_cron_data.xml",
         "wizard/aged_partner_balance_wizard_view.xml",
         "wizard/general_ledger_wizard_view.xml",
         "wizard/journal_ledger_wizard_view.xml",
@@ -26,6 +27,7 @@
         "wizard/trial_balance_wizard_view.xml",
         "wizard/vat_report_wizard_view.xml",
         "view/account_age_report_configuration_views.xml",
+        "view/account_financial_report_job_views.xml",
         "menuitems.xml",
         "reports.xml",
         "report/templates/layouts.xml",
@@ -4,3 +4,7 @@ from . import account
 from . import account_move_line
 from . import ir_actions_report
 from . import res_config_settings
+from . import account_financial_report_job
+from . import account_move
+from . import account_balance_snapshot
+from . import res_company
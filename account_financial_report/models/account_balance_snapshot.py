@@ -0,0 +1,283 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+import logging
+import time
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Months computed again from the journal items at each run of the cron, in case
+# entries were posted while the previous run advanced the snapshot
+REPAIR_MONTHS = 1
+
+
+class AccountBalanceSnapshot(models.Model):
+    """Amounts of the posted journal items of the closed months, per company,
+    account, partner and month.
+
+    The months before the ``account_balance_snapshot_date`` of the company are
+    stored here. The snapshot is kept up to date when entries of those months are
+    posted, reset to draft or cancelled and when their posted journal items are
+    created or changed, and advanced each month by a cron, so that the reports only
+    read the journal items after that date.
+    """
+
+    _name = "account.balance.snapshot"
+    _description = "Account Balance Snapshot"
+    _log_access = False
+
+    company_id = fields.Many2one("res.company", required=True, readonly=True)
+    account_id = fields.Many2one("account.account", required=True, readonly=True)
+    partner_id = fields.Many2one("res.partner", readonly=True)
+    date = fields.Date(required=True, readonly=True, help="First day of the month")
+    debit = fields.Float(readonly=True)
+    credit = fields.Float(readonly=True)
+    balance = fields.Float(readonly=True)
+    amount_currency = fields.Float(readonly=True)
+    line_count = fields.Integer(readonly=True)
+
+    def init(self):
+        self.env.cr.execute(
+            SQL(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS %s
+                ON %s (company_id, account_id, COALESCE(partner_id, 0), date)
+                """,
+                SQL.identifier(f"{self._table}_key_uniq"),
+                SQL.identifier(self._table),
+            )
+        )
+
+    @api.model
+    def _get_snapshot_end(self, company, date):
+        """First day of the month of ``date``, or of the first month not in the
+        snapshot of ``company`` when earlier; None when there is no snapshot.
+        """
+        snapshot_date = company.account_balance_snapshot_date
+        if not snapshot_date or not date:
+            return None
+        return min(snapshot_date, fields.Date.to_date(date).replace(day=1))
+
+    @api.model
+    def _read_balances(
+        self,
+        company,
+        date_to,
+        date_from=None,
+        account_ids=None,
+        partner_ids=None,
+        groupby=("account_id",),
+    ):
+        """Amounts of the posted journal items of ``company`` dated from
+        ``date_from`` to ``date_to`` excluded (None for no limit), grouped by
+        ``groupby`` (``account_id`` and/or ``partner_id``, nothing for a total).
+
+        The whole months of the snapshot in that range are read from the
+        snapshot, only the journal items of the other days are read.
+        """
+        if account_ids is not None and not account_ids:
+            return []
+        date_to = fields.Date.to_date(date_to) if date_to else None
+        date_from = fields.Date.to_date(date_from) if date_from else None
+        snapshot_from = date_from
+        if date_from and date_from.day != 1:
+            snapshot_from = date_from.replace(day=1) + relativedelta(months=1)
+        snapshot_to = company.account_balance_snapshot_date
+        if date_to:
+            snapshot_to = self._get_snapshot_end(company, date_to)
+        filters = []
+        if account_ids is not None:
+            filters.append(SQL("account_id IN %s", tuple(account_ids)))
+        if partner_ids:
+            filters.append(SQL("partner_id IN %s", tuple(partner_ids)))
+        line_dates = [SQL("TRUE")]
+        if date_to:
+            line_dates.append(SQL("date < %s", date_to))
+        if date_from:
+            line_dates.append(SQL("date >= %s", date_from))
+        line_dates = SQL(" AND ").join(line_dates)
+        snapshot_lines = SQL()
+        if snapshot_to and (not snapshot_from or snapshot_from < snapshot_to):
+            snapshot_dates = [SQL("date < %s", snapshot_to)]
+            if snapshot_from:
+                snapshot_dates.append(SQL("date >= %s", snapshot_from))
+            snapshot_dates = SQL(" AND ").join(snapshot_dates)
+            line_dates = SQL("%s AND NOT (%s)", line_dates, snapshot_dates)
+            snapshot_lines = SQL(
+                """
+                UNION ALL
+                SELECT account_id, partner_id, debit, credit, balance,
+                    amount_currency, line_count
+                FROM %s
+                WHERE company_id = %s AND %s
+                """,
+                SQL.identifier(self._table),
+                company.id,
+                SQL(" AND ").join([snapshot_dates, *filters]),
+            )
+        self.env["account.move.line"].flush_model()
+        select = group_by = SQL()
+        if groupby:
+            groupby = SQL(", ").join(SQL.identifier(name) for name in groupby)
+            select = SQL("%s,", groupby)
+            group_by = SQL("GROUP BY %s", groupby)
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT %(select)s
+                    SUM(debit) AS debit,
+                    SUM(credit) AS credit,
+                    SUM(balance) AS balance,
+                    SUM(amount_currency) AS amount_currency,
+                    SUM(line_count) AS line_count
+                FROM (
+                    SELECT account_id, partner_id, debit, credit, balance,
+                        amount_currency, 1 AS line_count
+                    FROM account_move_line
+                    WHERE company_id = %(company_id)s
+                        AND parent_state = 'posted'
+                        AND account_id IS NOT NULL
+                        AND %(where)s
+                    %(snapshot_lines)s
+                ) lines
+                %(group_by)s
+                HAVING SUM(line_count) != 0
+                """,
+                select=select,
+                group_by=group_by,
+                company_id=company.id,
+                where=SQL(" AND ").join([line_dates, *filters]),
+                snapshot_lines=snapshot_lines,
+            )
+        )
+        return self.env.cr.dictfetchall()
+
+    @api.model
+    def _add_move_lines(self, where, sign=1):
+        """Add the amounts of the journal items matching ``where`` (an SQL
+        condition on ``aml``) to the snapshot, or subtract them when ``sign`` is -1.
+        """
+        self.env["account.move.line"].flush_model()
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO %(table)s (
+                    company_id, account_id, partner_id, date,
+                    debit, credit, balance, amount_currency, line_count
+                )
+                SELECT
+                    aml.company_id, aml.account_id, aml.partner_id,
+                    DATE_TRUNC('month', aml.date)::date,
+                    %(sign)s * SUM(aml.debit),
+                    %(sign)s * SUM(aml.credit),
+                    %(sign)s * SUM(aml.balance),
+                    %(sign)s * SUM(aml.amount_currency),
+                    %(sign)s * COUNT(*)
+                FROM account_move_line aml
+                WHERE aml.account_id IS NOT NULL AND %(where)s
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT (company_id, account_id, COALESCE(partner_id, 0), date)
+                DO UPDATE SET
+                    debit = %(table)s.debit + EXCLUDED.debit,
+                    credit = %(table)s.credit + EXCLUDED.credit,
+                    balance = %(table)s.balance + EXCLUDED.balance,
+                    amount_currency = %(table)s.amount_currency
+                        + EXCLUDED.amount_currency,
+                    line_count = %(table)s.line_count + EXCLUDED.line_count
+                """,
+                table=SQL.identifier(self._table),
+                sign=sign,
+                where=where,
+            )
+        )
+
+    @api.model
+    def _update_moves(self, moves, sign):
+        """Add (``sign`` 1) or remove (``sign`` -1) the posted ``moves`` dated
+        in the snapshot of their company.
+        """
+        moves = moves.filtered(
+            lambda move: move.company_id.account_balance_snapshot_date
+            and move.date < move.company_id.account_balance_snapshot_date
+        )
+        if not moves:
+            return
+        self._add_move_lines(SQL("aml.move_id IN %s", tuple(moves.ids)), sign=sign)
+        self._delete_empty()
+
+    @api.model
+    def _update_move_lines(self, lines, sign):
+        """Add (``sign`` 1) or remove (``sign`` -1) the posted journal items
+        ``lines`` dated in the snapshot of their company.
+        """
+        lines = lines.filtered(
+            lambda line: line.parent_state == "posted"
+            and line.company_id.account_balance_snapshot_date
+            and line.date < line.company_id.account_balance_snapshot_date
+        )
+        if not lines:
+            return
+        self._add_move_lines(SQL("aml.id IN %s", tuple(lines.ids)), sign=sign)
+        self._delete_empty()
+
+    @api.model
+    def _delete_empty(self):
+        self.env.cr.execute(
+            SQL("DELETE FROM %s WHERE line_count = 0", SQL.identifier(self._table))
+        )
+
+    @api.model
+    def _compute_months(self, company, date_from, date_to):
+        """(Re)compute the months from ``date_from`` (None for all) to
+        ``date_to`` excluded of ``company``.
+        """
+        conditions = [SQL("company_id = %s", company.id), SQL("date < %s", date_to)]
+        if date_from:
+            conditions.append(SQL("date >= %s", date_from))
+        self.env.cr.execute(
+            SQL(
+                "DELETE FROM %s WHERE %s",
+                SQL.identifier(self._table),
+                SQL(" AND ").join(conditions),
+            )
+        )
+        line_conditions = [
+            SQL("aml.company_id = %s", company.id),
+            SQL("aml.parent_state = 'posted'"),
+            SQL("aml.date < %s", date_to),
+        ]
+        if date_from:
+            line_conditions.append(SQL("aml.date >= %s", date_from))
+        self._add_move_lines(SQL(" AND ").join(line_conditions))
+
+    @api.model
+    def _cron_update_snapshots(self, companies=None):
+        """Snapshot the months before the current one of every company."""
+        companies = companies or self.env["res.company"].search([])
+        for company in companies:
+            start = time.perf_counter()
+            snapshot_end = fields.Date.context_today(self).replace(day=1)
+            snapshot_date = company.account_balance_snapshot_date
+            date_from = None
+            if snapshot_date:
+                date_from = snapshot_date - relativedelta(months=REPAIR_MONTHS)
+            self._compute_months(company, date_from, snapshot_end)
+            company.account_balance_snapshot_date = snapshot_end
+            _logger.info(
+                "Balance snapshot of company %s computed from %s to %s in %.2fs",
+                company.id,
+                date_from or "the beginning",
+                snapshot_end,
+                time.perf_counter() - start,
+            )
+
+    @api.model
+    def _rebuild_snapshots(self, companies=None):
+        """Compute again the whole snapshot of ``companies``."""
+        companies = companies or self.env["res.company"].search([])
+        companies.account_balance_snapshot_date = False
+        self._cron_update_snapshots(companies)
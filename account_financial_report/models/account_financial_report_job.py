@@ -0,0 +1,216 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+import hashlib
+import json
+import logging
+
+from odoo import _, api, fields, models
+from odoo.tools import json_default
+
+_logger = logging.getLogger(__name__)
+
+# Generated reports are kept this number of days
+JOB_MAX_DAYS = 7
+
+
+class AccountFinancialReportJob(models.Model):
+    """Report rendered in background by the 'Generate financial reports' cron.
+
+    Jobs are looked up by report, user, parameters hash and last update of the
+    journal items of the company, so that identical requests reuse the pending
+    job or the file already generated.
+    """
+
+    _name = "account.financial.report.job"
+    _description = "Financial Report Job"
+    _order = "id desc"
+
+    name = fields.Char(required=True)
+    report_id = fields.Many2one(
+        "ir.actions.report", required=True, readonly=True, ondelete="cascade"
+    )
+    data = fields.Json(readonly=True)
+    wizard_model = fields.Char(readonly=True)
+    wizard_values = fields.Json(
+        readonly=True,
+        help="Values of the wizard, created again to generate the report.",
+    )
+    params_hash = fields.Char(readonly=True, index=True)
+    last_move_write_date = fields.Datetime(
+        readonly=True,
+        help="Last update of the journal items of the company when the report was "
+        "requested.",
+    )
+    user_id = fields.Many2one(
+        "res.users", required=True, readonly=True, default=lambda self: self.env.user
+    )
+    company_id = fields.Many2one(
+        "res.company", readonly=True, default=lambda self: self.env.company
+    )
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        required=True,
+        readonly=True,
+        default="pending",
+    )
+    attachment_id = fields.Many2one("ir.attachment", readonly=True)
+    error = fields.Text(readonly=True)
+
+    @api.model
+    def _get_params_hash(self, data):
+        # The wizard record is not a parameter, only its values are
+        params = {key: value for key, value in data.items() if key != "wizard_id"}
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    @api.model
+    def _get_last_move_write_date(self, company_id):
+        """Latest update of the journal items, changed as well when their entry
+        is posted or reset to draft and when they are (un)reconciled.
+        """
+        domain = [("company_id", "=", company_id)] if company_id else []
+        return (
+            self.env["account.move.line"]
+            .sudo()
+            ._read_group(domain, aggregates=["write_date:max"])[0][0]
+        )
+
+    @api.model
+    def _enqueue(self, report, data, wizard):
+        """Return the action giving the result of the report of ``wizard`` for
+        ``data``: the download of the cached file when the same report has already
+        been generated, a notification otherwise.
+        """
+        # Values as they are received by the report when printed from the client
+        data = json.loads(json.dumps(data, default=json_default))
+        company_id = data.get("company_id") or self.env.company.id
+        params_hash = self._get_params_hash(data)
+        last_move_write_date = self._get_last_move_write_date(company_id)
+        job = self.search(
+            [
+                ("report_id", "=", report.id),
+                ("user_id", "=", self.env.uid),
+                ("params_hash", "=", params_hash),
+                ("last_move_write_date", "=", last_move_write_date),
+                ("state", "!=", "failed"),
+            ],
+            limit=1,
+        )
+        if not job:
+            job = self.create(
+                {
+                    "name": report.name,
+                    "report_id": report.id,
+                    "data": data,
+                    "wizard_model": wizard._name,
+                    "wizard_values": json.loads(
+                        json.dumps(wizard.copy_data()[0], default=json_default)
+                    ),
+                    "params_hash": params_hash,
+                    "last_move_write_date": last_move_write_date,
+                    "company_id": company_id,
+                }
+            )
+            self.env.ref(
+                "account_financial_report.ir_cron_account_financial_report_job"
+            )._trigger()
+        if job.state == "done":
+            return job.action_download()
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "type": "info",
+                "message": _(
+                    "The report %s is being generated, you will be notified when "
+                    "it is ready.",
+                    job.name,
+                ),
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
+
+    def action_download(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/web/content/{self.attachment_id.id}?download=true",
+            "target": "self",
+        }
+
+    def _run(self):
+        self.ensure_one()
+        report = self.report_id
+        env = self.with_user(self.user_id).with_company(self.company_id).env
+        # The wizard of the request may have been removed by the vacuum already
+        wizard = env[self.wizard_model].create(self.wizard_values)
+        content, extension = (
+            env["ir.actions.report"]
+            .with_context(active_model=wizard._name, active_ids=wizard.ids)
+            ._render(
+                report.report_name,
+                wizard.ids,
+                data=dict(self.data, wizard_id=wizard.id),
+            )
+        )
+        self.attachment_id = self.env["ir.attachment"].create(
+            {
+                "name": f"{self.name}.{extension}",
+                "raw": content,
+                "res_model": self._name,
+                "res_id": self.id,
+            }
+        )
+        self.state = "done"
+
+    def _notify_user(self):
+        self.ensure_one()
+        if self.state == "done":
+            notification = {
+                "type": "success",
+                "title": _("Report ready"),
+                "message": _(
+                    "The report %s can be downloaded from Financial Report Jobs.",
+                    self.name,
+                ),
+            }
+        else:
+            notification = {
+                "type": "danger",
+                "title": _("Report failed"),
+                "message": _("The report %s could not be generated.", self.name),
+            }
+        self.user_id._bus_send("simple_notification", notification)
+
+    @api.autovacuum
+    def _gc_jobs(self):
+        jobs = self.search(
+            [
+                (
+                    "create_date",
+                    "<",
+                    fields.Datetime.subtract(fields.Datetime.now(), days=JOB_MAX_DAYS),
+                )
+            ]
+        )
+        jobs.attachment_id.unlink()
+        jobs.unlink()
+
+    @api.model
+    def _cron_generate_reports(self, limit=10):
+        jobs = self.search([("state", "=", "pending")], order="id", limit=limit + 1)
+        for job in jobs[:limit]:
+            try:
+                with self.env.cr.savepoint():
+                    job._run()
+            except Exception as e:
+                _logger.exception("Error while generating report job %s", job.id)
+                job.write({"state": "failed", "error": str(e)})
+            job._notify_user()
+        if len(jobs) > limit:
+            self.env.ref(
+                "account_financial_report.ir_cron_account_financial_report_job"
+            )._trigger()
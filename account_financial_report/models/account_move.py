@@ -0,0 +1,24 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    def write(self, vals):
+        if "state" not in vals:
+            return super().write(vals)
+        # Keep the balance snapshot of the closed months up to date
+        snapshot = self.env["account.balance.snapshot"].sudo()
+        posted_before = self.filtered(lambda move: move.state == "posted")
+        snapshot._update_moves(
+            posted_before if vals["state"] != "posted" else self.browse(), -1
+        )
+        # The journal items written along are added or removed with their entry
+        res = super(
+            AccountMove, self.with_context(account_balance_snapshot_moves=True)
+        ).write(vals)
+        if vals["state"] == "posted":
+            snapshot._update_moves(self - posted_before, 1)
+        return res
@@ -5,6 +5,18 @@ from collections import defaultdict
 from odoo import api, fields, models
 from odoo.fields import Command
 
+# Fields of the journal items summed up in the balance snapshot
+SNAPSHOT_FIELDS = {
+    "account_id",
+    "partner_id",
+    "company_id",
+    "date",
+    "debit",
+    "credit",
+    "balance",
+    "amount_currency",
+}
+
 
 class AccountMoveLine(models.Model):
     _inherit = "account.move.line"
@@ -13,6 +25,25 @@ class AccountMoveLine(models.Model):
         "account.analytic.account", compute="_compute_analytic_account_ids", store=True
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        if not self.env.context.get("account_balance_snapshot_moves"):
+            # Journal items added to an entry already posted
+            self.env["account.balance.snapshot"].sudo()._update_move_lines(lines, 1)
+        return lines
+
+    def write(self, vals):
+        in_move_write = self.env.context.get("account_balance_snapshot_moves")
+        if in_move_write or not SNAPSHOT_FIELDS & set(vals):
+            return super().write(vals)
+        # Posted journal items can still be edited, e.g. by the account merge wizard
+        snapshot = self.env["account.balance.snapshot"].sudo()
+        snapshot._update_move_lines(self, -1)
+        res = super().write(vals)
+        snapshot._update_move_lines(self, 1)
+        return res
+
     @api.depends("analytic_distribution")
     def _compute_analytic_account_ids(self):
         # Prefetch all involved analytic accounts
@@ -60,6 +91,18 @@ class AccountMoveLine(models.Model):
             CREATE INDEX account_move_line_account_id_partner_id_index
             ON account_move_line (account_id, partner_id)"""
             )
+        # Latest update of the journal items of a company, looked up by the
+        # financial report jobs for each request
+        self._cr.execute(
+            "SELECT indexname FROM pg_indexes WHERE indexname = %s",
+            ("account_move_line_company_id_write_date_index",),
+        )
+        if not self._cr.fetchone():
+            self._cr.execute(
+                """
+            CREATE INDEX account_move_line_company_id_write_date_index
+            ON account_move_line (company_id, write_date)"""
+            )
 
     @api.model
     def search_count(self, domain, limit=None):
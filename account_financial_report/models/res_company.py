@@ -0,0 +1,14 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import fields, models
+
+
+class ResCompany(models.Model):
+    _inherit = "res.company"
+
+    account_balance_snapshot_date = fields.Date(
+        readonly=True,
+        help="First month whose journal items are not in the balance snapshot read "
+        "by the financial reports. Empty until the snapshot is computed by the "
+        "'Update account balance snapshots' cron.",
+    )
@@ -15,6 +15,9 @@ class AbstractReportXslx(models.AbstractModel):
         vals.update({"constant_memory": True})
         return vals
 
+    def _use_xlsx_streaming(self, data):
+        return True
+
     def generate_xlsx_report(self, workbook, data, objects):
         # Initialize report variables
         report_data = {
@@ -539,9 +542,11 @@ class AbstractReportXslx(models.AbstractModel):
             field_name = f"{field_prefix}_{currency.name}"
             if hasattr(self, field_name):
                 format_amt = getattr(self, field_name)
+            elif field_name in report_data:
+                format_amt = report_data[field_name]
             else:
                 format_amt = report_data["workbook"].add_format()
-                report_data["field_name"] = format_amt
+                report_data[field_name] = format_amt
                 format_amt.set_num_format(self._report_xlsx_currency_format(currency))
         return format_amt
 
@@ -561,9 +566,11 @@ class AbstractReportXslx(models.AbstractModel):
             field_name = f"{field_prefix}_{currency.name}"
             if hasattr(self, field_name):
                 format_amt = getattr(self, field_name)
+            elif field_name in report_data:
+                format_amt = report_data[field_name]
             else:
                 format_amt = report_data["workbook"].add_format()
-                report_data["field_name"] = format_amt
+                report_data[field_name] = format_amt
                 format_amt.set_num_format(self._report_xlsx_currency_format(currency))
         return format_amt
 
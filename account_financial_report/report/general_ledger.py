@@ -6,9 +6,18 @@
 import calendar
 import datetime
 import operator
+import uuid
 
 from odoo import _, api, models
-from odoo.tools import float_is_zero
+from odoo.tools import SQL, float_is_zero
+
+# System parameter holding the number of journal items of the period from
+# which the XLSX general ledger is streamed, 0 disables the streaming.
+STREAMING_THRESHOLD_PARAM = (
+    "account_financial_report.general_ledger_streaming_threshold"
+)
+STREAMING_THRESHOLD_DEFAULT = 100000
+STREAMING_CHUNK_SIZE = 2000
 
 
 class GeneralLedgerReport(models.AbstractModel):
@@ -146,6 +155,9 @@ class GeneralLedgerReport(models.AbstractModel):
             fields=["account_id", "debit", "credit", "balance", "amount_currency:sum"],
             groupby=["account_id"],
         )
+        return self._sum_pl_initial_balance(initial_balances)
+
+    def _sum_pl_initial_balance(self, initial_balances):
         pl_initial_balance = {
             "debit": 0.0,
             "credit": 0.0,
@@ -185,13 +197,17 @@ class GeneralLedgerReport(models.AbstractModel):
                 res[key_bal][key_field] = gl[field_name]
         return res
 
-    def _prepare_gen_ld_data(self, gl_initial_acc, domain, grouped_by):
+    def _prepare_gen_ld_data_accounts(self, gl_initial_acc, grouped_by):
         data = {}
         for gl in gl_initial_acc:
             acc_id = gl["account_id"][0]
             data[acc_id] = self._prepare_gen_ld_data_item(gl)
             data[acc_id]["id"] = acc_id
             data[acc_id][grouped_by] = False
+        return data
+
+    def _prepare_gen_ld_data(self, gl_initial_acc, domain, grouped_by):
+        data = self._prepare_gen_ld_data_accounts(gl_initial_acc, grouped_by)
         method = f"_prepare_gen_ld_data_group_{grouped_by}"
         if not hasattr(self, method):
             return data
@@ -211,6 +227,9 @@ class GeneralLedgerReport(models.AbstractModel):
             groupby=["account_id", "partner_id"],
             lazy=False,
         )
+        return self._prepare_gen_ld_data_partners(data, gl_initial_acc_prt, grouped_by)
+
+    def _prepare_gen_ld_data_partners(self, data, gl_initial_acc_prt, grouped_by):
         if gl_initial_acc_prt:
             for gl in gl_initial_acc_prt:
                 if not gl["partner_id"]:
@@ -255,6 +274,104 @@ class GeneralLedgerReport(models.AbstractModel):
                 data[acc_id][grouped_by] = True
         return data
 
+    def _use_balance_snapshot(
+        self, company_id, only_posted_moves, cost_center_ids, extra_domain, grouped_by
+    ):
+        """The balance snapshot only contains posted entries and isn't split by
+        analytic account nor tax.
+        """
+        return bool(
+            company_id
+            and only_posted_moves
+            and not cost_center_ids
+            and not extra_domain
+            and grouped_by != "taxes"
+            and self.env["res.company"].browse(company_id).account_balance_snapshot_date
+        )
+
+    def _get_snapshot_read_group(
+        self,
+        company_id,
+        date_to,
+        account_ids,
+        partner_ids,
+        date_from=None,
+        groupby=("account_id",),
+    ):
+        """Posted amounts of the journal items, read through the balance snapshot
+        and returned in the format of ``read_group``.
+        """
+        rows = self.env["account.balance.snapshot"]._read_balances(
+            self.env["res.company"].browse(company_id),
+            date_to,
+            date_from=date_from,
+            account_ids=account_ids,
+            partner_ids=partner_ids,
+            groupby=groupby,
+        )
+        partner_names = {}
+        if "partner_id" in groupby:
+            partners = self.env["res.partner"].browse(
+                {row["partner_id"] for row in rows if row["partner_id"]}
+            )
+            partner_names = {partner.id: partner.display_name for partner in partners}
+        for row in rows:
+            row["account_id"] = (row["account_id"], "")
+            if row.get("partner_id"):
+                row["partner_id"] = (
+                    row["partner_id"],
+                    partner_names[row["partner_id"]],
+                )
+        return rows
+
+    def _get_snapshot_accounts(self, account_ids, company_id):
+        accounts_domain = [("company_ids", "in", [company_id])]
+        if account_ids:
+            accounts_domain += [("id", "in", account_ids)]
+        accounts = self.env["account.account"].search(accounts_domain)
+        bs_accounts = accounts.filtered("include_initial_balance")
+        return bs_accounts, accounts - bs_accounts
+
+    def _get_snapshot_initial_balance_data(
+        self, account_ids, partner_ids, company_id, date_from, fy_start_date, grouped_by
+    ):
+        bs_accounts, pl_accounts = self._get_snapshot_accounts(account_ids, company_id)
+        gl_initial_acc = self._get_snapshot_read_group(
+            company_id, date_from, bs_accounts.ids, partner_ids
+        ) + self._get_snapshot_read_group(
+            company_id,
+            date_from,
+            pl_accounts.ids,
+            partner_ids,
+            date_from=fy_start_date,
+        )
+        data = self._prepare_gen_ld_data_accounts(gl_initial_acc, grouped_by)
+        if grouped_by == "partners":
+            acc_prt_accounts = bs_accounts.filtered_domain(
+                self._get_account_type_domain(grouped_by)
+            )
+            gl_initial_acc_prt = self._get_snapshot_read_group(
+                company_id,
+                date_from,
+                acc_prt_accounts.ids,
+                partner_ids,
+                groupby=("account_id", "partner_id"),
+            )
+            data = self._prepare_gen_ld_data_partners(
+                data, gl_initial_acc_prt, grouped_by
+            )
+        return data
+
+    def _get_snapshot_pl_initial_balance(
+        self, account_ids, partner_ids, company_id, fy_start_date
+    ):
+        __, pl_accounts = self._get_snapshot_accounts(account_ids, company_id)
+        return self._sum_pl_initial_balance(
+            self._get_snapshot_read_group(
+                company_id, fy_start_date, pl_accounts.ids, partner_ids
+            )
+        )
+
     def _get_initial_balance_data(
         self,
         account_ids,
@@ -286,13 +403,36 @@ class GeneralLedgerReport(models.AbstractModel):
             base_domain += [("analytic_account_ids", "in", cost_center_ids)]
         if extra_domain:
             base_domain += extra_domain
-        gl_initial_acc = self._get_gl_initial_acc(
-            account_ids, company_id, date_from, fy_start_date, base_domain, grouped_by
+        use_snapshot = self._use_balance_snapshot(
+            company_id, only_posted_moves, cost_center_ids, extra_domain, grouped_by
         )
-        domain = self._get_initial_balances_bs_ml_domain(
-            account_ids, company_id, date_from, base_domain, grouped_by, acc_prt=True
-        )
-        data = self._prepare_gen_ld_data(gl_initial_acc, domain, grouped_by)
+        if use_snapshot:
+            data = self._get_snapshot_initial_balance_data(
+                account_ids,
+                partner_ids,
+                company_id,
+                date_from,
+                fy_start_date,
+                grouped_by,
+            )
+        else:
+            gl_initial_acc = self._get_gl_initial_acc(
+                account_ids,
+                company_id,
+                date_from,
+                fy_start_date,
+                base_domain,
+                grouped_by,
+            )
+            domain = self._get_initial_balances_bs_ml_domain(
+                account_ids,
+                company_id,
+                date_from,
+                base_domain,
+                grouped_by,
+                acc_prt=True,
+            )
+            data = self._prepare_gen_ld_data(gl_initial_acc, domain, grouped_by)
         accounts_ids = list(data.keys())
         unaffected_id = unaffected_earnings_account
         if unaffected_id:
@@ -302,9 +442,18 @@ class GeneralLedgerReport(models.AbstractModel):
                 data[unaffected_id]["id"] = unaffected_id
                 data[unaffected_id]["mame"] = ""
                 data[unaffected_id][grouped_by] = False
-            pl_initial_balance = self._get_pl_initial_balance(
-                account_ids, company_id, fy_start_date, foreign_currency, base_domain
-            )
+            if use_snapshot:
+                pl_initial_balance = self._get_snapshot_pl_initial_balance(
+                    account_ids, partner_ids, company_id, fy_start_date
+                )
+            else:
+                pl_initial_balance = self._get_pl_initial_balance(
+                    account_ids,
+                    company_id,
+                    fy_start_date,
+                    foreign_currency,
+                    base_domain,
+                )
             for key_bal in ["init_bal", "fin_bal"]:
                 fields_balance = ["credit", "debit", "balance"]
                 if foreign_currency:
@@ -928,3 +1077,363 @@ class GeneralLedgerReport(models.AbstractModel):
             "move_name",
             "matching_number",
         ]
+
+    @api.model
+    def _get_stream_period_domain(self, data):
+        domain = self._get_period_domain(
+            data["account_ids"],
+            data["partner_ids"],
+            data["company_id"],
+            data["only_posted_moves"],
+            data["date_to"],
+            data["date_from"],
+            data["cost_center_ids"],
+        )
+        if data["domain"]:
+            domain += data["domain"]
+        return domain
+
+    @api.model
+    def _use_streaming(self, data):
+        """Whether the journal items of the period are read by chunks while
+        writing the XLSX report instead of being loaded all at once. It can be
+        forced with the ``account_financial_report_streaming`` context key,
+        grouping by taxes is never streamed.
+        """
+        if data["grouped_by"] == "taxes":
+            return False
+        streaming = self.env.context.get("account_financial_report_streaming")
+        if streaming is not None:
+            return streaming
+        threshold = int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param(STREAMING_THRESHOLD_PARAM, STREAMING_THRESHOLD_DEFAULT)
+        )
+        if not threshold:
+            return False
+        count = self.env["account.move.line"].search_count(
+            self._get_stream_period_domain(data), limit=threshold
+        )
+        return count >= threshold
+
+    @api.model
+    def _get_stream_centralized_ml(self, domain, date_to):
+        """Monthly totals per journal of a centralized account."""
+        if isinstance(date_to, str):
+            date_to = datetime.datetime.strptime(date_to, "%Y-%m-%d").date()
+        centralized_ml = []
+        for journal, month, debit, credit, amount_currency in self.env[
+            "account.move.line"
+        ]._read_group(
+            domain,
+            ["journal_id", "date:month"],
+            ["debit:sum", "credit:sum", "amount_currency:sum"],
+        ):
+            last_day_month = calendar.monthrange(month.year, month.month)[1]
+            centralized_ml.append(
+                {
+                    "journal_id": journal.id,
+                    "ref_label": "Centralized entries",
+                    "date": min(month.replace(day=last_day_month), date_to),
+                    "debit": debit,
+                    "credit": credit,
+                    "balance": debit - credit,
+                    "bal_curr": amount_currency,
+                    "partner_id": False,
+                    "rec_id": 0,
+                    "entry_id": False,
+                    "tax_ids": [],
+                    "tax_line_id": False,
+                    "full_reconcile_id": False,
+                    "id": False,
+                    "currency_id": False,
+                    "analytic_distribution": {},
+                }
+            )
+        return centralized_ml
+
+    @api.model
+    def _get_stream_balances(
+        self, init_bal, totals, foreign_currency, keep_init_curr, has_currency
+    ):
+        """Initial and final balances of an account or a group of a streamed
+        general ledger, with the same currency rules as ``_get_report_values``.
+        """
+        init_bal = dict(init_bal)
+        if foreign_currency and not keep_init_curr:
+            init_bal["bal_curr"] = 0.0
+        fin_bal = {
+            key: init_bal[key] + totals[key] for key in ["credit", "debit", "balance"]
+        }
+        if foreign_currency:
+            fin_bal["bal_curr"] = init_bal["bal_curr"] + (
+                totals["bal_curr"] if has_currency else totals["foreign_bal_curr"]
+            )
+        return init_bal, fin_bal
+
+    # flake8: noqa: C901
+    def _get_general_ledger_stream(self, data):
+        """Accounts of the general ledger with their balances but without their
+        journal items. Each account, or partner group, holds the domain of its
+        journal items, read afterwards by chunks with
+        ``_iter_period_move_lines``.
+        """
+        company = self.env["res.company"].browse(data["company_id"])
+        company_currency_id = company.currency_id.id
+        rounding = company.currency_id.rounding
+        grouped_by = data["grouped_by"]
+        foreign_currency = data["foreign_currency"]
+        hide_account_at_0 = data["hide_account_at_0"]
+        gen_ld_data = self._get_initial_balance_data(
+            data["account_ids"],
+            data["partner_ids"],
+            data["company_id"],
+            data["date_from"],
+            foreign_currency,
+            data["only_posted_moves"],
+            data["unaffected_earnings_account"],
+            data["fy_start_date"],
+            data["cost_center_ids"],
+            data["domain"],
+            grouped_by,
+        )
+        period_domain = self._get_stream_period_domain(data)
+        acc_prt_account_ids = set(
+            self._get_acc_prt_accounts_ids(data["company_id"], grouped_by)
+        )
+
+        def new_totals():
+            return {
+                "count": 0,
+                "credit": 0.0,
+                "debit": 0.0,
+                "balance": 0.0,
+                "bal_curr": 0.0,
+                "foreign_bal_curr": 0.0,
+                "currency_ids": set(),
+            }
+
+        account_totals = {}
+        group_totals = {}
+        group_names = {}
+        for (
+            account,
+            partner,
+            currency,
+            debit,
+            credit,
+            balance,
+            amount_currency,
+            count,
+        ) in self.env["account.move.line"]._read_group(
+            period_domain,
+            ["account_id", "partner_id", "currency_id"],
+            [
+                "debit:sum",
+                "credit:sum",
+                "balance:sum",
+                "amount_currency:sum",
+                "__count",
+            ],
+        ):
+            totals_list = [account_totals.setdefault(account.id, new_totals())]
+            if account.id in acc_prt_account_ids:
+                if grouped_by == "partners":
+                    group_id = partner.id or 0
+                    group_names[group_id] = (
+                        partner.display_name if partner else _("Missing Partner")
+                    )
+                else:
+                    group_id = 0
+                    group_names[group_id] = ""
+                totals_list.append(
+                    group_totals.setdefault(account.id, {}).setdefault(
+                        group_id, new_totals()
+                    )
+                )
+            for totals in totals_list:
+                totals["count"] += count
+                totals["credit"] += credit
+                totals["debit"] += debit
+                totals["balance"] += balance
+                totals["bal_curr"] += amount_currency
+                if currency and currency.id != company_currency_id:
+                    totals["foreign_bal_curr"] += amount_currency
+                    totals["currency_ids"].add(currency.id)
+        account_ids = list(gen_ld_data.keys() | account_totals.keys())
+        accounts_data = self._get_accounts_data(account_ids)
+        general_ledger = []
+        for acc_id in sorted(account_ids, key=lambda a: accounts_data[a]["code"]):
+            account_data = accounts_data[acc_id]
+            currency_id = account_data["currency_id"]
+            keep_init_curr = currency_id == company_currency_id
+            totals = account_totals.get(acc_id) or new_totals()
+            init_bal = (
+                gen_ld_data[acc_id]["init_bal"]
+                if acc_id in gen_ld_data
+                else self._initialize_data(foreign_currency)["init_bal"]
+            )
+            init_bal, fin_bal = self._get_stream_balances(
+                init_bal, totals, foreign_currency, keep_init_curr, bool(currency_id)
+            )
+            fin_bal_currency_id = currency_id
+            if (
+                foreign_currency
+                and not currency_id
+                and len(totals["currency_ids"]) == 1
+            ):
+                fin_bal_currency_id = list(totals["currency_ids"])[0]
+            account = {
+                "id": acc_id,
+                "code": account_data["code"],
+                "name": account_data["name"],
+                "type": "account",
+                "currency_id": currency_id,
+                "currency_name": account_data["currency_name"],
+                "centralized": account_data["centralized"],
+                "grouped_by": grouped_by,
+                "init_bal": init_bal,
+                "fin_bal": fin_bal,
+                "fin_bal_currency_id": fin_bal_currency_id,
+                "domain": period_domain + [("account_id", "=", acc_id)],
+            }
+            init_is_zero = float_is_zero(
+                init_bal["balance"], precision_rounding=rounding
+            )
+            if data["centralize"] and account_data["centralized"]:
+                account["move_lines"] = self._recalculate_cumul_balance(
+                    self._get_stream_centralized_ml(account["domain"], data["date_to"]),
+                    init_bal["balance"],
+                    [],
+                )
+                if hide_account_at_0 and init_is_zero and not totals["count"]:
+                    continue
+            elif acc_id in acc_prt_account_ids and (
+                gen_ld_data.get(acc_id, {}).get(grouped_by) or totals["count"]
+            ):
+                # Partner groups with an initial balance first, in the order of
+                # _get_initial_balance_data, then the ones only in the period.
+                groups = {
+                    key: value
+                    for key, value in gen_ld_data.get(acc_id, {}).items()
+                    if isinstance(key, int)
+                }
+                acc_group_totals = group_totals.get(acc_id, {})
+                for group_id in sorted(
+                    acc_group_totals.keys() - groups.keys(),
+                    key=lambda g: group_names[g],
+                ):
+                    groups[group_id] = {
+                        "id": group_id,
+                        "name": group_names[group_id],
+                        "init_bal": self._initialize_data(foreign_currency)["init_bal"],
+                    }
+                list_grouped = []
+                for group_id, group in groups.items():
+                    group_total = acc_group_totals.get(group_id) or new_totals()
+                    group_init_bal, group_fin_bal = self._get_stream_balances(
+                        group["init_bal"],
+                        group_total,
+                        foreign_currency,
+                        keep_init_curr,
+                        bool(currency_id),
+                    )
+                    if (
+                        hide_account_at_0
+                        and float_is_zero(
+                            group_init_bal["balance"], precision_rounding=rounding
+                        )
+                        and not group_total["count"]
+                    ):
+                        continue
+                    group_domain = account["domain"]
+                    if grouped_by == "partners":
+                        group_domain = group_domain + [
+                            ("partner_id", "=", group_id or False)
+                        ]
+                    list_grouped.append(
+                        {
+                            "id": group_id,
+                            "name": group["name"],
+                            "init_bal": group_init_bal,
+                            "fin_bal": group_fin_bal,
+                            "domain": group_domain,
+                        }
+                    )
+                if hide_account_at_0 and init_is_zero and not list_grouped:
+                    continue
+                account["list_grouped"] = list_grouped
+            elif hide_account_at_0 and init_is_zero and not totals["count"]:
+                continue
+            general_ledger.append(account)
+        journals_data = self.with_context(active_test=False)._get_journals_data(
+            self.env["account.journal"]
+            .with_context(active_test=False)
+            .search([("company_id", "=", data["company_id"])])
+            .ids
+        )
+        return {
+            "general_ledger": general_ledger,
+            "journals_data": journals_data,
+            "company_currency": company.currency_id,
+            "foreign_currency": foreign_currency,
+            "filter_partner_ids": bool(data["partner_ids"]),
+        }
+
+    @api.model
+    def _iter_period_move_lines(self, domain, initial_balance, date_to):
+        """Yield the journal items of ``domain`` by chunks fetched from a
+        server side cursor, with their cumulative balance, along with the
+        taxes and analytic accounts data of the chunk. Only one chunk of
+        journal items is kept in memory at a time.
+        """
+        query = self.env["account.move.line"]._search(
+            domain, order="date, move_name, id"
+        )
+        cursor_name = SQL.identifier(f"general_ledger_{uuid.uuid4().hex}")
+        self.env.flush_all()
+        self.env.cr.execute(
+            SQL("DECLARE %s NO SCROLL CURSOR FOR %s", cursor_name, query.select())
+        )
+        ml_fields = self._get_ml_fields()
+        cumul_balance = initial_balance
+        try:
+            while True:
+                self.env.cr.execute(
+                    SQL("FETCH FORWARD %s FROM %s", STREAMING_CHUNK_SIZE, cursor_name)
+                )
+                ml_ids = [row[0] for row in self.env.cr.fetchall()]
+                if not ml_ids:
+                    break
+                move_lines = [
+                    self._get_move_line_data(move_line)
+                    for move_line in self.env["account.move.line"]
+                    .browse(ml_ids)
+                    .read(ml_fields)
+                ]
+                taxes_ids = set()
+                analytic_ids = set()
+                full_reconcile_ids = set()
+                for move_line in move_lines:
+                    taxes_ids.update(move_line["tax_ids"])
+                    for analytic_account in move_line["analytic_distribution"]:
+                        for analytic_account_id in analytic_account.split(","):
+                            analytic_ids.add(int(analytic_account_id))
+                    if move_line["rec_id"]:
+                        full_reconcile_ids.add(move_line["rec_id"])
+                move_lines = self._recalculate_cumul_balance(
+                    move_lines,
+                    cumul_balance,
+                    self._get_reconciled_after_date_to_ids(full_reconcile_ids, date_to),
+                )
+                cumul_balance = move_lines[-1]["balance"]
+                yield (
+                    move_lines,
+                    self._get_taxes_data(list(taxes_ids)),
+                    self._get_analytic_data(list(analytic_ids)),
+                )
+                # Drop the chunk from the cache to keep the memory bounded
+                self.env.invalidate_all()
+        finally:
+            self.env.cr.execute(SQL("CLOSE %s", cursor_name))
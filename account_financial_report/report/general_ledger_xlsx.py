@@ -132,9 +132,12 @@ class GeneralLedgerXslx(models.AbstractModel):
 
     # flake8: noqa: C901
     def _generate_report_content(self, workbook, report, data, report_data):
-        res_data = self.env[
+        general_ledger_report = self.env[
             "report.account_financial_report.general_ledger"
-        ]._get_report_values(report, data)
+        ]
+        if general_ledger_report._use_streaming(data):
+            return self._generate_report_content_streaming(report, data, report_data)
+        res_data = general_ledger_report._get_report_values(report, data)
         general_ledger = res_data["general_ledger"]
         accounts_data = res_data["accounts_data"]
         journals_data = res_data["journals_data"]
@@ -371,6 +374,172 @@ class GeneralLedgerXslx(models.AbstractModel):
             # 2 lines break
             report_data["row_pos"] += 2
 
+    def _write_stream_move_lines(self, account, item, data, stream_data, report_data):
+        """Write the journal items of an account or a partner group of a
+        streamed general ledger, chunk by chunk. Return the cumulative amount in
+        foreign currency of the written lines.
+        """
+        if "move_lines" in item:
+            chunks = [(item["move_lines"], {}, {})]
+        else:
+            chunks = self.env[
+                "report.account_financial_report.general_ledger"
+            ]._iter_period_move_lines(
+                item["domain"], item["init_bal"]["balance"], data["date_to"]
+            )
+        journals_data = stream_data["journals_data"]
+        company_currency = stream_data["company_currency"]
+        foreign_currency = stream_data["foreign_currency"]
+        total_bal_curr = 0
+        for move_lines, taxes_data, analytic_data in chunks:
+            for line in move_lines:
+                line.update(
+                    {
+                        "account": account["code"],
+                        "journal": journals_data[line["journal_id"]]["code"],
+                    }
+                )
+                line_currency_id = (
+                    line["currency_id"][0] if line["currency_id"] else False
+                )
+                if line_currency_id and line_currency_id != company_currency.id:
+                    line.update(
+                        {
+                            "currency_name": line["currency_id"][1],
+                            "currency_id": line["currency_id"][0],
+                        }
+                    )
+                if line["ref_label"] != "Centralized entries":
+                    taxes_description = ""
+                    analytic_distribution = ""
+                    for tax_id in line["tax_ids"]:
+                        taxes_description += taxes_data[tax_id]["tax_name"] + " "
+                    if line["tax_line_id"]:
+                        taxes_description += line["tax_line_id"][1]
+                    for account_ids, value in line["analytic_distribution"].items():
+                        for account_id in account_ids.split(","):
+                            if value < 100:
+                                analytic_distribution += "%s %d%% " % (
+                                    analytic_data[int(account_id)]["name"],
+                                    value,
+                                )
+                            else:
+                                analytic_distribution += (
+                                    f"{analytic_data[int(account_id)]['name']} "
+                                )
+                    line.update(
+                        {
+                            "taxes_description": taxes_description,
+                            "analytic_distribution": analytic_distribution,
+                        }
+                    )
+                if (
+                    foreign_currency
+                    and line_currency_id
+                    and line_currency_id != company_currency.id
+                ):
+                    total_bal_curr += line["bal_curr"]
+                    line.update({"total_bal_curr": total_bal_curr})
+                self.write_line_from_dict(line, report_data)
+        return total_bal_curr
+
+    def _generate_report_content_streaming(self, report, data, report_data):
+        """Same content as ``_generate_report_content``, with the journal items
+        read by chunks and written as they come, so that the memory used does
+        not depend on the number of journal items of the period.
+        """
+        stream_data = self.env[
+            "report.account_financial_report.general_ledger"
+        ]._get_general_ledger_stream(data)
+        foreign_currency = stream_data["foreign_currency"]
+        for account in stream_data["general_ledger"]:
+            self.write_array_title(
+                account["code"] + " - " + account["name"], report_data
+            )
+            if "list_grouped" not in account:
+                self.write_array_header(report_data)
+                account.update(
+                    {
+                        "initial_debit": account["init_bal"]["debit"],
+                        "initial_credit": account["init_bal"]["credit"],
+                        "initial_balance": account["init_bal"]["balance"],
+                    }
+                )
+                if foreign_currency and account["currency_id"]:
+                    account.update(
+                        {"initial_bal_curr": account["init_bal"]["bal_curr"]}
+                    )
+                self.write_initial_balance_from_dict(account, report_data)
+                self._write_stream_move_lines(
+                    account, account, data, stream_data, report_data
+                )
+                account.update(
+                    {
+                        "final_debit": account["fin_bal"]["debit"],
+                        "final_credit": account["fin_bal"]["credit"],
+                        "final_balance": account["fin_bal"]["balance"],
+                    }
+                )
+                if foreign_currency and account["currency_id"]:
+                    account.update({"final_bal_curr": account["fin_bal"]["bal_curr"]})
+                self.write_ending_balance_from_dict(account, report_data)
+            else:
+                total_bal_curr = 0
+                for group_item in account["list_grouped"]:
+                    self.write_array_title(group_item["name"], report_data)
+                    self.write_array_header(report_data)
+                    group_item.update(
+                        {
+                            "initial_debit": group_item["init_bal"]["debit"],
+                            "initial_credit": group_item["init_bal"]["credit"],
+                            "initial_balance": group_item["init_bal"]["balance"],
+                            "type": "partner",
+                            "grouped_by": account["grouped_by"],
+                            "currency_id": account["currency_id"],
+                            "currency_name": account["currency_name"],
+                        }
+                    )
+                    if foreign_currency and account["currency_id"]:
+                        group_item.update(
+                            {"initial_bal_curr": group_item["init_bal"]["bal_curr"]}
+                        )
+                    self.write_initial_balance_from_dict(group_item, report_data)
+                    total_bal_curr += self._write_stream_move_lines(
+                        account, group_item, data, stream_data, report_data
+                    )
+                    group_item.update(
+                        {
+                            "final_debit": group_item["fin_bal"]["debit"],
+                            "final_credit": group_item["fin_bal"]["credit"],
+                            "final_balance": group_item["fin_bal"]["balance"],
+                        }
+                    )
+                    if foreign_currency and group_item["currency_id"]:
+                        group_item.update(
+                            {"final_bal_curr": group_item["fin_bal"]["bal_curr"]}
+                        )
+                    self.write_ending_balance_from_dict(group_item, report_data)
+                    # Line break
+                    report_data["row_pos"] += 1
+                if not stream_data["filter_partner_ids"]:
+                    account.update(
+                        {
+                            "final_debit": account["fin_bal"]["debit"],
+                            "final_credit": account["fin_bal"]["credit"],
+                            "final_balance": account["fin_bal"]["balance"],
+                        }
+                    )
+                    if foreign_currency and account["fin_bal_currency_id"]:
+                        account.update(
+                            {
+                                "final_bal_curr": total_bal_curr,
+                                "currency_id": account["fin_bal_currency_id"],
+                            }
+                        )
+                    self.write_ending_balance_from_dict(account, report_data)
+            # 2 lines break
+            report_data["row_pos"] += 2
+
     def write_initial_balance_from_dict(self, my_object, report_data):
         """Specific function to write initial balance for General Ledger"""
         label = False
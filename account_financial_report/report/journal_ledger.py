@@ -6,6 +6,7 @@ import operator
 from collections import defaultdict
 
 from odoo import models
+from odoo.tools import SQL
 
 
 class JournalLedgerReport(models.AbstractModel):
@@ -248,56 +249,88 @@ class JournalLedgerReport(models.AbstractModel):
             move_line_ids_taxes_data,
         )
 
+    def _get_journal_tax_lines_query(self, wizard, moves_data):
+        AccountMoveLine = self.env["account.move.line"]
+        move_ids = [move_data["move_id"] for move_data in moves_data]
+        journal_ids = list({move_data["journal_id"] for move_data in moves_data})
+        domain = self._get_move_lines_domain(move_ids, wizard, journal_ids)
+        lines_query = AccountMoveLine._search(domain)
+        exigible_query = AccountMoveLine._search(
+            domain + AccountMoveLine._get_tax_exigible_domain()
+        )
+        # A journal item counts for its tax and for each of its base taxes; its
+        # base amounts only when it has base taxes, its tax amounts only when it
+        # is a tax line, and both only when it is exigible.
+        return SQL(
+            """
+            WITH lines AS (
+                SELECT aml.id, aml.journal_id, aml.tax_line_id,
+                    aml.debit, aml.credit, aml.balance,
+                    aml.id IN (%(exigible_query)s) AS exigible,
+                    EXISTS (
+                        SELECT 1 FROM account_move_line_account_tax_rel rel
+                        WHERE rel.account_move_line_id = aml.id
+                    ) AS has_taxes
+                FROM account_move_line aml
+                WHERE aml.id IN (%(lines_query)s)
+            ), line_taxes AS (
+                SELECT lines.id, lines.tax_line_id AS tax_id
+                FROM lines
+                WHERE lines.tax_line_id IS NOT NULL
+                UNION
+                SELECT rel.account_move_line_id, rel.account_tax_id
+                FROM account_move_line_account_tax_rel rel
+                JOIN lines ON lines.id = rel.account_move_line_id
+            )
+            SELECT lines.journal_id, line_taxes.tax_id,
+                COALESCE(SUM(lines.debit) FILTER (
+                    WHERE lines.exigible AND lines.has_taxes), 0) AS base_debit,
+                COALESCE(SUM(lines.credit) FILTER (
+                    WHERE lines.exigible AND lines.has_taxes), 0) AS base_credit,
+                COALESCE(SUM(lines.balance) FILTER (
+                    WHERE lines.exigible AND lines.has_taxes), 0) AS base_balance,
+                COALESCE(SUM(lines.debit) FILTER (
+                    WHERE lines.exigible AND lines.tax_line_id IS NOT NULL), 0)
+                    AS tax_debit,
+                COALESCE(SUM(lines.credit) FILTER (
+                    WHERE lines.exigible AND lines.tax_line_id IS NOT NULL), 0)
+                    AS tax_credit,
+                COALESCE(SUM(lines.balance) FILTER (
+                    WHERE lines.exigible AND lines.tax_line_id IS NOT NULL), 0)
+                    AS tax_balance
+            FROM line_taxes
+            JOIN lines ON lines.id = line_taxes.id
+            GROUP BY lines.journal_id, line_taxes.tax_id
+            """,
+            lines_query=lines_query.subselect(),
+            exigible_query=exigible_query.subselect(),
+        )
+
     def _get_journal_tax_lines(self, wizard, moves_data):
-        journals_taxes_data = {}
-        for move_data in moves_data:
-            report_move_lines = move_data["report_move_lines"]
-            for report_move_line in report_move_lines:
-                ml_data = report_move_line
-                tax_ids = []
-                if ml_data["tax_line_id"]:
-                    tax_ids.append(ml_data["tax_line_id"])
-                if ml_data["tax_ids"]:
-                    tax_ids += ml_data["tax_ids"]
-                tax_ids = list(set(tax_ids))
-                journal_id = ml_data["journal_id"]
-                if journal_id not in journals_taxes_data.keys():
-                    journals_taxes_data[journal_id] = {}
-                taxes = self.env["account.tax"].search_fetch(
-                    [("id", "in", tax_ids)], ["name", "description"]
+        self.env.flush_all()
+        self.env.cr.execute(self._get_journal_tax_lines_query(wizard, moves_data))
+        rows_by_tax = defaultdict(list)
+        for row in self.env.cr.dictfetchall():
+            rows_by_tax[row["tax_id"]].append(row)
+        taxes = self.env["account.tax"].search_fetch(
+            [("id", "in", list(rows_by_tax))], ["name", "description"]
+        )
+        journals_taxes_data = defaultdict(list)
+        for tax in taxes:
+            for row in rows_by_tax[tax.id]:
+                journals_taxes_data[row["journal_id"]].append(
+                    {
+                        "base_debit": row["base_debit"],
+                        "base_credit": row["base_credit"],
+                        "base_balance": row["base_balance"],
+                        "tax_debit": row["tax_debit"],
+                        "tax_credit": row["tax_credit"],
+                        "tax_balance": row["tax_balance"],
+                        "tax_name": tax.name,
+                        "tax_code": tax.description,
+                    }
                 )
-                for tax in taxes:
-                    if tax.id not in journals_taxes_data[journal_id]:
-                        journals_taxes_data[journal_id][tax.id] = {
-                            "base_debit": 0.0,
-                            "base_credit": 0.0,
-                            "base_balance": 0.0,
-                            "tax_debit": 0.0,
-                            "tax_credit": 0.0,
-                            "tax_balance": 0.0,
-                            "tax_name": tax.name,
-                            "tax_code": tax.description,
-                        }
-                    field_keys = [
-                        "base_debit",
-                        "base_credit",
-                        "base_balance",
-                        "tax_debit",
-                        "tax_credit",
-                        "tax_balance",
-                    ]
-                    for field_key in field_keys:
-                        journals_taxes_data[journal_id][tax.id][field_key] += ml_data[
-                            field_key
-                        ]
-        journals_taxes_data_2 = {}
-        for journal_id in journals_taxes_data.keys():
-            journals_taxes_data_2[journal_id] = []
-            for tax_id in journals_taxes_data[journal_id].keys():
-                journals_taxes_data_2[journal_id] += [
-                    journals_taxes_data[journal_id][tax_id]
-                ]
-        return journals_taxes_data_2
+        return dict(journals_taxes_data)
 
     def _get_report_values(self, docids, data):
         wizard_id = data["wizard_id"]
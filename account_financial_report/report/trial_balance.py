@@ -4,8 +4,11 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
 
-from odoo import _, api, models
+from collections import defaultdict
+
+from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import SQL
 from odoo.tools.float_utils import float_is_zero
 
 
@@ -361,6 +364,11 @@ class TrialBalanceReport(models.AbstractModel):
             total_amount = self._compute_acc_prt_amount(
                 total_amount, tb, acc_id, prt_id, foreign_currency
             )
+        total_amount = self._sort_partner_amount(total_amount)
+        return total_amount, partners_data
+
+    @api.model
+    def _sort_partner_amount(self, total_amount):
         # sort on partner_name
         for acc_id, total_data in total_amount.items():
             tmp_list = sorted(
@@ -373,7 +381,7 @@ class TrialBalanceReport(models.AbstractModel):
             total_amount[acc_id] = {}
             for key, value in tmp_list:
                 total_amount[acc_id][key] = value
-        return total_amount, partners_data
+        return total_amount
 
     def _remove_accounts_at_cero(self, total_amount, show_partner_details, company):
         def is_removable(d):
@@ -404,8 +412,9 @@ class TrialBalanceReport(models.AbstractModel):
 
     # flake8: noqa: C901
     @api.model
-    def _get_data(
+    def _get_read_group_amounts(
         self,
+        accounts,
         account_ids,
         journal_ids,
         partner_ids,
@@ -416,17 +425,9 @@ class TrialBalanceReport(models.AbstractModel):
         only_posted_moves,
         show_partner_details,
         hide_account_at_0,
-        unaffected_earnings_account,
         fy_start_date,
         grouped_by,
     ):
-        accounts_domain = [("company_ids", "in", [company_id])]
-        if account_ids:
-            accounts_domain += [("id", "in", account_ids)]
-            # If explicit list of accounts is provided,
-            # don't include unaffected earnings account
-            unaffected_earnings_account = False
-        accounts = self.env["account.account"].search(accounts_domain)
         tb_initial_acc = []
         for account in accounts:
             tb_initial_acc.append(
@@ -548,6 +549,456 @@ class TrialBalanceReport(models.AbstractModel):
             total_amount, partners_data = self._compute_partner_amount(
                 total_amount, tb_initial_prt, tb_period_prt, foreign_currency
             )
+        return total_amount, partners_data
+
+    @api.model
+    def _prepare_sql_amount(self, row, foreign_currency):
+        res = {
+            "credit": row["credit"],
+            "debit": row["debit"],
+            "balance": row["balance"],
+            "initial_balance": row["initial_balance"],
+            "ending_balance": row["initial_balance"] + row["balance"],
+        }
+        if foreign_currency:
+            initial_currency_balance = round(row["initial_currency_balance"], 2)
+            res["initial_currency_balance"] = initial_currency_balance
+            res["ending_currency_balance"] = initial_currency_balance + round(
+                row["currency_balance"], 2
+            )
+        return res
+
+    @api.model
+    def _get_sql_amounts_filters(
+        self, alias, account_ids, partner_ids, show_partner_details
+    ):
+        alias = SQL.identifier(alias)
+        conditions = []
+        if account_ids:
+            conditions.append(SQL("%s.account_id IN %s", alias, tuple(account_ids)))
+        if partner_ids:
+            conditions.append(SQL("%s.partner_id IN %s", alias, tuple(partner_ids)))
+        if show_partner_details:
+            conditions.append(
+                SQL(
+                    "%s.account_id IN (SELECT id FROM account_account"
+                    " WHERE account_type IN %s)",
+                    alias,
+                    ("asset_receivable", "liability_payable"),
+                )
+            )
+        return conditions
+
+    @api.model
+    def _get_sql_snapshot_end(
+        self,
+        company_id,
+        date_from,
+        fy_start_date,
+        only_posted_moves,
+        journal_ids,
+        grouped_by,
+    ):
+        """End of the months read from the balance snapshot instead of the journal
+        items, None when the snapshot can't be used: it only contains posted
+        entries and isn't split by journal nor analytic account.
+        """
+        if not only_posted_moves or journal_ids or grouped_by:
+            return None
+        snapshot_model = self.env["account.balance.snapshot"]
+        company = self.env["res.company"].browse(company_id)
+        snapshot_end = snapshot_model._get_snapshot_end(company, date_from)
+        fy_start_date = fields.Date.to_date(fy_start_date)
+        if snapshot_end and fy_start_date.day != 1:
+            # Months can't overlap the start of the fiscal year either
+            snapshot_end = min(snapshot_end, fy_start_date.replace(day=1))
+        return snapshot_end
+
+    @api.model
+    def _get_sql_amounts_query(
+        self,
+        accounts,
+        account_ids,
+        journal_ids,
+        partner_ids,
+        company_id,
+        date_to,
+        date_from,
+        only_posted_moves,
+        show_partner_details,
+        fy_start_date,
+        grouped_by,
+    ):
+        """Query reading the journal items once and aggregating the initial,
+        period and previous fiscal years P&L amounts with ``FILTER`` clauses,
+        per account and, when needed, per partner or analytic account.
+        """
+        conditions = [
+            SQL("aml.company_id = %s", company_id),
+            SQL("aml.date <= %s", date_to),
+            SQL(
+                "aml.parent_state IN %s",
+                ("posted",) if only_posted_moves else ("posted", "draft"),
+            ),
+        ]
+        if journal_ids:
+            conditions.append(SQL("aml.journal_id IN %s", tuple(journal_ids)))
+        conditions += self._get_sql_amounts_filters(
+            "aml", account_ids, partner_ids, show_partner_details
+        )
+        bs_account_ids = accounts.filtered("include_initial_balance").ids
+        pl_account_ids = accounts.filtered(
+            lambda account: not account.include_initial_balance
+        ).ids
+        snapshot_end = self._get_sql_snapshot_end(
+            company_id,
+            date_from,
+            fy_start_date,
+            only_posted_moves,
+            journal_ids,
+            grouped_by,
+        )
+        snapshot_lines = SQL()
+        if snapshot_end:
+            # Closed months are read from the balance snapshot
+            snapshot_conditions = self._get_sql_amounts_filters(
+                "snapshot", account_ids, partner_ids, show_partner_details
+            )
+            conditions.append(SQL("aml.date >= %s", snapshot_end))
+            snapshot_lines = SQL(
+                """
+                UNION ALL
+                SELECT
+                    NULL,
+                    snapshot.account_id,
+                    COALESCE(snapshot.partner_id, 0),
+                    snapshot.debit,
+                    snapshot.credit,
+                    snapshot.balance,
+                    snapshot.amount_currency,
+                    snapshot.line_count,
+                    snapshot.account_id = ANY(%(bs_account_ids)s::integer[])
+                    OR (
+                        snapshot.account_id = ANY(%(pl_account_ids)s::integer[])
+                        AND snapshot.date >= %(fy_start_date)s
+                    ),
+                    FALSE,
+                    snapshot.date < %(fy_start_date)s
+                        AND snapshot.account_id = ANY(%(pl_account_ids)s::integer[])
+                FROM account_balance_snapshot snapshot
+                WHERE snapshot.company_id = %(company_id)s
+                    AND snapshot.date < %(snapshot_end)s
+                    %(where)s
+                """,
+                fy_start_date=fy_start_date,
+                bs_account_ids=bs_account_ids,
+                pl_account_ids=pl_account_ids,
+                company_id=company_id,
+                snapshot_end=snapshot_end,
+                where=SQL().join(
+                    SQL(" AND %s", condition) for condition in snapshot_conditions
+                ),
+            )
+        lines = SQL(
+            """
+            SELECT
+                aml.id,
+                aml.account_id,
+                COALESCE(aml.partner_id, 0) AS partner_id,
+                aml.debit,
+                aml.credit,
+                aml.balance,
+                aml.amount_currency,
+                1 AS line_count,
+                aml.date < %(date_from)s AND (
+                    aml.account_id = ANY(%(bs_account_ids)s::integer[])
+                    OR (
+                        aml.account_id = ANY(%(pl_account_ids)s::integer[])
+                        AND aml.date >= %(fy_start_date)s
+                    )
+                ) AS is_initial,
+                aml.date >= %(date_from)s
+                    AND COALESCE(aml.display_type, '')
+                        NOT IN ('line_section', 'line_note') AS is_period,
+                aml.date < %(fy_start_date)s
+                    AND aml.account_id = ANY(%(pl_account_ids)s::integer[])
+                    AS is_fy_pl
+            FROM account_move_line aml
+            WHERE %(where)s
+            %(snapshot_lines)s
+            """,
+            date_from=date_from,
+            fy_start_date=fy_start_date,
+            bs_account_ids=bs_account_ids,
+            pl_account_ids=pl_account_ids,
+            where=SQL(" AND ").join(conditions),
+            snapshot_lines=snapshot_lines,
+        )
+        aggregates = SQL(
+            """
+            COALESCE(SUM(lines.line_count) FILTER (WHERE lines.is_initial), 0)
+                AS initial_count,
+            COALESCE(SUM(lines.balance) FILTER (WHERE lines.is_initial), 0)::float
+                AS initial_balance,
+            COALESCE(
+                SUM(lines.amount_currency) FILTER (WHERE lines.is_initial), 0
+            )::float AS initial_currency_balance,
+            COALESCE(SUM(lines.line_count) FILTER (WHERE lines.is_period), 0)
+                AS period_count,
+            COALESCE(SUM(lines.debit) FILTER (WHERE lines.is_period), 0)::float
+                AS debit,
+            COALESCE(SUM(lines.credit) FILTER (WHERE lines.is_period), 0)::float
+                AS credit,
+            COALESCE(SUM(lines.balance) FILTER (WHERE lines.is_period), 0)::float
+                AS balance,
+            COALESCE(
+                SUM(lines.amount_currency) FILTER (WHERE lines.is_period), 0
+            )::float AS currency_balance,
+            COALESCE(SUM(lines.balance) FILTER (WHERE lines.is_fy_pl), 0)::float
+                AS fy_pl_balance,
+            COALESCE(
+                SUM(lines.amount_currency) FILTER (WHERE lines.is_fy_pl), 0
+            )::float AS fy_pl_currency_balance
+            """
+        )
+        levels = [
+            SQL(
+                """
+                SELECT 'account' AS level, lines.account_id, 0 AS key_id, %s
+                FROM lines
+                GROUP BY lines.account_id
+                """,
+                aggregates,
+            )
+        ]
+        if show_partner_details:
+            levels.append(
+                SQL(
+                    """
+                    SELECT 'partner', lines.account_id, lines.partner_id, %s
+                    FROM lines
+                    GROUP BY lines.account_id, lines.partner_id
+                    """,
+                    aggregates,
+                )
+            )
+        if grouped_by:
+            field = self.env["account.move.line"]._fields["analytic_account_ids"]
+            levels.append(
+                SQL(
+                    """
+                    SELECT 'analytic', lines.account_id, COALESCE(rel.%s, 0), %s
+                    FROM lines
+                    LEFT JOIN %s rel ON rel.%s = lines.id
+                    GROUP BY lines.account_id, COALESCE(rel.%s, 0)
+                    """,
+                    SQL.identifier(field.column2),
+                    aggregates,
+                    SQL.identifier(field.relation),
+                    SQL.identifier(field.column1),
+                    SQL.identifier(field.column2),
+                )
+            )
+        return SQL(
+            "WITH lines AS (%s) %s",
+            lines,
+            SQL(" UNION ALL ").join(levels),
+        )
+
+    @api.model
+    def _get_sql_amounts(
+        self,
+        accounts,
+        account_ids,
+        journal_ids,
+        partner_ids,
+        company_id,
+        date_to,
+        date_from,
+        foreign_currency,
+        only_posted_moves,
+        show_partner_details,
+        hide_account_at_0,
+        fy_start_date,
+        grouped_by,
+    ):
+        """Same amounts as ``_get_read_group_amounts`` and
+        ``_get_pl_initial_balance``, computed with a single query and merged
+        through dictionaries indexed by account, partner and analytic account.
+        """
+        aml_fields = [
+            "account_id",
+            "partner_id",
+            "journal_id",
+            "company_id",
+            "date",
+            "display_type",
+            "parent_state",
+            "debit",
+            "credit",
+            "balance",
+            "amount_currency",
+        ]
+        if grouped_by:
+            aml_fields.append("analytic_account_ids")
+        self.env["account.move.line"].flush_model(aml_fields)
+        self.env.cr.execute(
+            self._get_sql_amounts_query(
+                accounts,
+                account_ids,
+                journal_ids,
+                partner_ids,
+                company_id,
+                date_to,
+                date_from,
+                only_posted_moves,
+                show_partner_details,
+                fy_start_date,
+                grouped_by,
+            )
+        )
+        account_rows = {}
+        partner_rows = {}
+        analytic_rows = defaultdict(dict)
+        for row in self.env.cr.dictfetchall():
+            if row["level"] == "account":
+                account_rows[row["account_id"]] = row
+            elif row["period_count"] or row["initial_count"]:
+                if row["level"] == "partner":
+                    partner_rows[(row["account_id"], row["key_id"])] = row
+                else:
+                    analytic_rows[row["account_id"]][row["key_id"]] = row
+        empty_row = dict.fromkeys(
+            [
+                "initial_count",
+                "initial_balance",
+                "initial_currency_balance",
+                "period_count",
+                "debit",
+                "credit",
+                "balance",
+                "currency_balance",
+            ],
+            0.0,
+        )
+        total_amount = {}
+        initial_account_ids = set(accounts.ids)
+        other_account_ids = sorted(account_rows.keys() - initial_account_ids)
+        for account_id in accounts.ids + other_account_ids:
+            row = account_rows.get(account_id, empty_row)
+            if not row["period_count"] and (
+                account_id not in initial_account_ids
+                or (hide_account_at_0 and row["initial_balance"] == 0)
+            ):
+                continue
+            total_amount[account_id] = self._prepare_sql_amount(row, foreign_currency)
+            if grouped_by:
+                total_amount[account_id]["group_by"] = "analytic_account_ids"
+                total_amount[account_id]["group_by_data"] = {
+                    key_id: self._prepare_sql_amount(gb_row, foreign_currency)
+                    for key_id, gb_row in analytic_rows[account_id].items()
+                } or {0: self._prepare_sql_amount(row, foreign_currency)}
+        partners_data = []
+        if show_partner_details:
+            partners_data = {}
+            partner_names = {
+                partner.id: partner.display_name
+                for partner in self.env["res.partner"].browse(
+                    {prt_id for __, prt_id in partner_rows if prt_id}
+                )
+            }
+            for (acc_id, prt_id), row in partner_rows.items():
+                if (
+                    not row["period_count"]
+                    and hide_account_at_0
+                    and row["initial_balance"] == 0
+                ):
+                    continue
+                if acc_id not in total_amount:
+                    total_amount[acc_id] = self._prepare_sql_amount(
+                        account_rows[acc_id], foreign_currency
+                    )
+                partner_name = partner_names.get(prt_id) or _("Missing Partner")
+                partners_data[prt_id] = {"id": prt_id, "name": partner_name}
+                total_amount[acc_id][prt_id] = self._prepare_sql_amount(
+                    row, foreign_currency
+                )
+                total_amount[acc_id][prt_id]["partner_name"] = partner_name
+            total_amount = self._sort_partner_amount(total_amount)
+        pl_initial_balance = sum(row["fy_pl_balance"] for row in account_rows.values())
+        pl_initial_currency_balance = 0.0
+        if foreign_currency:
+            pl_initial_currency_balance = sum(
+                round(row["fy_pl_currency_balance"], 2) for row in account_rows.values()
+            )
+        return (
+            total_amount,
+            partners_data,
+            pl_initial_balance,
+            pl_initial_currency_balance,
+        )
+
+    @api.model
+    def _get_data(
+        self,
+        account_ids,
+        journal_ids,
+        partner_ids,
+        company_id,
+        date_to,
+        date_from,
+        foreign_currency,
+        only_posted_moves,
+        show_partner_details,
+        hide_account_at_0,
+        unaffected_earnings_account,
+        fy_start_date,
+        grouped_by,
+    ):
+        accounts_domain = [("company_ids", "in", [company_id])]
+        if account_ids:
+            accounts_domain += [("id", "in", account_ids)]
+            # If explicit list of accounts is provided,
+            # don't include unaffected earnings account
+            unaffected_earnings_account = False
+        accounts = self.env["account.account"].search(accounts_domain)
+        engine_args = (
+            accounts,
+            account_ids,
+            journal_ids,
+            partner_ids,
+            company_id,
+            date_to,
+            date_from,
+            foreign_currency,
+            only_posted_moves,
+            show_partner_details,
+            hide_account_at_0,
+            fy_start_date,
+            grouped_by,
+        )
+        if self.env.context.get("account_financial_report_read_group"):
+            total_amount, partners_data = self._get_read_group_amounts(*engine_args)
+            (
+                pl_initial_balance,
+                pl_initial_currency_balance,
+            ) = self._get_pl_initial_balance(
+                account_ids,
+                journal_ids,
+                partner_ids,
+                company_id,
+                fy_start_date,
+                only_posted_moves,
+                show_partner_details,
+                foreign_currency,
+            )
+        else:
+            (
+                total_amount,
+                partners_data,
+                pl_initial_balance,
+                pl_initial_currency_balance,
+            ) = self._get_sql_amounts(*engine_args)
         # Remove accounts a 0 from collections
         if hide_account_at_0:
             company = self.env["res.company"].browse(company_id)
@@ -582,19 +1033,6 @@ class TrialBalanceReport(models.AbstractModel):
                 )
                 total_amount[unaffected_id]["group_by_data"][0] = group_by_data_item
         accounts_data = self._get_accounts_data(accounts_ids)
-        (
-            pl_initial_balance,
-            pl_initial_currency_balance,
-        ) = self._get_pl_initial_balance(
-            account_ids,
-            journal_ids,
-            partner_ids,
-            company_id,
-            fy_start_date,
-            only_posted_moves,
-            show_partner_details,
-            foreign_currency,
-        )
         if unaffected_id:
             total_amount[unaffected_id]["ending_balance"] += pl_initial_balance
             total_amount[unaffected_id]["initial_balance"] += pl_initial_balance
@@ -0,0 +1,119 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestFinancialReportJob(AccountTestInvoicingCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.init_invoice(
+            "out_invoice", invoice_date="2024-01-15", amounts=[100], post=True
+        )
+        cls.wizard = cls.env["trial.balance.report.wizard"].create(
+            {
+                "date_from": fields.Date.from_string("2024-01-01"),
+                "date_to": fields.Date.from_string("2024-12-31"),
+                "company_id": cls.env.company.id,
+            }
+        )
+        cls.job_model = cls.env["account.financial.report.job"]
+        cls.trial_balance_xlsx = type(cls.env["report.a_f_r.report_trial_balance_xlsx"])
+        # Journal items of previous transactions
+        cls.env.flush_all()
+        cls.env.cr.execute(
+            "UPDATE account_move_line SET write_date = write_date - interval '1 day'"
+        )
+        cls.env.invalidate_all()
+
+    def test_01_job_cache(self):
+        action = self.wizard.button_export_xlsx_async()
+        self.assertEqual(action["tag"], "display_notification")
+        job = self.job_model.search([("report_id.report_type", "=", "xlsx")])
+        self.assertEqual(len(job), 1)
+        self.assertEqual(job.state, "pending")
+        # A duplicated request reuses the pending job
+        self.wizard.copy().button_export_xlsx_async()
+        self.assertEqual(self.job_model.search_count([]), 1)
+        self.job_model._cron_generate_reports()
+        self.assertEqual(job.state, "done")
+        self.assertTrue(job.attachment_id.raw)
+        self.assertEqual(job.attachment_id.res_id, job.id)
+        action = self.wizard.button_export_xlsx_async()
+        self.assertEqual(action["type"], "ir.actions.act_url")
+        self.assertIn(str(job.attachment_id.id), action["url"])
+        self.assertEqual(self.job_model.search_count([]), 1)
+        # Other parameters or new journal items generate the report again
+        self.wizard.hide_account_at_0 = False
+        self.wizard.button_export_xlsx_async()
+        self.assertEqual(self.job_model.search_count([]), 2)
+        self.init_invoice(
+            "out_invoice", invoice_date="2024-02-15", amounts=[50], post=True
+        )
+        self.wizard.button_export_xlsx_async()
+        self.assertEqual(self.job_model.search_count([]), 3)
+
+    def test_02_job_failed(self):
+        self.wizard.button_export_xlsx_async()
+        job = self.job_model.search([])
+        job.data = dict(job.data, company_id=-1)
+        self.job_model._cron_generate_reports()
+        self.assertEqual(job.state, "failed")
+        self.assertTrue(job.error)
+        self.assertFalse(job.attachment_id)
+
+    def test_03_job_wizard(self):
+        self.wizard.write({"foreign_currency": True, "show_partner_details": True})
+        self.wizard.button_export_xlsx_async()
+        self.wizard.button_export_pdf_async()
+        jobs = self.job_model.search([])
+        self.assertEqual(len(jobs), 2)
+        # The wizard may have been removed by the vacuum when the cron runs
+        self.wizard.unlink()
+        get_report_filters = self.trial_balance_xlsx._get_report_filters
+        get_report_columns = self.trial_balance_xlsx._get_report_columns
+        rendered = {}
+
+        def report_filters(xlsx, report):
+            rendered["filters"] = get_report_filters(xlsx, report)
+            return rendered["filters"]
+
+        def report_columns(xlsx, report):
+            rendered["columns"] = get_report_columns(xlsx, report)
+            return rendered["columns"]
+
+        with (
+            patch.object(
+                self.trial_balance_xlsx,
+                "_get_report_filters",
+                autospec=True,
+                side_effect=report_filters,
+            ),
+            patch.object(
+                self.trial_balance_xlsx,
+                "_get_report_columns",
+                autospec=True,
+                side_effect=report_columns,
+            ),
+        ):
+            self.job_model._cron_generate_reports()
+        self.assertEqual(set(jobs.mapped("state")), {"done"})
+        self.assertTrue(all(jobs.attachment_id.mapped("raw")))
+        filters = dict(rendered["filters"])
+        self.assertEqual(
+            filters["Date range filter"], "From: 2024-01-01 To: 2024-12-31"
+        )
+        self.assertEqual(filters["Show foreign currency"], "Yes")
+        columns = [column["field"] for column in rendered["columns"].values()]
+        self.assertEqual(columns[0], "name")
+        self.assertEqual(
+            rendered["columns"][0]["header"], "Partner", "Partner details shown"
+        )
+        self.assertIn("ending_currency_balance", columns)
@@ -687,6 +687,86 @@ class TestGeneralLedgerReport(AccountTestInvoicingCommon):
         self.assertEqual(unaffected_fin_balance["credit"], 1000)
         self.assertEqual(unaffected_fin_balance["balance"], 500)
 
+    def test_05_streaming(self):
+        self._add_move(
+            date=self.previous_fy_date_end,
+            receivable_debit=1000,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=1000,
+        )
+        self._add_move(
+            date=self.fy_date_start,
+            receivable_debit=0,
+            receivable_credit=400,
+            income_debit=400,
+            income_credit=0,
+        )
+        self._add_move(
+            date=self.fy_date_end,
+            receivable_debit=250,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=250,
+        )
+        report = self.env["report.account_financial_report.general_ledger"]
+        for grouped_by in ("partners", "none"):
+            wizard = self.env["general.ledger.report.wizard"].create(
+                {
+                    "date_from": self.fy_date_start,
+                    "date_to": self.fy_date_end,
+                    "target_move": "posted",
+                    "hide_account_at_0": True,
+                    "company_id": self.env.user.company_id.id,
+                    "fy_start_date": self.fy_date_start,
+                    "centralize": False,
+                    "grouped_by": grouped_by,
+                }
+            )
+            data = wizard._prepare_report_general_ledger()
+            general_ledger = report._get_report_values(wizard, data)["general_ledger"]
+            stream_ledger = report._get_general_ledger_stream(data)["general_ledger"]
+            self.assertEqual(
+                [account["id"] for account in stream_ledger],
+                [account["id"] for account in general_ledger],
+            )
+            for account, stream_account in zip(
+                general_ledger, stream_ledger, strict=True
+            ):
+                items = account.get("list_grouped", [account])
+                stream_items = stream_account.get("list_grouped", [stream_account])
+                self.assertEqual(len(stream_items), len(items))
+                for item, stream_item in zip(items, stream_items, strict=True):
+                    for key_bal in ["init_bal", "fin_bal"]:
+                        for field_name in ["debit", "credit", "balance"]:
+                            self.assertAlmostEqual(
+                                stream_item[key_bal][field_name],
+                                item[key_bal][field_name],
+                            )
+                    stream_lines = [
+                        (move_line["id"], move_line["balance"])
+                        for move_lines, __, __ in report._iter_period_move_lines(
+                            stream_item["domain"],
+                            stream_item["init_bal"]["balance"],
+                            data["date_to"],
+                        )
+                        for move_line in move_lines
+                    ]
+                    self.assertEqual(
+                        stream_lines,
+                        [
+                            (move_line["id"], move_line["balance"])
+                            for move_line in item["move_lines"]
+                        ],
+                    )
+            content, content_type = (
+                self.env["ir.actions.report"]
+                .with_context(account_financial_report_streaming=True)
+                ._render("a_f_r.report_general_ledger_xlsx", wizard.ids, data)
+            )
+            self.assertEqual(content_type, "xlsx")
+            self.assertTrue(content)
+
     def test_partner_filter(self):
         partner_1 = self.env.ref("base.res_partner_1")
         partner_2 = self.env.ref("base.res_partner_2")
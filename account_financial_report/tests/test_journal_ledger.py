@@ -280,3 +280,58 @@ class TestJournalReport(AccountTestInvoicingCommon):
 
         self.check_report_journal_debit_credit(res_data, 250, 250)
         self.check_report_journal_debit_credit_taxes(res_data, 300, 0, 50, 0)
+
+    def _create_out_invoice(self, line_count):
+        move_form = Form(
+            self.env["account.move"].with_context(default_move_type="out_invoice")
+        )
+        move_form.partner_id = self.partner_2
+        move_form.journal_id = self.journal_sale
+        for _index in range(line_count):
+            with move_form.invoice_line_ids.new() as line_form:
+                line_form.name = "test"
+                line_form.quantity = 1.0
+                line_form.price_unit = 100
+                line_form.account_id = self.income_account
+                line_form.tax_ids.add(self.tax_15_s)
+                line_form.tax_ids.add(self.tax_20_s)
+        invoice = move_form.save()
+        invoice.action_post()
+        return invoice
+
+    def _get_journal_tax_lines_query_count(self, wiz):
+        data = wiz._prepare_report_journal_ledger()
+        res_data = self.JournalLedgerReport._get_report_values(wiz, data)
+        self.env.invalidate_all()
+        query_count = self.env.cr.sql_log_count
+        journals_taxes_data = self.JournalLedgerReport._get_journal_tax_lines(
+            wiz, res_data["Moves"]
+        )
+        return self.env.cr.sql_log_count - query_count, journals_taxes_data
+
+    def test_04_tax_lines_query_count(self):
+        self._create_out_invoice(2)
+        wiz = self.JournalLedgerReportWizard.create(
+            {
+                "date_from": self.fy_date_start,
+                "date_to": self.fy_date_end,
+                "company_id": self.company.id,
+                "journal_ids": [(6, 0, self.journal_sale.ids)],
+                "move_target": "all",
+            }
+        )
+        query_count, journals_taxes_data = self._get_journal_tax_lines_query_count(wiz)
+        tax_lines = journals_taxes_data[self.journal_sale.id]
+        self.assertEqual(len(tax_lines), 2)
+        self.assertEqual(sum(tax_line["base_credit"] for tax_line in tax_lines), 400)
+        self.assertEqual(sum(tax_line["tax_credit"] for tax_line in tax_lines), 70)
+        for _index in range(5):
+            self._create_out_invoice(10)
+        new_query_count, journals_taxes_data = self._get_journal_tax_lines_query_count(
+            wiz
+        )
+        self.assertEqual(new_query_count, query_count)
+        tax_lines = journals_taxes_data[self.journal_sale.id]
+        self.assertEqual(len(tax_lines), 2)
+        self.assertEqual(sum(tax_line["base_credit"] for tax_line in tax_lines), 10400)
+        self.assertEqual(sum(tax_line["tax_credit"] for tax_line in tax_lines), 1820)
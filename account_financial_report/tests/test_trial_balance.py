@@ -3,12 +3,50 @@
 # Copyright 2020 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+import logging
 import re
+import time
 
 from odoo.tests import tagged
+from odoo.tools import SQL
 
 from odoo.addons.account.tests.common import AccountTestInvoicingCommon
 
+_logger = logging.getLogger(__name__)
+
+AMOUNT_KEYS = ["initial_balance", "debit", "credit", "balance", "ending_balance"]
+
+
+def get_report_amounts(total_amount):
+    """Amounts per account and partner of the ``_get_data`` result."""
+    amounts = {}
+    for account_id, account_data in total_amount.items():
+        for key in AMOUNT_KEYS:
+            amounts[(account_id, key)] = round(account_data[key], 2)
+        for partner_id, partner_data in account_data.items():
+            if isinstance(partner_id, int) and isinstance(partner_data, dict):
+                for key in AMOUNT_KEYS:
+                    amounts[(account_id, partner_id, key)] = round(partner_data[key], 2)
+    return amounts
+
+
+def get_data_args(data):
+    return (
+        data["account_ids"],
+        data["journal_ids"],
+        data["partner_ids"],
+        data["company_id"],
+        data["date_to"],
+        data["date_from"],
+        data["foreign_currency"],
+        data["only_posted_moves"],
+        data["show_partner_details"],
+        data["hide_account_at_0"],
+        data["unaffected_earnings_account"],
+        data["fy_start_date"],
+        data["grouped_by"],
+    )
+
 
 @tagged("post_install", "-at_install")
 class TestTrialBalanceReport(AccountTestInvoicingCommon):
@@ -715,3 +753,292 @@ class TestTrialBalanceReport(AccountTestInvoicingCommon):
         ]
         self.assertEqual(len(trial_balance_code_set), len(all_accounts_code_set))
         self.assertTrue(trial_balance_code_set == all_accounts_code_set)
+
+    def test_06_sql_engine_matches_read_group(self):
+        self._add_move(
+            date=self.previous_fy_date_end,
+            receivable_debit=1000,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=1000,
+        )
+        self._add_move(
+            date=self.date_start,
+            receivable_debit=0,
+            receivable_credit=250,
+            income_debit=250,
+            income_credit=0,
+            unaffected_debit=100,
+            unaffected_credit=100,
+        )
+        self._add_move(
+            date=self.date_end,
+            receivable_debit=300,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=300,
+        )
+        report = self.env["report.account_financial_report.trial_balance"]
+        for with_partners in (False, True):
+            for hide_account_at_0 in (False, True):
+                wizard = self.env["trial.balance.report.wizard"].create(
+                    {
+                        "date_from": self.date_start,
+                        "date_to": self.date_end,
+                        "target_move": "posted",
+                        "hide_account_at_0": hide_account_at_0,
+                        "company_id": self.env.user.company_id.id,
+                        "fy_start_date": self.fy_date_start,
+                        "show_partner_details": with_partners,
+                    }
+                )
+                args = get_data_args(wizard._prepare_report_trial_balance())
+                sql_data = report._get_data(*args)
+                read_group_data = report.with_context(
+                    account_financial_report_read_group=True
+                )._get_data(*args)
+                self.assertEqual(
+                    get_report_amounts(sql_data[0]),
+                    get_report_amounts(read_group_data[0]),
+                )
+                self.assertEqual(set(sql_data[1]), set(read_group_data[1]))
+                self.assertEqual(sql_data[2], read_group_data[2])
+
+    def test_07_balance_snapshot(self):
+        for date in (self.previous_fy_date_end, "2016-03-15", "2016-06-15"):
+            self._add_move(
+                date=date,
+                receivable_debit=1000,
+                receivable_credit=0,
+                income_debit=0,
+                income_credit=1000,
+                unaffected_debit=50,
+                unaffected_credit=0,
+            )
+        company = self.env.user.company_id
+        self.env["account.balance.snapshot"]._cron_update_snapshots(company)
+        self.assertTrue(company.account_balance_snapshot_date)
+        # Entries of the snapshotted months posted or reset to draft afterwards
+        self._add_move(
+            date="2016-02-10",
+            receivable_debit=0,
+            receivable_credit=400,
+            income_debit=400,
+            income_credit=0,
+        )
+        self.env["account.move"].search(
+            [("date", "=", "2016-03-15"), ("company_id", "=", company.id)]
+        ).button_draft()
+        self._assert_balance_snapshot(company)
+
+    def test_08_balance_snapshot_lines(self):
+        for date in ("2016-03-15", "2016-06-15"):
+            self._add_move(
+                date=date,
+                receivable_debit=1000,
+                receivable_credit=0,
+                income_debit=0,
+                income_credit=1000,
+            )
+        company = self.env.user.company_id
+        self.env["account.balance.snapshot"]._cron_update_snapshots(company)
+        self.assertTrue(company.account_balance_snapshot_date)
+        # Journal items of a snapshotted month changed or added after posting
+        move = self.env["account.move"].search(
+            [("date", "=", "2016-03-15"), ("company_id", "=", company.id)]
+        )
+        lines = move.line_ids
+        lines.filtered(lambda line: line.account_id == self.account200).account_id = (
+            self.account201
+        )
+        lines.filtered(lambda line: line.account_id == self.account100).partner_id = (
+            self.env.ref("base.res_partner_2")
+        )
+        move.write(
+            {
+                "line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "debit": 300,
+                            "credit": 0,
+                            "partner_id": self.partner.id,
+                            "account_id": self.account100.id,
+                        },
+                    ),
+                    (
+                        0,
+                        0,
+                        {
+                            "debit": 0,
+                            "credit": 300,
+                            "partner_id": self.partner.id,
+                            "account_id": self.account300.id,
+                        },
+                    ),
+                ]
+            }
+        )
+        self._assert_balance_snapshot(company)
+
+    def _assert_balance_snapshot(self, company):
+        """Compare the reports read from the snapshot with those read from the
+        journal items only.
+        """
+        trial_balance = self.env["report.account_financial_report.trial_balance"]
+        general_ledger = self.env["report.account_financial_report.general_ledger"]
+        for with_partners in (False, True):
+            wizard = self.env["trial.balance.report.wizard"].create(
+                {
+                    "date_from": "2016-05-10",
+                    "date_to": self.date_end,
+                    "target_move": "posted",
+                    "hide_account_at_0": False,
+                    "company_id": company.id,
+                    "fy_start_date": self.fy_date_start,
+                    "show_partner_details": with_partners,
+                }
+            )
+            args = get_data_args(wizard._prepare_report_trial_balance())
+            gl_args = (
+                [],
+                [],
+                company.id,
+                "2016-05-10",
+                False,
+                True,
+                self.unaffected_account.id,
+                self.fy_date_start,
+                [],
+                [],
+                "partners" if with_partners else False,
+            )
+            snapshot_data = trial_balance._get_data(*args)
+            gl_snapshot_data = general_ledger._get_initial_balance_data(*gl_args)
+            snapshot_date = company.account_balance_snapshot_date
+            company.account_balance_snapshot_date = False
+            lines_data = trial_balance._get_data(*args)
+            gl_lines_data = general_ledger._get_initial_balance_data(*gl_args)
+            company.account_balance_snapshot_date = snapshot_date
+            self.assertEqual(
+                get_report_amounts(snapshot_data[0]),
+                get_report_amounts(lines_data[0]),
+            )
+            self.assertEqual(snapshot_data[2], lines_data[2])
+            self.assertEqual(gl_snapshot_data, gl_lines_data)
+
+
+@tagged("post_install", "-at_install", "-standard", "trial_balance_benchmark")
+class TestTrialBalanceBenchmark(AccountTestInvoicingCommon):
+    """Compare the SQL and read_group engines of the trial balance on a
+    synthetic ledger. Run it with ``--test-tags trial_balance_benchmark``.
+    """
+
+    ledger_lines = 1_000_000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        partners = cls.env["res.partner"].create(
+            [{"name": f"Benchmark Partner {i}"} for i in range(50)]
+        )
+        income_account = cls.company_data["default_account_revenue"]
+        receivable_account = cls.company_data["default_account_receivable"]
+        move = cls.env["account.move"].create(
+            {
+                "journal_id": cls.company_data["default_journal_misc"].id,
+                "date": "2016-12-31",
+                "line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "debit": 100.0,
+                            "credit": 0.0,
+                            "partner_id": partners[0].id,
+                            "account_id": receivable_account.id,
+                        },
+                    ),
+                    (
+                        0,
+                        0,
+                        {
+                            "debit": 0.0,
+                            "credit": 100.0,
+                            "partner_id": partners[0].id,
+                            "account_id": income_account.id,
+                        },
+                    ),
+                ],
+            }
+        )
+        move.action_post()
+        cls.env.flush_all()
+        # Replicate the lines of the move over the four previous years and
+        # the partners with a single query.
+        cls.env.cr.execute(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'account_move_line' AND column_name != 'id'
+            """
+        )
+        columns = [column for (column,) in cls.env.cr.fetchall()]
+        values = {column: SQL.identifier("aml", column) for column in columns}
+        values["date"] = SQL("aml.date - MOD(serie.n, 1461)")
+        values["partner_id"] = SQL(
+            "(%s::integer[])[1 + MOD(serie.n, %s)]", partners.ids, len(partners)
+        )
+        cls.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO account_move_line (%s)
+                SELECT %s
+                FROM account_move_line aml,
+                    GENERATE_SERIES(1, %s) AS serie(n)
+                WHERE aml.move_id = %s
+                """,
+                SQL(", ").join(SQL.identifier(column) for column in columns),
+                SQL(", ").join(values[column] for column in columns),
+                cls.ledger_lines // len(move.line_ids),
+                move.id,
+            )
+        )
+        cls.env.invalidate_all()
+
+    def _benchmark(self, report, args):
+        start = time.time()
+        data = report._get_data(*args)
+        return data, time.time() - start
+
+    def test_trial_balance_engines(self):
+        report = self.env["report.account_financial_report.trial_balance"]
+        for with_partners in (False, True):
+            wizard = self.env["trial.balance.report.wizard"].create(
+                {
+                    "date_from": "2016-01-01",
+                    "date_to": "2016-12-31",
+                    "target_move": "posted",
+                    "hide_account_at_0": True,
+                    "company_id": self.env.company.id,
+                    "fy_start_date": "2016-01-01",
+                    "show_partner_details": with_partners,
+                }
+            )
+            args = get_data_args(wizard._prepare_report_trial_balance())
+            read_group_data, read_group_time = self._benchmark(
+                report.with_context(account_financial_report_read_group=True), args
+            )
+            sql_data, sql_time = self._benchmark(report, args)
+            _logger.info(
+                "Trial balance on %s journal items (partner details: %s): "
+                "read_group engine %.2fs, SQL engine %.2fs",
+                self.ledger_lines,
+                with_partners,
+                read_group_time,
+                sql_time,
+            )
+            self.assertEqual(
+                get_report_amounts(sql_data[0]),
+                get_report_amounts(read_group_data[0]),
+            )
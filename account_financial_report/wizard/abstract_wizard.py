@@ -49,3 +49,26 @@ class AbstractWizard(models.AbstractModel):
         self.ensure_one()
         report_type = "xlsx"
         return self._export(report_type)
+
+    def button_export_pdf_async(self):
+        self.ensure_one()
+        report_type = "qweb-pdf"
+        return self._export_async(report_type)
+
+    def button_export_xlsx_async(self):
+        self.ensure_one()
+        report_type = "xlsx"
+        return self._export_async(report_type)
+
+    def _export_async(self, report_type):
+        """Generate the report in background, see account.financial.report.job."""
+        action = self._export(report_type)
+        if action.get("type") != "ir.actions.report":
+            # e.g. the configuration of the document layout
+            return action
+        report = self.env["ir.actions.report"]._get_report_from_name(
+            action["report_name"]
+        )
+        return self.env["account.financial.report.job"]._enqueue(
+            report, action["data"], self
+        )
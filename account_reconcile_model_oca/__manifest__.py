@@ -11,6 +11,6 @@
     "website": "https://github.com/OCA/account-reconcile",
     "depends": ["account"],
     "excludes": ["account_accountant"],
-    "data": [],
+    "data": ["security/ir.model.access.csv"],
     "demo": [],
 }
@@ -1,2 +1,7 @@
+from . import account_account
 from . import account_reconcile_model
 from . import account_bank_statement_line
+from . import account_move
+from . import account_move_line
+from . import account_move_line_token
+from . import account_partial_reconcile
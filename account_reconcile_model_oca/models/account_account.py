@@ -0,0 +1,21 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import models
+
+
+class AccountAccount(models.Model):
+    _inherit = "account.account"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "reconcile" in vals:
+            self.env["account.move.line.token"]._refresh_tokens(
+                self.env["account.move.line"].search(
+                    [
+                        ("account_id", "in", self.ids),
+                        ("parent_state", "=", "posted"),
+                        ("reconciled", "=", False),
+                    ]
+                )
+            )
+        return res
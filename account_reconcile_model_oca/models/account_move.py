@@ -0,0 +1,13 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"state", "name", "ref"} & set(vals):
+            self.env["account.move.line.token"]._refresh_tokens(self.line_ids)
+        return res
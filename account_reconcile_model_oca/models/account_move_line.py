@@ -0,0 +1,24 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class AccountMoveLine(models.Model):
+    _inherit = "account.move.line"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        # Lines added to an entry already posted get their tokens right away
+        self.env["account.move.line.token"]._refresh_tokens(
+            lines.filtered(lambda line: line.parent_state == "posted")
+        )
+        return lines
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"name", "account_id", "display_type"} & set(vals):
+            self.env["account.move.line.token"]._refresh_tokens(
+                self.filtered(lambda line: line.parent_state == "posted")
+            )
+        return res
@@ -0,0 +1,121 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+# Longer values are not indexed as exact tokens, they would exceed the btree
+# index row size and never match a single word statement line value anyway.
+EXACT_TOKEN_MAX_LENGTH = 256
+
+
+class AccountMoveLineToken(models.Model):
+    """Tokens of the open journal items used by the 'invoice_matching' rules.
+
+    Every posted, not reconciled journal item of a reconcilable account gets the
+    digits of each word and the whole value of its label, entry number and entry
+    reference. The tokens are refreshed when moves are posted, reset or renamed,
+    when journal items are reconciled or unreconciled and when the reconciliation
+    is allowed or disallowed on an account.
+    """
+
+    _name = "account.move.line.token"
+    _description = "Journal Item Matching Token"
+    _log_access = False
+
+    move_line_id = fields.Many2one(
+        "account.move.line", required=True, index=True, ondelete="cascade"
+    )
+    location = fields.Selection(
+        [
+            ("name", "Label"),
+            ("move_name", "Journal Entry Number"),
+            ("move_ref", "Journal Entry Reference"),
+        ],
+        required=True,
+    )
+    token_kind = fields.Selection(
+        [("numerical", "Numerical"), ("exact", "Exact")], required=True
+    )
+    token = fields.Char(required=True, index=True)
+
+    def init(self):
+        self.env.cr.execute(
+            SQL("SELECT 1 FROM %s LIMIT 1", SQL.identifier(self._table))
+        )
+        if not self.env.cr.fetchone():
+            self._insert_tokens()
+
+    @api.model
+    def _insert_tokens(self, move_line_ids=None):
+        """Insert the tokens of the open journal items, all of them when
+        ``move_line_ids`` is None.
+        """
+        where_ids = (
+            SQL("AND aml.id IN %s", tuple(move_line_ids))
+            if move_line_ids is not None
+            else SQL()
+        )
+        self.env.cr.execute(
+            SQL(
+                r"""
+                WITH src AS (
+                    SELECT aml.id AS move_line_id, val.location, val.value
+                    FROM account_move_line aml
+                    JOIN account_move move ON move.id = aml.move_id
+                    JOIN account_account account ON account.id = aml.account_id
+                    CROSS JOIN LATERAL (
+                        VALUES
+                            ('name', aml.name),
+                            ('move_name', move.name),
+                            ('move_ref', move.ref)
+                    ) AS val(location, value)
+                    WHERE move.state = 'posted'
+                        AND NOT aml.reconciled
+                        AND account.reconcile
+                        AND COALESCE(aml.display_type, '') NOT IN ('line_section', 'line_note')
+                        AND COALESCE(val.value, '') != ''
+                        %(where_ids)s
+                )
+                INSERT INTO %(table)s (move_line_id, location, token_kind, token)
+                SELECT move_line_id, location, 'numerical', token
+                FROM src
+                CROSS JOIN LATERAL UNNEST(
+                    REGEXP_SPLIT_TO_ARRAY(
+                        SUBSTRING(
+                            REGEXP_REPLACE(src.value, '[^0-9\s]', '', 'g'),
+                            '\S(?:.*\S)*'
+                        ),
+                        '\s+'
+                    )
+                ) AS token
+                UNION ALL
+                SELECT move_line_id, location, 'exact', value
+                FROM src
+                WHERE CHAR_LENGTH(value) <= %(max_length)s
+                """,
+                table=SQL.identifier(self._table),
+                where_ids=where_ids,
+                max_length=EXACT_TOKEN_MAX_LENGTH,
+            )
+        )
+
+    @api.model
+    def _refresh_tokens(self, move_lines):
+        """Recompute the tokens of the journal items, dropping them for the ones
+        that can't be matched anymore.
+        """
+        if not move_lines.ids:
+            return
+        self.env["account.move"].flush_model(["name", "ref", "state"])
+        self.env["account.move.line"].flush_model(
+            ["name", "account_id", "display_type", "reconciled"]
+        )
+        self.env["account.account"].flush_model(["reconcile"])
+        self.env.cr.execute(
+            SQL(
+                "DELETE FROM %s WHERE move_line_id IN %s",
+                SQL.identifier(self._table),
+                tuple(move_lines.ids),
+            )
+        )
+        self._insert_tokens(move_lines.ids)
@@ -0,0 +1,21 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = "account.partial.reconcile"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        self.env["account.move.line.token"]._refresh_tokens(
+            partials.debit_move_id | partials.credit_move_id
+        )
+        return partials
+
+    def unlink(self):
+        move_lines = self.debit_move_id | self.credit_move_id
+        res = super().unlink()
+        self.env["account.move.line.token"]._refresh_tokens(move_lines.exists())
+        return res
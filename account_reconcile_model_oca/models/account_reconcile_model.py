@@ -4,6 +4,7 @@ from collections import defaultdict
 from dateutil.relativedelta import relativedelta
 
 from odoo import Command, fields, models, tools
+from odoo.tools import SQL
 
 
 class AccountReconcileModel(models.Model):
@@ -191,27 +192,9 @@ class AccountReconcileModel(models.Model):
                 continue
 
             if rec_model.rule_type == "invoice_matching":
-                rules_map = rec_model._get_invoice_matching_rules_map()
-                for rule_index in sorted(rules_map.keys()):
-                    for rule_method in rules_map[rule_index]:
-                        candidate_vals = rule_method(st_line, partner)
-                        if not candidate_vals:
-                            continue
-
-                        if candidate_vals.get("amls"):
-                            res = rec_model._get_invoice_matching_amls_result(
-                                st_line, partner, candidate_vals
-                            )
-                            if res:
-                                return {
-                                    **res,
-                                    "model": rec_model,
-                                }
-                        else:
-                            return {
-                                **candidate_vals,
-                                "model": rec_model,
-                            }
+                res = rec_model._apply_invoice_matching_rules(st_line, partner)
+                if res:
+                    return res
 
             elif rec_model.rule_type == "writeoff_suggestion":
                 return {
@@ -221,6 +204,98 @@ class AccountReconcileModel(models.Model):
                 }
         return {}
 
+    def _apply_rules_batch(self, st_lines, partners):
+        """Batch counterpart of :meth:`_apply_rules`.
+        The token based candidates of the 'invoice_matching' models are searched for
+        all the statement lines at once, the remaining rules are applied line by line.
+        :param st_lines: The statement lines to match.
+        :param partners: A dict mapping each statement line id with the partner to
+          consider.
+        :return: A dict mapping each matched statement line id with the result
+          :meth:`_apply_rules` returns for it.
+        """
+        available_models = self.filtered(
+            lambda m: m.rule_type != "writeoff_button"
+        ).sorted()
+
+        results = {}
+        pending_st_lines = st_lines
+        for rec_model in available_models:
+            applicable_st_lines = pending_st_lines.filtered(
+                lambda st_line, rec_model=rec_model: rec_model._is_applicable_for(
+                    st_line, partners[st_line.id]
+                )
+            )
+            if not applicable_st_lines:
+                continue
+
+            if rec_model.rule_type == "invoice_matching":
+                token_candidates = rec_model._get_invoice_matching_token_candidates(
+                    applicable_st_lines, partners
+                )
+                for st_line in applicable_st_lines:
+                    res = rec_model._apply_invoice_matching_rules(
+                        st_line,
+                        partners[st_line.id],
+                        token_candidates=token_candidates,
+                    )
+                    if res:
+                        results[st_line.id] = res
+
+            elif rec_model.rule_type == "writeoff_suggestion":
+                for st_line in applicable_st_lines:
+                    results[st_line.id] = {
+                        "model": rec_model,
+                        "status": "write_off",
+                        "auto_reconcile": rec_model.auto_reconcile,
+                    }
+            pending_st_lines = pending_st_lines.filtered(
+                lambda st_line: st_line.id not in results
+            )
+        return results
+
+    def _apply_invoice_matching_rules(self, st_line, partner, token_candidates=None):
+        """Apply the rules of an 'invoice_matching' model to the statement line.
+        :param st_line: The statement line to match.
+        :param partner: The partner to consider.
+        :param token_candidates: Optional result of
+          :meth:`_get_invoice_matching_token_candidates` computed for a batch of
+          statement lines including this one.
+        :return: The result of :meth:`_apply_rules` for this model or None.
+        """
+        self.ensure_one()
+        rules_map = self._get_invoice_matching_rules_map()
+        for rule_index in sorted(rules_map.keys()):
+            for rule_method in rules_map[rule_index]:
+                if (
+                    token_candidates is not None
+                    and rule_method == self._get_invoice_matching_amls_candidates
+                ):
+                    candidate_vals = rule_method(
+                        st_line,
+                        partner,
+                        token_candidate_ids=token_candidates.get(st_line.id),
+                    )
+                else:
+                    candidate_vals = rule_method(st_line, partner)
+                if not candidate_vals:
+                    continue
+
+                if candidate_vals.get("amls"):
+                    res = self._get_invoice_matching_amls_result(
+                        st_line, partner, candidate_vals
+                    )
+                    if res:
+                        return {
+                            **res,
+                            "model": self,
+                        }
+                else:
+                    return {
+                        **candidate_vals,
+                        "model": self,
+                    }
+
     def _is_applicable_for(self, st_line, partner):
         """Returns true iff this reconciliation model can be used to search for matches
         for the provided statement line and partner.
@@ -374,18 +449,195 @@ class AccountReconcileModel(models.Model):
                 exact_tokens.append(text_value)
         return numerical_tokens, exact_tokens, text_tokens
 
-    def _get_invoice_matching_amls_candidates(self, st_line, partner):
+    def _get_invoice_matching_token_locations(self):
+        """Return the locations of the account.move.line.token records in which the
+        statement line tokens are looked for.
+        """
+        locations = []
+        if self.match_text_location_label:
+            locations.append("name")
+        if self.match_text_location_note:
+            locations.append("move_name")
+        if self.match_text_location_reference:
+            locations.append("move_ref")
+        return locations
+
+    def _get_invoice_matching_order_by_clause(self, alias=None):
+        direction = "DESC" if self.matching_order == "new_first" else "ASC"
+        dotted_alias = f"{alias}." if alias else ""
+        return f"{dotted_alias}date_maturity {direction}, {dotted_alias}date {direction}, {dotted_alias}id {direction}"  # noqa: E501
+
+    def _get_invoice_matching_amls_batch_domain(self, st_lines):
+        """Domain of the journal items that could match any of the statement lines.
+        It mirrors :meth:`_get_invoice_matching_amls_domain` without the criteria
+        depending on each statement line (sign, currency, partner), which are applied
+        by :meth:`_get_invoice_matching_token_candidates`.
+        :param st_lines: The statement lines to match.
+        """
+        aml_domain = [
+            ("display_type", "not in", ("line_section", "line_note")),
+            ("company_id", "child_of", st_lines.company_id.root_id.ids),
+            ("parent_state", "=", "posted"),
+            ("reconciled", "=", False),
+            ("account_id.reconcile", "=", True),
+            "|",
+            (
+                "account_id.account_type",
+                "not in",
+                ("asset_receivable", "liability_payable"),
+            ),
+            ("payment_id", "=", False),
+        ]
+        if self.past_months_limit:
+            date_limit = fields.Date.context_today(self) - relativedelta(
+                months=self.past_months_limit
+            )
+            aml_domain.append(("date", ">=", fields.Date.to_string(date_limit)))
+        return aml_domain
+
+    def _get_invoice_matching_token_candidates(self, st_lines, partners):
+        """Search the token based candidates of many statement lines at once.
+        The tokens of all the statement lines are joined in a single query with the
+        account.move.line.token records of the open journal items.
+        :param st_lines: The statement lines to match.
+        :param partners: A dict mapping each statement line id with the partner to
+          consider.
+        :return: A dict mapping the id of each statement line having some tokens with
+          the ordered list of the candidate account.move.line ids, possibly empty.
+        """
+        self.ensure_one()
+        assert self.rule_type == "invoice_matching"
+        st_line_ids = []
+        root_company_ids = []
+        signs = []
+        currency_ids = []
+        partner_ids = []
+        tokens = []
+        with_numerical = []
+        with_exact = []
+        results = {}
+        for st_line in st_lines:
+            (
+                numerical_tokens,
+                exact_tokens,
+                _text_tokens,
+            ) = self._get_invoice_matching_st_line_tokens(st_line)
+            if not numerical_tokens and not exact_tokens:
+                continue
+            results[st_line.id] = []
+            currency = st_line.foreign_currency_id or st_line.currency_id
+            partner = partners[st_line.id]
+            for token in set(numerical_tokens + exact_tokens):
+                st_line_ids.append(st_line.id)
+                root_company_ids.append(st_line.company_id.root_id.id)
+                signs.append(1 if st_line.amount > 0.0 else -1)
+                currency_ids.append(currency.id if self.match_same_currency else None)
+                partner_ids.append(partner.id or None)
+                tokens.append(token)
+                with_numerical.append(bool(numerical_tokens))
+                with_exact.append(bool(exact_tokens))
+
+        locations = self._get_invoice_matching_token_locations()
+        if not results or not locations:
+            return {}
+
+        self.env["account.move"].flush_model()
+        self.env["account.move.line"].flush_model()
+        query = self.env["account.move.line"]._where_calc(
+            self._get_invoice_matching_amls_batch_domain(st_lines)
+        )
+        self._cr.execute(
+            SQL(
+                """
+                WITH st AS (
+                    SELECT *
+                    FROM UNNEST(
+                        %s::integer[],
+                        %s::integer[],
+                        %s::integer[],
+                        %s::integer[],
+                        %s::integer[],
+                        %s::varchar[],
+                        %s::boolean[],
+                        %s::boolean[]
+                    ) AS st(
+                        st_line_id,
+                        root_company_id,
+                        sign,
+                        currency_id,
+                        partner_id,
+                        token,
+                        with_numerical,
+                        with_exact
+                    )
+                )
+                SELECT
+                    st.st_line_id,
+                    account_move_line.id,
+                    COUNT(*) AS nb_match
+                FROM %s
+                JOIN account_move_line_token aml_token
+                    ON aml_token.move_line_id = account_move_line.id
+                JOIN res_company aml_company
+                    ON aml_company.id = account_move_line.company_id
+                JOIN st ON st.token = aml_token.token
+                    AND (
+                        (aml_token.token_kind = 'numerical' AND st.with_numerical)
+                        OR (aml_token.token_kind = 'exact' AND st.with_exact)
+                    )
+                WHERE %s
+                    AND aml_token.location IN %s
+                    AND aml_company.parent_path LIKE st.root_company_id || '/%%'
+                    AND SIGN(account_move_line.balance) = st.sign
+                    AND (
+                        st.currency_id IS NULL
+                        OR account_move_line.currency_id = st.currency_id
+                    )
+                    AND (
+                        st.partner_id IS NULL
+                        OR account_move_line.partner_id = st.partner_id
+                    )
+                    AND account_move_line.statement_line_id
+                        IS DISTINCT FROM st.st_line_id
+                GROUP BY
+                    st.st_line_id,
+                    account_move_line.date_maturity,
+                    account_move_line.date,
+                    account_move_line.id
+                ORDER BY st.st_line_id, nb_match DESC, %s
+                """,
+                st_line_ids,
+                root_company_ids,
+                signs,
+                currency_ids,
+                partner_ids,
+                tokens,
+                with_numerical,
+                with_exact,
+                query.from_clause,
+                query.where_clause,
+                tuple(locations),
+                SQL(
+                    self._get_invoice_matching_order_by_clause(
+                        alias="account_move_line"
+                    )
+                ),
+            )
+        )
+        for st_line_id, aml_id, _nb_match in self._cr.fetchall():
+            results[st_line_id].append(aml_id)
+        return results
+
+    def _get_invoice_matching_amls_candidates(
+        self, st_line, partner, token_candidate_ids=None
+    ):
         """Returns the match candidates for the 'invoice_matching' rule, with respect to
         the provided parameters.
         :param st_line: A statement line.
         :param partner: The partner associated to the statement line.
+        :param token_candidate_ids: The token based candidates already found by
+          :meth:`_get_invoice_matching_token_candidates`, if any.
         """
-
-        def get_order_by_clause(alias=None):
-            direction = "DESC" if self.matching_order == "new_first" else "ASC"
-            dotted_alias = f"{alias}." if alias else ""
-            return f"{dotted_alias}date_maturity {direction}, {dotted_alias}date {direction}, {dotted_alias}id {direction}"  # noqa: E501
-
         assert self.rule_type == "invoice_matching"
         self.env["account.move"].flush_model()
         self.env["account.move.line"].flush_model()
@@ -397,103 +649,56 @@ class AccountReconcileModel(models.Model):
         from_clause = from_string
         where_clause = where_string
 
-        sub_queries = []
-        all_params = []
-        aml_cte = ""
-        (
-            numerical_tokens,
-            exact_tokens,
-            _text_tokens,
-        ) = self._get_invoice_matching_st_line_tokens(st_line)
-        if numerical_tokens or exact_tokens:
-            aml_cte = rf"""
-                WITH aml_cte AS (
-                    SELECT
-                        account_move_line.id as account_move_line_id,
-                        account_move_line.date as account_move_line_date,
-                        account_move_line.date_maturity as account_move_line_date_maturity,
-                        account_move_line.name as account_move_line_name,
-                        account_move_line__move_id.name as account_move_line__move_id_name,
-                        account_move_line__move_id.ref as account_move_line__move_id_ref
-                    FROM {from_clause}
-                    JOIN account_move account_move_line__move_id
-                        ON account_move_line__move_id.id = account_move_line.move_id
-                    WHERE {where_clause}
-                )
-            """  # noqa: E501
-            all_params += where_params
-
-        enabled_matches = []
-        if self.match_text_location_label:
-            enabled_matches.append(("account_move_line", "name"))
-        if self.match_text_location_note:
-            enabled_matches.append(("account_move_line__move_id", "name"))
-        if self.match_text_location_reference:
-            enabled_matches.append(("account_move_line__move_id", "ref"))
-
-        if numerical_tokens:
-            for table_alias, field in enabled_matches:
-                sub_queries.append(
-                    rf"""
-                    SELECT
-                        account_move_line_id as id,
-                        account_move_line_date as date,
-                        account_move_line_date_maturity as date_maturity,
-                        UNNEST(
-                            REGEXP_SPLIT_TO_ARRAY(
-                                SUBSTRING(
-                                    REGEXP_REPLACE(
-                                        {table_alias}_{field}, '[^0-9\s]', '', 'g'
-                                    ),
-                                    '\S(?:.*\S)*'
-                                ),
-                                '\s+'
-                            )
-                        ) AS token
-                    FROM aml_cte
-                    WHERE {table_alias}_{field} IS NOT NULL
-                """
+        if token_candidate_ids is None:
+            (
+                numerical_tokens,
+                exact_tokens,
+                _text_tokens,
+            ) = self._get_invoice_matching_st_line_tokens(st_line)
+            locations = self._get_invoice_matching_token_locations()
+            token_kinds = []
+            if numerical_tokens:
+                token_kinds.append("numerical")
+            if exact_tokens:
+                token_kinds.append("exact")
+            if locations and token_kinds:
+                order_by = self._get_invoice_matching_order_by_clause(
+                    alias="account_move_line"
                 )
-
-        if exact_tokens:
-            for table_alias, field in enabled_matches:
-                sub_queries.append(
-                    rf"""
-                    SELECT
-                        account_move_line_id as id,
-                        account_move_line_date as date,
-                        account_move_line_date_maturity as date_maturity,
-                        {table_alias}_{field} AS token
-                    FROM aml_cte
-                    WHERE COALESCE({table_alias}_{field}, '') != ''
-                """
+                self._cr.execute(
+                    SQL(
+                        """
+                        SELECT
+                            account_move_line.id,
+                            COUNT(*) AS nb_match
+                        FROM %s
+                        JOIN account_move_line_token aml_token
+                            ON aml_token.move_line_id = account_move_line.id
+                        WHERE %s
+                            AND aml_token.location IN %s
+                            AND aml_token.token_kind IN %s
+                            AND aml_token.token IN %s
+                        GROUP BY
+                            account_move_line.date_maturity,
+                            account_move_line.date,
+                            account_move_line.id
+                        ORDER BY nb_match DESC, %s
+                        """,
+                        query.from_clause,
+                        query.where_clause,
+                        tuple(locations),
+                        tuple(token_kinds),
+                        tuple(numerical_tokens + exact_tokens),
+                        SQL(order_by),
+                    )
                 )
+                token_candidate_ids = [r[0] for r in self._cr.fetchall()]
 
-        if sub_queries:
-            order_by = get_order_by_clause(alias="sub")
-            self._cr.execute(
-                aml_cte
-                + """
-                    SELECT
-                        sub.id,
-                        COUNT(*) AS nb_match
-                    FROM ("""
-                + " UNION ALL ".join(sub_queries)
-                + """) AS sub
-                    WHERE sub.token IN %s
-                    GROUP BY sub.date_maturity, sub.date, sub.id
-                    HAVING COUNT(*) > 0
-                    ORDER BY nb_match DESC, """
-                + order_by
-                + """
-                """,
-                all_params + [tuple(numerical_tokens + exact_tokens)],
-            )
-            candidate_ids = [r[0] for r in self._cr.fetchall()]
-            if candidate_ids:
+        if token_candidate_ids is not None:
+            if token_candidate_ids:
                 return {
                     "allow_auto_reconcile": True,
-                    "amls": self.env["account.move.line"].browse(candidate_ids),
+                    "amls": self.env["account.move.line"].browse(token_candidate_ids),
                 }
             elif (
                 self.match_text_location_label
@@ -516,7 +721,9 @@ class AccountReconcileModel(models.Model):
             else:
                 aml_amount_field = "amount_residual_currency"
 
-            order_by = get_order_by_clause(alias="account_move_line")
+            order_by = self._get_invoice_matching_order_by_clause(
+                alias="account_move_line"
+            )
             self._cr.execute(
                 f"""
                     SELECT account_move_line.id
@@ -540,7 +747,7 @@ class AccountReconcileModel(models.Model):
             )
         else:
             amls = self.env["account.move.line"].search(
-                aml_domain, order=get_order_by_clause()
+                aml_domain, order=self._get_invoice_matching_order_by_clause()
             )
         if amls:
             return {
@@ -598,7 +805,9 @@ class AccountReconcileModel(models.Model):
                 return partner_mapping.partner_id
         return self.env["res.partner"]
 
-    def _get_invoice_matching_amls_result(self, st_line, partner, candidate_vals):  # noqa: C901
+    def _get_invoice_matching_amls_result(
+        self, st_line, partner, candidate_vals
+    ):  # noqa: C901
         def _create_result_dict(amls_values_list, status):
             if "rejected" in status:
                 return
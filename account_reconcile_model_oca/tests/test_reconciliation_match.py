@@ -1621,3 +1621,211 @@ class TestReconciliationMatchingRules(AccountTestInvoicingCommon):
                     },
                 },
             )
+
+    def test_matching_tokens_maintained(self):
+        def get_tokens(aml):
+            return self.env["account.move.line.token"].search(
+                [("move_line_id", "=", aml.id)]
+            )
+
+        invoice = self.invoice_line_1.move_id
+        tokens = get_tokens(self.invoice_line_1)
+        self.assertIn(
+            ("move_name", "exact", invoice.name),
+            [(t.location, t.token_kind, t.token) for t in tokens],
+        )
+        self.assertIn(
+            "".join(x for x in invoice.name if x.isdecimal()),
+            tokens.filtered(lambda t: t.token_kind == "numerical").mapped("token"),
+        )
+
+        # Reconciled journal items can't be matched anymore.
+        payment_move = self.env["account.move"].create(
+            {
+                "move_type": "entry",
+                "date": "2019-09-01",
+                "line_ids": [
+                    Command.create(
+                        {
+                            "account_id": self.invoice_line_1.account_id.id,
+                            "partner_id": self.partner_1.id,
+                            "credit": 100.0,
+                        }
+                    ),
+                    Command.create(
+                        {
+                            "account_id": self.current_assets_account.id,
+                            "debit": 100.0,
+                        }
+                    ),
+                ],
+            }
+        )
+        payment_move.action_post()
+        counterpart = payment_move.line_ids.filtered(
+            lambda line: line.account_id == self.invoice_line_1.account_id
+        )
+        (self.invoice_line_1 + counterpart).reconcile()
+        self.assertFalse(get_tokens(self.invoice_line_1))
+        self.assertFalse(get_tokens(counterpart))
+
+        self.invoice_line_1.remove_move_reconcile()
+        self.assertTrue(get_tokens(self.invoice_line_1))
+
+        # Draft journal items can't be matched either.
+        invoice.button_draft()
+        self.assertFalse(get_tokens(self.invoice_line_1))
+        invoice.action_post()
+        self.assertTrue(get_tokens(self.invoice_line_1))
+
+    def test_matching_tokens_account_reconcile(self):
+        account = self.current_assets_account.copy({"reconcile": False})
+        move = self.env["account.move"].create(
+            {
+                "move_type": "entry",
+                "date": "2019-09-01",
+                "ref": "REF 4242",
+                "line_ids": [
+                    Command.create({"account_id": account.id, "debit": 100.0}),
+                    Command.create(
+                        {
+                            "account_id": self.current_assets_account.id,
+                            "credit": 100.0,
+                        }
+                    ),
+                ],
+            }
+        )
+        move.action_post()
+        line = move.line_ids.filtered(lambda x: x.account_id == account)
+        token_model = self.env["account.move.line.token"]
+        self.assertFalse(token_model.search([("move_line_id", "=", line.id)]))
+        # Items posted before the reconciliation is allowed get their tokens
+        account.reconcile = True
+        tokens = token_model.search([("move_line_id", "=", line.id)])
+        self.assertIn(
+            ("move_ref", "numerical", "4242"),
+            [(t.location, t.token_kind, t.token) for t in tokens],
+        )
+        account.reconcile = False
+        self.assertFalse(token_model.search([("move_line_id", "=", line.id)]))
+
+    @freeze_time("2020-01-01")
+    def test_apply_rules_batch(self):
+        st_lines = (
+            self.bank_line_1
+            + self.bank_line_2
+            + self.bank_line_3
+            + self.bank_line_4
+            + self.bank_line_5
+            + self.cash_line_1
+        )
+        rules = self.rule_1 + self.rule_2
+        partners = {st_line.id: st_line._retrieve_partner() for st_line in st_lines}
+        results = rules._apply_rules_batch(st_lines, partners)
+        for st_line in st_lines:
+            self.assertDictEqual(
+                results.get(st_line.id, {}),
+                rules._apply_rules(st_line, partners[st_line.id]),
+            )
+
+    @freeze_time("2020-01-01")
+    def test_apply_rules_batch_branch(self):
+        """The journal items of the branches are candidates in batch too"""
+        branch = self.env["res.company"].create(
+            {"name": "Branch", "parent_id": self.company.id}
+        )
+        self.env.user.company_ids |= branch
+        branch_journal = self.env["account.journal"].create(
+            {
+                "name": "Branch Sales",
+                "code": "BRSAL",
+                "type": "sale",
+                "company_id": branch.id,
+                "default_account_id": self.company_data["default_account_revenue"].id,
+            }
+        )
+        invoice = (
+            self.env["account.move"]
+            .with_company(branch)
+            .create(
+                {
+                    "move_type": "out_invoice",
+                    "journal_id": branch_journal.id,
+                    "partner_id": self.partner_1.id,
+                    "invoice_date": "2019-09-01",
+                    "invoice_line_ids": [
+                        Command.create(
+                            {"name": "xxxx", "quantity": 1, "price_unit": 150}
+                        )
+                    ],
+                }
+            )
+        )
+        invoice.action_post()
+        st_line = self._create_st_line(
+            amount=150, payment_ref=invoice.name, partner_id=self.partner_1.id
+        )
+        partners = {st_line.id: st_line._retrieve_partner()}
+        expected = self.rule_1._apply_rules(st_line, partners[st_line.id])
+        self.assertEqual(
+            expected.get("amls"),
+            invoice.line_ids.filtered(
+                lambda line: line.account_id.account_type == "asset_receivable"
+            ),
+        )
+        self.assertDictEqual(
+            self.rule_1._apply_rules_batch(st_line, partners)[st_line.id], expected
+        )
+
+    def test_matching_tokens_line_created_on_posted_move(self):
+        move = self.env["account.move"].create(
+            {
+                "move_type": "entry",
+                "date": "2019-09-01",
+                "ref": "REF 8642",
+                "line_ids": [
+                    Command.create(
+                        {
+                            "account_id": self.current_assets_account.id,
+                            "debit": 100.0,
+                        }
+                    ),
+                    Command.create(
+                        {
+                            "account_id": self.company_data[
+                                "default_account_revenue"
+                            ].id,
+                            "credit": 100.0,
+                        }
+                    ),
+                ],
+            }
+        )
+        move.action_post()
+        # Lines written on the posted entry, as other modules do
+        move.line_ids = [
+            Command.create(
+                {
+                    "account_id": self.invoice_line_1.account_id.id,
+                    "partner_id": self.partner_1.id,
+                    "debit": 50.0,
+                }
+            ),
+            Command.create(
+                {
+                    "account_id": self.current_assets_account.id,
+                    "credit": 50.0,
+                }
+            ),
+        ]
+        line = move.line_ids.filtered(
+            lambda line: line.account_id == self.invoice_line_1.account_id
+        )
+        tokens = self.env["account.move.line.token"].search(
+            [("move_line_id", "=", line.id)]
+        )
+        self.assertIn(
+            ("move_ref", "numerical", "8642"),
+            [(t.location, t.token_kind, t.token) for t in tokens],
+        )
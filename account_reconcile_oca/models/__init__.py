@@ -3,6 +3,9 @@ from . import account_journal
 from . import account_bank_statement_line
 from . import account_bank_statement
 from . import account_account_reconcile
+from . import account_move
 from . import account_move_line
 from . import res_company
 from . import res_config_settings
+from . import account_partial_reconcile
+from . import account_reconcile_model
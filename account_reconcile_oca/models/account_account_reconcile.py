@@ -2,6 +2,11 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
 from odoo import api, fields, models
+from odoo.tools import str2bool
+from odoo.tools.sql import SQL, create_index
+
+MATERIALIZED_PARAM = "account_reconcile_oca.reconcile_materialized"
+MATERIALIZED_DIRTY_KEY = "account.account.reconcile.dirty"
 
 
 class CharId(fields.Id):
@@ -23,25 +28,223 @@ class AccountAccountReconcile(models.Model):
     is_reconciled = fields.Boolean(readonly=True)
     active = fields.Boolean(default=True)
 
+    _materialized_table = "account_account_reconcile_materialized"
+
     @property
     def _table_query(self):
+        if self._is_materialized():
+            return self._materialized_query()
         query = (
             f"{self._select()} {self._from()} {self._where()} "
             f"{self._groupby()} {self._having()}"
         )
         return query
 
-    def _select(self):
+    def init(self):
+        self.env.cr.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self._materialized_table} (
+                id integer PRIMARY KEY,
+                partner_id integer,
+                account_id integer NOT NULL,
+                is_reconciled boolean,
+                currency_id integer,
+                company_id integer,
+                foreign_currency_id integer,
+                active boolean
+            )
+            """
+        )
+        create_index(
+            self.env.cr,
+            f"{self._materialized_table}_account_partner_index",
+            self._materialized_table,
+            ["account_id", "partner_id", "currency_id", "company_id"],
+        )
+        create_index(
+            self.env.cr,
+            f"{self._materialized_table}_partner_index",
+            self._materialized_table,
+            ["partner_id"],
+        )
+
+    @api.model
+    def _is_materialized(self):
+        return str2bool(
+            self.env["ir.config_parameter"].sudo().get_param(MATERIALIZED_PARAM, "")
+        )
+
+    def _account_name(self):
         account_account_name_field = (
             self.env["ir.model.fields"]
             .sudo()
             .search([("model", "=", "account.account"), ("name", "=", "name")])
         )
-        account_name = (
+        return (
             f"a.name ->> '{self.env.user.lang}'"
             if account_account_name_field.translate
             else "a.name"
         )
+
+    def _materialized_query(self):
+        return f"""
+            SELECT
+                m.id,
+                {self._account_name()} as name,
+                m.partner_id,
+                m.account_id,
+                m.is_reconciled,
+                m.currency_id,
+                m.company_id,
+                m.foreign_currency_id,
+                m.active
+            FROM {self._materialized_table} m
+            JOIN account_account a ON a.id = m.account_id
+        """
+
+    def _materialized_insert_query(self, groups=None):
+        """Query inserting the aggregated rows in the materialized table, only the
+        ones of the (account, partner, currency, company) ``groups`` if given.
+        """
+        where = SQL(self._where())
+        if groups is not None:
+            account_ids, partner_ids, currency_ids, company_ids = zip(*groups)
+            where = SQL(
+                """
+                %s
+                AND EXISTS (
+                    SELECT 1
+                    FROM UNNEST(
+                        %s::integer[], %s::integer[], %s::integer[], %s::integer[]
+                    ) AS g(account_id, partner_id, currency_id, company_id)
+                    WHERE g.account_id = a.id
+                        AND g.partner_id IS NOT DISTINCT FROM (
+                            CASE
+                                WHEN a.account_type in (
+                                    'asset_receivable', 'liability_payable'
+                                )
+                                THEN aml.partner_id
+                                ELSE NULL
+                            END
+                        )
+                        AND g.currency_id IS NOT DISTINCT FROM aml.currency_id
+                        AND g.company_id IS NOT DISTINCT FROM am.company_id
+                )
+                """,
+                where,
+                list(account_ids),
+                list(partner_ids),
+                list(currency_ids),
+                list(company_ids),
+            )
+        return SQL(
+            """
+            INSERT INTO %s (
+                id,
+                partner_id,
+                account_id,
+                is_reconciled,
+                currency_id,
+                company_id,
+                foreign_currency_id,
+                active
+            )
+            SELECT
+                id,
+                partner_id,
+                account_id,
+                is_reconciled,
+                currency_id,
+                company_id,
+                foreign_currency_id::integer,
+                active
+            FROM (%s %s %s %s %s) AS q
+            """,
+            SQL.identifier(self._materialized_table),
+            SQL(self._select()),
+            SQL(self._from()),
+            where,
+            SQL(self._groupby()),
+            SQL(self._having()),
+        )
+
+    @api.model
+    def _refresh_materialized(self, groups=None):
+        """Rebuild the materialized rows, all of them or only the ones of the
+        (account, partner, currency, company) ``groups``.
+        """
+        self.env["account.move"].flush_model(["state", "company_id"])
+        self.env["account.move.line"].flush_model(
+            ["account_id", "partner_id", "currency_id", "amount_residual", "move_id"]
+        )
+        if groups is None:
+            self.env.cr.execute(
+                SQL("TRUNCATE %s", SQL.identifier(self._materialized_table))
+            )
+        elif not groups:
+            return
+        else:
+            account_ids, partner_ids, currency_ids, company_ids = zip(*groups)
+            self.env.cr.execute(
+                SQL(
+                    """
+                    DELETE FROM %s m
+                    USING UNNEST(
+                        %s::integer[], %s::integer[], %s::integer[], %s::integer[]
+                    ) AS g(account_id, partner_id, currency_id, company_id)
+                    WHERE m.account_id = g.account_id
+                        AND m.partner_id IS NOT DISTINCT FROM g.partner_id
+                        AND m.currency_id IS NOT DISTINCT FROM g.currency_id
+                        AND m.company_id IS NOT DISTINCT FROM g.company_id
+                    """,
+                    SQL.identifier(self._materialized_table),
+                    list(account_ids),
+                    list(partner_ids),
+                    list(currency_ids),
+                    list(company_ids),
+                )
+            )
+        self.env.cr.execute(self._materialized_insert_query(groups))
+
+    @api.model
+    def _mark_materialized_dirty(self, move_lines):
+        """Register the groups of the journal items to refresh in the materialized
+        table when the transaction is committed.
+        """
+        if not self._is_materialized():
+            return
+        groups = {
+            (
+                line.account_id.id,
+                line.partner_id.id
+                if line.account_id.account_type
+                in ("asset_receivable", "liability_payable")
+                else None,
+                line.currency_id.id or None,
+                line.move_id.company_id.id or None,
+            )
+            for line in move_lines
+            if line.account_id.reconcile
+        }
+        if not groups:
+            return
+        precommit = self.env.cr.precommit
+        if MATERIALIZED_DIRTY_KEY not in precommit.data:
+            precommit.add(self._refresh_materialized_dirty)
+        precommit.data.setdefault(MATERIALIZED_DIRTY_KEY, set()).update(groups)
+
+    @api.model
+    def _refresh_materialized_dirty(self):
+        groups = self.env.cr.precommit.data.pop(MATERIALIZED_DIRTY_KEY, set())
+        self._refresh_materialized(list(groups))
+
+    @api.model
+    def _cron_refresh_materialized(self):
+        if self._is_materialized():
+            self._refresh_materialized()
+
+    def _select(self):
+        account_name = self._account_name()
         return f"""
             SELECT
                 min(aml.id) as id,
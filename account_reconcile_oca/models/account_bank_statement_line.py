@@ -1,6 +1,9 @@
 # Copyright 2023 Dixmit
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+import copy
+import logging
+import time
 from collections import defaultdict
 
 from dateutil import rrule
@@ -9,9 +12,10 @@ from dateutil.relativedelta import relativedelta
 from odoo import Command, _, api, fields, models, tools
 from odoo.exceptions import UserError
 from odoo.fields import first
-from odoo.tools import LazyTranslate, float_compare, float_is_zero
+from odoo.tools import SQL, LazyTranslate, float_compare, float_is_zero
 
 _lt = LazyTranslate(__name__, default_lang="en_US")
+_logger = logging.getLogger(__name__)
 
 
 class AccountBankStatementLine(models.Model):
@@ -549,17 +553,146 @@ class AccountBankStatementLine(models.Model):
 
     @api.depends("reconcile_data", "is_reconciled")
     def _compute_reconcile_data_info(self):
+        default_data = self.filtered(
+            lambda r: not r.reconcile_data or r.is_reconciled
+        )._get_cached_default_reconcile_data()
         for record in self:
             if record.reconcile_data and not record.is_reconciled:
                 record.reconcile_data_info = record.reconcile_data
             else:
-                record.reconcile_data_info = record._default_reconcile_data(
-                    from_unreconcile=record.is_reconciled
-                )
+                record.reconcile_data_info = default_data[record.id]
             record.can_reconcile = record.reconcile_data_info.get(
                 "can_reconcile", False
             )
 
+    def _get_default_reconcile_data_fingerprints(self):
+        """Values that must not change for a cached default proposal to be reused,
+        by statement line id: the write date of its move, changed whenever the lines
+        of the statement line are modified, its partial reconciliations and the
+        generation of its company, increased when a reconciliation is removed or a
+        reconcile model changes.
+        """
+        self.env["account.partial.reconcile"].flush_model(
+            ["debit_move_id", "credit_move_id"]
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT st_line.id, partial.id
+                FROM account_bank_statement_line st_line
+                JOIN account_move_line aml ON aml.move_id = st_line.move_id
+                JOIN account_partial_reconcile partial
+                    ON partial.debit_move_id = aml.id
+                WHERE st_line.id IN %(ids)s
+                UNION
+                SELECT st_line.id, partial.id
+                FROM account_bank_statement_line st_line
+                JOIN account_move_line aml ON aml.move_id = st_line.move_id
+                JOIN account_partial_reconcile partial
+                    ON partial.credit_move_id = aml.id
+                WHERE st_line.id IN %(ids)s
+                """,
+                ids=tuple(self.ids),
+            )
+        )
+        partial_ids = defaultdict(list)
+        for st_line_id, partial_id in self.env.cr.fetchall():
+            partial_ids[st_line_id].append(partial_id)
+        return {
+            record.id: (
+                record.move_id.write_date,
+                record.is_reconciled,
+                tuple(sorted(partial_ids[record.id])),
+                record.company_id.reconcile_data_generation,
+                self.env.uid,
+                self.env.lang,
+                tuple(self.env.companies.ids),
+            )
+            for record in self
+        }
+
+    @api.model
+    @tools.ormcache("st_line_id", "fingerprint")
+    def _get_default_reconcile_data_cached(self, st_line_id, fingerprint):
+        """Return the default reconcile data of the statement line with the residual
+        of the journal items it proposes, which are not part of the fingerprint.
+        """
+        record = self.browse(st_line_id)
+        data = record._default_reconcile_data(from_unreconcile=record.is_reconciled)
+        counterparts = self.env["account.move.line"].browse(
+            {
+                aml_id
+                for line in data.get("data", [])
+                for aml_id in line.get("counterpart_line_ids", [])
+            }
+        )
+        return data, tuple((aml.id, aml.amount_residual) for aml in counterparts)
+
+    def _get_cached_default_reconcile_data(self):
+        """Return the default reconcile data of the statement lines by id.
+        The proposals are computed by :meth:`_default_reconcile_data` and kept in
+        the registry cache, shared by the workers, until their fingerprint changes.
+        A proposal is computed again, without being cached, once one of the journal
+        items it proposes is (partially) reconciled.
+        """
+        if not self:
+            return {}
+        fingerprints = self._get_default_reconcile_data_fingerprints()
+        entries = {
+            record.id: self._get_default_reconcile_data_cached(
+                record.id, fingerprints[record.id]
+            )
+            for record in self
+        }
+        residuals = {
+            aml_id: amount_residual
+            for _data, counterparts in entries.values()
+            for aml_id, amount_residual in counterparts
+        }
+        stale_aml_ids = set()
+        if residuals:
+            current_residuals = {
+                line["id"]: line["amount_residual"]
+                for line in self.env["account.move.line"].search_read(
+                    [("id", "in", list(residuals))], ["amount_residual"]
+                )
+            }
+            stale_aml_ids = {
+                aml_id
+                for aml_id, amount_residual in residuals.items()
+                if current_residuals.get(aml_id) != amount_residual
+            }
+        result = {}
+        for record in self:
+            data, counterparts = entries[record.id]
+            if any(aml_id in stale_aml_ids for aml_id, _residual in counterparts):
+                result[record.id] = record._default_reconcile_data(
+                    from_unreconcile=record.is_reconciled
+                )
+            else:
+                result[record.id] = copy.deepcopy(data)
+        return result
+
+    @api.model
+    def _invalidate_default_reconcile_data_cache(self, companies):
+        """Increase the generation of the companies, so that the cached proposals
+        of their statement lines are not reused in any worker.
+        """
+        if not companies:
+            return
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE res_company
+                SET reconcile_data_generation
+                    = COALESCE(reconcile_data_generation, 0) + 1
+                WHERE id IN %s
+                """,
+                tuple(companies.ids),
+            )
+        )
+        companies.invalidate_recordset(["reconcile_data_generation"])
+
     def action_show_move(self):
         self.ensure_one()
         action = self.env["ir.actions.act_window"]._for_xml_id(
@@ -803,7 +936,7 @@ class AccountBankStatementLine(models.Model):
         self.reconcile_data = False
         return result
 
-    def _reconcile_bank_line_edit(self, data):
+    def _reconcile_bank_line_edit(self, data, reconcile_plan=None):
         _liquidity_lines, suspense_lines, other_lines = self._seek_for_lines()
         lines_to_remove = [
             Command.delete(line.id) for line in suspense_lines + other_lines
@@ -844,6 +977,9 @@ class AccountBankStatementLine(models.Model):
                         )
                         + line
                     )
+        if reconcile_plan is not None:
+            reconcile_plan += to_reconcile
+            return
         for reconcile_items in to_reconcile:
             reconcile_items.reconcile()
 
@@ -852,7 +988,7 @@ class AccountBankStatementLine(models.Model):
             "journal_id": self.journal_id.id,
         }
 
-    def _reconcile_bank_line_keep(self, data):
+    def _reconcile_bank_line_keep(self, data, reconcile_plan=None):
         move = (
             self.env["account.move"]
             .with_context(skip_invoice_sync=True)
@@ -912,6 +1048,9 @@ class AccountBankStatementLine(models.Model):
                     )
             move.invalidate_recordset()
         move._post()
+        if reconcile_plan is not None:
+            reconcile_plan += list(to_reconcile.values())
+            return
         for _account, lines in to_reconcile.items():
             lines.reconcile()
 
@@ -975,53 +1114,135 @@ class AccountBankStatementLine(models.Model):
             "_test_account_reconcile_oca"
         ):
             return result
+        result._auto_reconcile_lines()
+        return result
+
+    def _auto_reconcile_lines(self):
+        """Apply the automatic reconcile models to the statement lines.
+        By default, the candidates of all the lines are searched and reconciled in
+        batch. The ``account_reconcile_oca_no_batch`` context key falls back to the
+        line by line process.
+        :return: A dict with the number of processed and reconciled lines, the
+          elapsed time and the throughput in lines per second.
+        """
+        start = time.perf_counter()
         models = self.env["account.reconcile.model"].search(
             [
                 ("rule_type", "in", ["invoice_matching", "writeoff_suggestion"]),
-                ("company_id", "in", result.company_id.ids),
+                ("company_id", "in", self.company_id.ids),
                 ("auto_reconcile", "=", True),
             ]
         )
-        for record in result:
-            res = models._apply_rules(record, record._retrieve_partner())
-            if not res:
+        if self.env.context.get("account_reconcile_oca_no_batch"):
+            reconciled = 0
+            for record in self:
+                res = models._apply_rules(record, record._retrieve_partner())
+                data = record._get_auto_reconcile_data(res)
+                if not data:
+                    continue
+                getattr(
+                    record, f"_reconcile_bank_line_{record.journal_id.reconcile_mode}"
+                )(record._prepare_reconcile_line_data(data["data"]))
+                reconciled += 1
+        else:
+            reconciled = self._auto_reconcile_lines_batch(models)
+        return self._log_auto_reconcile_stats(reconciled, start)
+
+    def _auto_reconcile_lines_batch(self, models):
+        """Match all the statement lines with the reconcile models at once, then
+        reconcile the matched journal items with a single reconciliation plan.
+
+        The lines matching journal items already taken by a previous line are
+        matched again once the plan is reconciled, with the remaining residuals.
+        :param models: The automatic account.reconcile.model records to apply.
+        :return: The number of reconciled statement lines.
+        """
+        if not models:
+            return 0
+        partners = {record.id: record._retrieve_partner() for record in self}
+        results = models._apply_rules_batch(self, partners)
+        reconcile_plan = []
+        reconciled = 0
+        used_amls = self.env["account.move.line"]
+        deferred = self.browse()
+        for record in self:
+            res = results.get(record.id)
+            amls = (res or {}).get("amls") or self.env["account.move.line"]
+            if amls & used_amls:
+                deferred |= record
                 continue
-            liquidity_lines, suspense_lines, other_lines = record._seek_for_lines()
-            data = []
-            for line in liquidity_lines:
-                reconcile_auxiliary_id, lines = record._get_reconcile_line(
-                    line,
-                    "liquidity",
-                    move=True,
-                )
-                data += lines
-            reconcile_auxiliary_id = 1
-            if res.get("status", "") == "write_off":
-                data = record._recompute_suspense_line(
-                    *record._reconcile_data_by_model(
-                        data, res["model"], reconcile_auxiliary_id
-                    ),
-                    self.manual_reference,
-                )
-            elif res.get("amls"):
-                amount = self.amount_currency or self.amount
-                for line in res.get("amls", []):
-                    reconcile_auxiliary_id, line_datas = record._get_reconcile_line(
-                        line, "other", is_counterpart=True, max_amount=amount, move=True
-                    )
-                    amount -= sum(line_data.get("amount") for line_data in line_datas)
-                    data += line_datas
-                data = record._recompute_suspense_line(
-                    data,
-                    reconcile_auxiliary_id,
-                    self.manual_reference,
-                )
-            if not data.get("can_reconcile"):
+            data = record._get_auto_reconcile_data(res)
+            if not data:
                 continue
             getattr(record, f"_reconcile_bank_line_{record.journal_id.reconcile_mode}")(
-                self._prepare_reconcile_line_data(data["data"])
+                record._prepare_reconcile_line_data(data["data"]),
+                reconcile_plan=reconcile_plan,
             )
-        return result
+            used_amls |= amls
+            reconciled += 1
+        if reconcile_plan:
+            self.env["account.move.line"]._reconcile_plan(reconcile_plan)
+        if deferred:
+            reconciled += deferred._auto_reconcile_lines_batch(models)
+        return reconciled
+
+    def _get_auto_reconcile_data(self, res):
+        """Build the reconcile data of the statement line from the result of the
+        reconcile models.
+        :param res: The result of :meth:`account.reconcile.model._apply_rules`.
+        :return: The reconcile data if the line can be reconciled, False otherwise.
+        """
+        self.ensure_one()
+        if not res:
+            return False
+        liquidity_lines, _suspense_lines, _other_lines = self._seek_for_lines()
+        data = []
+        for line in liquidity_lines:
+            reconcile_auxiliary_id, lines = self._get_reconcile_line(
+                line,
+                "liquidity",
+                move=True,
+            )
+            data += lines
+        reconcile_auxiliary_id = 1
+        if res.get("status", "") == "write_off":
+            data = self._recompute_suspense_line(
+                *self._reconcile_data_by_model(
+                    data, res["model"], reconcile_auxiliary_id
+                ),
+                self.manual_reference,
+            )
+        elif res.get("amls"):
+            amount = self.amount_currency or self.amount
+            for line in res.get("amls", []):
+                reconcile_auxiliary_id, line_datas = self._get_reconcile_line(
+                    line, "other", is_counterpart=True, max_amount=amount, move=True
+                )
+                amount -= sum(line_data.get("amount") for line_data in line_datas)
+                data += line_datas
+            data = self._recompute_suspense_line(
+                data,
+                reconcile_auxiliary_id,
+                self.manual_reference,
+            )
+        if not isinstance(data, dict) or not data.get("can_reconcile"):
+            return False
+        return data
+
+    def _log_auto_reconcile_stats(self, reconciled, start):
+        elapsed = time.perf_counter() - start
+        stats = {
+            "lines": len(self),
+            "reconciled": reconciled,
+            "elapsed": elapsed,
+            "lines_per_second": len(self) / elapsed if elapsed else 0.0,
+        }
+        _logger.info(
+            "Auto reconciled %(reconciled)s of %(lines)s statement lines in "
+            "%(elapsed).2fs (%(lines_per_second).1f lines/s)",
+            stats,
+        )
+        return stats
 
     def _synchronize_to_moves(self, changed_fields):
         """We want to avoid to change stuff (mainly amounts ) in accounting entries
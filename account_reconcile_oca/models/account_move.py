@@ -0,0 +1,15 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "state" in vals:
+            self.env["account.account.reconcile"]._mark_materialized_dirty(
+                self.line_ids
+            )
+        return res
@@ -8,6 +8,16 @@ from odoo.exceptions import ValidationError
 class AccountMoveLine(models.Model):
     _inherit = "account.move.line"
 
+    def write(self, vals):
+        if not {"account_id", "partner_id", "currency_id"} & set(vals):
+            return super().write(vals)
+        account_reconcile = self.env["account.account.reconcile"]
+        posted_lines = self.filtered(lambda line: line.parent_state == "posted")
+        account_reconcile._mark_materialized_dirty(posted_lines)
+        res = super().write(vals)
+        account_reconcile._mark_materialized_dirty(posted_lines)
+        return res
+
     def action_reconcile_manually(self):
         if not self:
             return {}
@@ -0,0 +1,25 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = "account.partial.reconcile"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        self.env["account.account.reconcile"]._mark_materialized_dirty(
+            partials.debit_move_id | partials.credit_move_id
+        )
+        return partials
+
+    def unlink(self):
+        self.env["account.account.reconcile"]._mark_materialized_dirty(
+            self.debit_move_id | self.credit_move_id
+        )
+        st_line_model = self.env["account.bank.statement.line"]
+        companies = (self.debit_move_id | self.credit_move_id).company_id
+        res = super().unlink()
+        st_line_model._invalidate_default_reconcile_data_cache(companies)
+        return res
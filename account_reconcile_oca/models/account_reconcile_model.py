@@ -0,0 +1,30 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class AccountReconcileModel(models.Model):
+    _inherit = "account.reconcile.model"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        models = super().create(vals_list)
+        st_line_model = self.env["account.bank.statement.line"]
+        st_line_model._invalidate_default_reconcile_data_cache(models.company_id)
+        return models
+
+    def write(self, vals):
+        st_line_model = self.env["account.bank.statement.line"]
+        companies = self.company_id
+        res = super().write(vals)
+        st_line_model._invalidate_default_reconcile_data_cache(
+            companies | self.company_id
+        )
+        return res
+
+    def unlink(self):
+        st_line_model = self.env["account.bank.statement.line"]
+        companies = self.company_id
+        res = super().unlink()
+        st_line_model._invalidate_default_reconcile_data_cache(companies)
+        return res
@@ -13,6 +13,8 @@ class ResCompany(models.Model):
         ._fields["reconcile_aggregate"]
         .selection
     )
+    # Increased to drop the cached reconcile proposals of the statement lines
+    reconcile_data_generation = fields.Integer(readonly=True, copy=False, default=0)
 
     def _get_unreconciled_statement_lines_redirect_action(
         self, unreconciled_statement_lines
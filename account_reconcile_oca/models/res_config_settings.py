@@ -10,3 +10,18 @@ class ResConfigSettings(models.TransientModel):
     reconcile_aggregate = fields.Selection(
         related="company_id.reconcile_aggregate", readonly=False
     )
+    reconcile_materialized = fields.Boolean(
+        string="Materialized reconcile accounts",
+        config_parameter="account_reconcile_oca.reconcile_materialized",
+        help="Store the accounts and partners to reconcile in a table refreshed "
+        "when journal items change, instead of aggregating all the journal items "
+        "on each search.",
+    )
+
+    def set_values(self):
+        account_reconcile = self.env["account.account.reconcile"]
+        was_materialized = account_reconcile._is_materialized()
+        res = super().set_values()
+        if self.reconcile_materialized and not was_materialized:
+            account_reconcile._refresh_materialized()
+        return res
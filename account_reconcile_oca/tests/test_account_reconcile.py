@@ -166,6 +166,42 @@ class TestReconciliationWidget(TestAccountReconciliationCommon):
         )
         self.assertFalse(reconcile_account)
 
+    def test_reconcile_materialized(self):
+        account = self.non_current_assets_account
+        self.env["ir.config_parameter"].set_param(
+            "account_reconcile_oca.reconcile_materialized", "True"
+        )
+        self.env["account.account.reconcile"]._refresh_materialized()
+        reconcile_account = self.env["account.account.reconcile"].search(
+            [("account_id", "=", account.id)]
+        )
+        self.assertTrue(reconcile_account)
+        with Form(reconcile_account) as f:
+            f.add_account_move_line_id = self.move_1.line_ids.filtered(
+                lambda r: r.account_id == account
+            )
+            f.add_account_move_line_id = self.move_2.line_ids.filtered(
+                lambda r: r.account_id == account
+            )
+            f.add_account_move_line_id = self.move_3.line_ids.filtered(
+                lambda r: r.account_id == account
+            )
+        reconcile_account.reconcile()
+        # The materialized rows are refreshed when the transaction is committed
+        self.env.cr.precommit.run()
+        self.assertFalse(
+            self.env["account.account.reconcile"].search(
+                [("account_id", "=", account.id)]
+            )
+        )
+        (self.move_1 + self.move_2 + self.move_3).line_ids.remove_move_reconcile()
+        self.env.cr.precommit.run()
+        self.assertTrue(
+            self.env["account.account.reconcile"].search(
+                [("account_id", "=", account.id)]
+            )
+        )
+
     def test_clean_reconcile(self):
         account = self.non_current_assets_account
         reconcile_account = self.env["account.account.reconcile"].search(
@@ -1,4 +1,6 @@
+import logging
 import time
+from unittest.mock import patch
 
 from odoo import Command
 from odoo.tests import Form, tagged
@@ -7,6 +9,8 @@ from odoo.addons.account_reconcile_model_oca.tests.common import (
     TestAccountReconciliationCommon,
 )
 
+_logger = logging.getLogger(__name__)
+
 
 @tagged("post_install", "-at_install")
 class TestReconciliationWidget(TestAccountReconciliationCommon):
@@ -629,6 +633,113 @@ class TestReconciliationWidget(TestAccountReconciliationCommon):
         )
         self.assertTrue(bank_stmt_line.is_reconciled)
 
+    def test_reconcile_invoice_matching_batch_on_create(self):
+        """
+        Statement lines created together are matched with their invoices in batch
+        """
+        self.invoice_matching_models.active = True
+        inv1 = self.create_invoice(
+            currency_id=self.currency_euro_id, invoice_amount=100
+        )
+        inv2 = self.create_invoice(
+            currency_id=self.currency_euro_id, invoice_amount=200
+        )
+        bank_stmt = self.acc_bank_stmt_model.create(
+            {
+                "journal_id": self.bank_journal_euro.id,
+                "date": time.strftime("%Y-07-15"),
+                "name": "test",
+            }
+        )
+        bank_stmt_lines = self.acc_bank_stmt_line_model.create(
+            [
+                {
+                    "name": "testLine",
+                    "payment_ref": invoice.name,
+                    "partner_id": invoice.partner_id.id,
+                    "journal_id": self.bank_journal_euro.id,
+                    "statement_id": bank_stmt.id,
+                    "amount": invoice.amount_total,
+                    "date": time.strftime("%Y-07-15"),
+                }
+                for invoice in inv1 + inv2
+            ]
+        )
+        self.assertTrue(all(bank_stmt_lines.mapped("is_reconciled")))
+        self.assertEqual(0, inv1.amount_residual)
+        self.assertEqual(0, inv2.amount_residual)
+
+    def test_reconcile_invoice_matching_batch_stats(self):
+        self.invoice_matching_models.active = True
+        inv1 = self.create_invoice(
+            currency_id=self.currency_euro_id, invoice_amount=100
+        )
+        bank_stmt_lines = self.acc_bank_stmt_line_model.with_context(
+            _test_account_reconcile_oca=False
+        ).create(
+            [
+                {
+                    "name": "testLine",
+                    "payment_ref": inv1.name,
+                    "partner_id": inv1.partner_id.id,
+                    "journal_id": self.bank_journal_euro.id,
+                    "amount": 100,
+                    "date": time.strftime("%Y-07-15"),
+                },
+                {
+                    "name": "testLine",
+                    "payment_ref": "Unknown",
+                    "journal_id": self.bank_journal_euro.id,
+                    "amount": 1234.56,
+                    "date": time.strftime("%Y-07-15"),
+                },
+            ]
+        )
+        self.assertFalse(any(bank_stmt_lines.mapped("is_reconciled")))
+        stats = bank_stmt_lines._auto_reconcile_lines()
+        self.assertEqual(stats["lines"], 2)
+        self.assertEqual(stats["reconciled"], 1)
+        self.assertTrue(bank_stmt_lines[0].is_reconciled)
+        self.assertFalse(bank_stmt_lines[1].is_reconciled)
+        self.assertEqual(0, inv1.amount_residual)
+
+    def test_reconcile_invoice_matching_batch_same_invoice(self):
+        """
+        Statement lines of a batch matching the same invoice do not take its
+        residual twice
+        """
+        self.invoice_matching_models.active = True
+        inv1 = self.create_invoice(
+            currency_id=self.currency_euro_id, invoice_amount=100
+        )
+        bank_stmt_lines = self.acc_bank_stmt_line_model.with_context(
+            _test_account_reconcile_oca=False
+        ).create(
+            [
+                {
+                    "name": "testLine",
+                    "payment_ref": inv1.name,
+                    "partner_id": inv1.partner_id.id,
+                    "journal_id": self.bank_journal_euro.id,
+                    "amount": 100,
+                    "date": time.strftime("%Y-07-15"),
+                }
+                for _index in range(2)
+            ]
+        )
+        stats = bank_stmt_lines._auto_reconcile_lines()
+        self.assertEqual(stats["reconciled"], 1)
+        self.assertTrue(bank_stmt_lines[0].is_reconciled)
+        self.assertFalse(bank_stmt_lines[1].is_reconciled)
+        self.assertEqual(0, inv1.amount_residual)
+        receivable_lines = bank_stmt_lines.move_id.line_ids.filtered(
+            lambda line: line.account_id
+            == inv1.line_ids.filtered(
+                lambda inv_line: inv_line.account_type == "asset_receivable"
+            ).account_id
+        )
+        self.assertTrue(all(receivable_lines.mapped("reconciled")))
+
     def test_reconcile_invoice_keep(self):
         """
         We want to test how the keep mode works, keeping the original move lines.
@@ -1456,3 +1567,103 @@ class TestReconciliationWidget(TestAccountReconciliationCommon):
             self.assertEqual(3, len(f.reconcile_data_info["data"]))
             self.assertTrue(f.can_reconcile)
             self.assertEqual(f.reconcile_data_info["data"][-1]["amount"], 3.63)
+
+    def test_reconcile_data_info_cache(self):
+        """The default proposals are reused until the statement line or the
+        proposed journal items change. The widget load time is logged with and
+        without the cache.
+        """
+        self.invoice_matching_models.active = True
+        self.invoice_matching_models.auto_reconcile = False
+        invoices = self.env["account.move"]
+        for _i in range(20):
+            invoices |= self.create_invoice(
+                currency_id=self.currency_euro_id, invoice_amount=100
+            )
+        bank_stmt_lines = self.acc_bank_stmt_line_model.create(
+            [
+                {
+                    "name": "testLine",
+                    "payment_ref": invoice.name,
+                    "partner_id": invoice.partner_id.id,
+                    "journal_id": self.bank_journal_euro.id,
+                    "amount": 100,
+                    "date": time.strftime("%Y-07-15"),
+                }
+                for invoice in invoices
+            ]
+        )
+        bank_stmt_lines._invalidate_default_reconcile_data_cache()
+        st_line_class = type(self.acc_bank_stmt_line_model)
+
+        def load_widget():
+            bank_stmt_lines.invalidate_recordset()
+            start = time.perf_counter()
+            with patch.object(
+                st_line_class,
+                "_default_reconcile_data",
+                autospec=True,
+                side_effect=st_line_class._default_reconcile_data,
+            ) as default_reconcile_data:
+                bank_stmt_lines.read(["reconcile_data_info"])
+            return time.perf_counter() - start, default_reconcile_data.call_count
+
+        cold_time, cold_calls = load_widget()
+        warm_time, warm_calls = load_widget()
+        _logger.info(
+            "Reconcile widget load of %s lines: %.3fs without cache, %.3fs with cache",
+            len(bank_stmt_lines),
+            cold_time,
+            warm_time,
+        )
+        self.assertEqual(cold_calls, len(bank_stmt_lines))
+        self.assertEqual(warm_calls, 0)
+        self.assertTrue(bank_stmt_lines[0].can_reconcile)
+
+        # Paying a proposed invoice elsewhere invalidates its proposal only.
+        receivable = invoices[0].line_ids.filtered(
+            lambda line: line.account_id.account_type == "asset_receivable"
+        )
+        payment_move = self.env["account.move"].create(
+            {
+                "move_type": "entry",
+                "line_ids": [
+                    Command.create(
+                        {
+                            "account_id": receivable.account_id.id,
+                            "partner_id": receivable.partner_id.id,
+                            "credit": 100.0,
+                        }
+                    ),
+                    Command.create(
+                        {
+                            "account_id": self.current_assets_account.id,
+                            "debit": 100.0,
+                        }
+                    ),
+                ],
+            }
+        )
+        payment_move.action_post()
+        (
+            receivable
+            + payment_move.line_ids.filtered(
+                lambda line: line.account_id == receivable.account_id
+            )
+        ).reconcile()
+        _time, calls = load_widget()
+        self.assertEqual(calls, 1)
+        self.assertFalse(bank_stmt_lines[0].can_reconcile)
+        self.assertTrue(bank_stmt_lines[1].can_reconcile)
+
+        # Removing a reconciliation or changing a reconcile model drops the cached
+        # proposals of the company
+        receivable.remove_move_reconcile()
+        _time, calls = load_widget()
+        self.assertEqual(calls, len(bank_stmt_lines))
+        self.assertTrue(bank_stmt_lines[0].can_reconcile)
+        _time, calls = load_widget()
+        self.assertEqual(calls, 0)
+        self.invoice_matching_models.match_text_location_label = False
+        _time, calls = load_widget()
+        self.assertEqual(calls, len(bank_stmt_lines))
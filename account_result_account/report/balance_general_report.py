@@ -1,3 +1,5 @@
+from bisect import bisect_left, bisect_right
+
 from odoo import api, models
 from odoo.tools.float_utils import float_is_zero
 from odoo.tools import float_round
@@ -29,11 +31,19 @@ class BalanceGeneralReport(models.AbstractModel):
         return self._code_sort_key(code_from) <= self._code_sort_key(comparable_code) <= self._code_sort_key(code_to)
 
     def _get_range_accounts(self, company_id, code_from, code_to):
+        # Same accounts as _code_is_in_range, found by binary search on the codes
+        # truncated to the depth of the range.
         account_model = self.env["account.account"]
-        company_accounts = account_model.search([("company_ids", "in", [company_id])])
-        return company_accounts.filtered(
-            lambda account: self._code_is_in_range(account.code, code_from, code_to)
-        )
+        if not code_from or not code_to:
+            return account_model
+        depths = self._get_account_code_index(company_id)["depths"]
+        if not depths:
+            return account_model
+        depth = min(len(code_from.split(".")), len(code_to.split(".")), max(depths))
+        keys, account_ids = depths[depth]
+        start = bisect_left(keys, self._code_sort_key(code_from))
+        end = bisect_right(keys, self._code_sort_key(code_to))
+        return account_model.browse(account_ids[start:end])
 
     def _get_partial_result_lines(self, wizard):
         if not wizard.show_result_accounts:
@@ -133,15 +143,15 @@ class BalanceGeneralReport(models.AbstractModel):
         wizard = values.get("docs")
         partial_lines = self._get_partial_result_lines(wizard)
         existing_by_code = {line.get("code"): line for line in values.get("lines", [])}
+        child_accounts_by_code = {}
+        for line in values.get("lines", []):
+            if line.get("line_type") != "account":
+                continue
+            for code in self._code_ancestors(str(line.get("code") or ""))[:-1]:
+                child_accounts_by_code.setdefault(code, []).append(line)
 
         def _sum_child_accounts_display(code):
-            prefix = f"{code}."
-            child_accounts = [
-                line
-                for line in values.get("lines", [])
-                if line.get("line_type") == "account"
-                and str(line.get("code") or "").startswith(prefix)
-            ]
+            child_accounts = child_accounts_by_code.get(code, [])
             total = 0.0
             for line in child_accounts:
                 account_type = line.get("account_type") or ""
@@ -0,0 +1 @@
+from . import test_balance_general_report
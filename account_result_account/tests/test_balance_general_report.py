@@ -0,0 +1,63 @@
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestBalanceGeneralReport(AccountTestInvoicingCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = cls.env["report.reportes_financieros.balance_general_pdf"]
+        cls.company = cls.company_data["company"]
+        cls.accounts = cls.env["account.account"].create(
+            [
+                {"name": f"Cuenta {code}", "code": code, "account_type": "income"}
+                for code in ("9", "9.1", "9.1.01", "9.1.02", "9.2.01", "9.10.01")
+            ]
+        )
+
+    def _assert_range_accounts(self, code_from, code_to):
+        accounts = self.env["account.account"].search(
+            [("company_ids", "in", self.company.ids)]
+        )
+        expected = accounts.filtered(
+            lambda account: self.report._code_is_in_range(
+                account.code, code_from, code_to
+            )
+        )
+        range_accounts = self.report._get_range_accounts(
+            self.company.id, code_from, code_to
+        )
+        self.assertEqual(set(range_accounts.ids), set(expected.ids))
+        return range_accounts
+
+    def test_range_accounts(self):
+        for code_from, code_to in (
+            ("9", "9"),
+            ("9.1", "9.1"),
+            ("9.1.01", "9.1.01"),
+            ("9.1.02", "9.2.01"),
+            ("9.2", "9.10"),
+            ("9.3", "9.9"),
+            ("1", "5"),
+            ("9.1.01.01", "9.1.01.99"),
+        ):
+            self._assert_range_accounts(code_from, code_to)
+        self.assertEqual(
+            sorted(self._assert_range_accounts("9.2", "9.10").mapped("code")),
+            ["9.10.01", "9.2.01"],
+        )
+        self.assertFalse(self.report._get_range_accounts(self.company.id, "9", False))
+
+    def test_range_accounts_account_changes(self):
+        self._assert_range_accounts("9.3", "9.3")
+        account = self.env["account.account"].create(
+            {"name": "Cuenta 9.3.01", "code": "9.3.01", "account_type": "income"}
+        )
+        self.assertEqual(self._assert_range_accounts("9.3", "9.3"), account)
+        account.code = "9.4.01"
+        self.assertFalse(self._assert_range_accounts("9.3", "9.3"))
+        self.assertEqual(self._assert_range_accounts("9.4", "9.4"), account)
+        account.unlink()
+        self.assertFalse(self._assert_range_accounts("9.4", "9.4"))
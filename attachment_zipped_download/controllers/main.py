@@ -1,8 +1,12 @@
 # Copyright 2019 César Fernández Domínguez <cesfernandez@outlook.com>
 # Copyright 2022 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl)
+import os
+
+from werkzeug.wsgi import wrap_file
+
 from odoo import _, http
-from odoo.http import request
+from odoo.http import content_disposition, request
 
 
 class AttachmentZippedDownloadController(http.Controller):
@@ -38,11 +42,13 @@ class AttachmentZippedDownloadController(http.Controller):
         download_name = zip_name or _("attachments.zip")
         if not str(download_name).lower().endswith(".zip"):
             download_name = f"{download_name}.zip"
-        stream = http.Stream(
-            type="data",
-            data=out_file.getvalue(),
-            mimetype="application/zip",
-            as_attachment=True,
-            download_name=download_name,
+        size = out_file.seek(0, os.SEEK_END)
+        out_file.seek(0)
+        return request.make_response(
+            wrap_file(request.httprequest.environ, out_file),
+            headers=[
+                ("Content-Type", "application/zip"),
+                ("Content-Length", size),
+                ("Content-Disposition", content_disposition(download_name)),
+            ],
         )
-        return stream.get_response()
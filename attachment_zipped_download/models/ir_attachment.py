@@ -1,13 +1,38 @@
 # Copyright 2019 César Fernández Domínguez <cesfernandez@outlook.com>
 # Copyright 2022 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl)
+import os
+import shutil
+import tempfile
 import zipfile
-from io import BytesIO
 from urllib.parse import urlencode
 
-from odoo import models
+from odoo import fields, models
 from odoo.exceptions import UserError
 
+# Size of the ZIP kept in memory, it is written to a temporary file beyond
+ZIP_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+# Bytes copied at once from the filestore into the ZIP
+ZIP_CHUNK_SIZE = 1024 * 1024
+ZIP_STORED_MIMETYPES = {
+    "application/gzip",
+    "application/pdf",
+    "application/vnd.rar",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/zip",
+    "image/gif",
+    "image/jpeg",
+    "image/png",
+    "image/webp",
+}
+ZIP_STORED_MIMETYPE_PREFIXES = (
+    "application/vnd.oasis.opendocument.",
+    "application/vnd.openxmlformats-officedocument.",
+    "audio/",
+    "video/",
+)
+
 
 class IrAttachment(models.Model):
     _inherit = "ir.attachment"
@@ -35,17 +60,43 @@ class IrAttachment(models.Model):
             "target": "self",
         }
 
+    def _get_zip_compress_type(self):
+        """Formats already compressed are stored as is in the ZIP."""
+        self.ensure_one()
+        mimetype = self.mimetype or ""
+        if mimetype in ZIP_STORED_MIMETYPES or mimetype.startswith(
+            ZIP_STORED_MIMETYPE_PREFIXES
+        ):
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def _write_zip_entry(self, zip_file):
+        """Write the content in ``zip_file``, copying the file of the filestore by
+        chunks when there is one."""
+        self.ensure_one()
+        info = zipfile.ZipInfo(
+            self._compute_zip_file_name(),
+            date_time=(self.write_date or fields.Datetime.now()).timetuple()[:6],
+        )
+        info.compress_type = self._get_zip_compress_type()
+        info.file_size = self.file_size
+        path = self.store_fname and self._full_path(self.store_fname)
+        with zip_file.open(info, "w") as entry:
+            if path and os.path.isfile(path):
+                with open(path, "rb") as source:
+                    shutil.copyfileobj(source, entry, ZIP_CHUNK_SIZE)
+            else:
+                entry.write(self.raw)
+
     def _create_temp_zip(self):
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
+        """Return a file with the ZIP of the attachments, spooled to disk when it
+        exceeds ZIP_SPOOL_MAX_SIZE."""
+        self.check("read")
+        zip_buffer = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_SIZE)
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
             for attachment in self:
-                attachment.check("read")
-                zip_file.writestr(
-                    attachment._compute_zip_file_name(),
-                    attachment.raw,
-                )
-            zip_buffer.seek(0)
-            zip_file.close()
+                attachment._write_zip_entry(zip_file)
+        zip_buffer.seek(0)
         return zip_buffer
 
     def _compute_zip_file_name(self):
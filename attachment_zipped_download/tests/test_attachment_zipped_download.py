@@ -1,6 +1,7 @@
 # Copyright 2022-2024 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 import base64
+import zipfile
 
 from odoo.exceptions import AccessError
 from odoo.tests import HttpCase, new_test_user
@@ -64,6 +65,22 @@ class TestAttachmentZipped(TestAttachmentZippedDownloadBase):
     def test_create_temp_zip(self):
         res = self.attachments._create_temp_zip()
         self.assertTrue(res)
+        with zipfile.ZipFile(res) as zip_file:
+            self.assertEqual(
+                zip_file.namelist(), ["test1.txt", "test2.txt", "test3.txt"]
+            )
+            self.assertEqual(zip_file.read("test3.txt"), b"\xff data")
+            self.assertEqual(
+                zip_file.getinfo("test1.txt").compress_type, zipfile.ZIP_DEFLATED
+            )
+
+    def test_create_temp_zip_compressed(self):
+        attachment = self._create_attachment(self.user, "test.jpg")
+        attachment.mimetype = "image/jpeg"
+        with zipfile.ZipFile(attachment._create_temp_zip()) as zip_file:
+            info = zip_file.getinfo("test.jpg")
+            self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zip_file.read(info), b"\xff data")
 
     def test_create_temp_zip_access_denined(self):
         attachments = self.attachments | self._create_attachment(
@@ -1,6 +1,6 @@
 {
     "name": "Balance General Project Filter",
-    "summary": "Filtro por proyectos para el reporte de balance general",
+    "summary": "Filtro por proyectos para los reportes de balance general y flujo de caja",
     "version": "18.0.1.0.0",
     "category": "Accounting/Reporting",
     "author": "DNS",
@@ -8,6 +8,7 @@
     "depends": ["reportes_financieros", "purchase_project_task_selection"],
     "data": [
         "views/balance_general_wizard_views.xml",
+        "views/flujo_caja_wizard_views.xml",
     ],
     "installable": True,
     "application": False,
@@ -1 +1,2 @@
 from . import balance_general_report
+from . import flujo_caja_report
@@ -0,0 +1,56 @@
+from odoo import models
+from odoo.tools import SQL
+
+
+class FlujoCajaReport(models.AbstractModel):
+    _inherit = "report.reportes_financieros.flujo_caja_pdf"
+
+    def _get_project_ids(self):
+        return self.env.context.get("flujo_caja_project_ids") or []
+
+    def _get_balance_for_accounts(self, account_ids, company_id, date_from=None, date_to=None):
+        project_ids = self._get_project_ids()
+        if not project_ids:
+            return super()._get_balance_for_accounts(
+                account_ids, company_id, date_from=date_from, date_to=date_to
+            )
+        if not account_ids:
+            return 0.0
+        domain = [
+            ("company_id", "=", company_id),
+            ("move_id.state", "=", "posted"),
+            ("account_id", "in", account_ids),
+            ("move_id.project_id", "in", project_ids),
+        ]
+        if date_from:
+            domain.append(("date", ">=", date_from))
+        if date_to:
+            domain.append(("date", "<=", date_to))
+        result = self.env["account.move.line"].read_group(
+            domain=domain,
+            fields=["balance:sum"],
+            groupby=[],
+            lazy=False,
+        )
+        return result[0]["balance"] if result else 0.0
+
+    def _get_cash_flow_line_conditions(self):
+        conditions = super()._get_cash_flow_line_conditions()
+        project_ids = self._get_project_ids()
+        if project_ids:
+            conditions.append(
+                SQL(
+                    "aml.move_id IN (SELECT id FROM account_move WHERE project_id IN %s)",
+                    tuple(project_ids),
+                )
+            )
+        return conditions
+
+    def _get_report_values(self, docids, data=None):
+        data = data or {}
+        wizard = self.env["flujo.caja.wizard"].browse(
+            data.get("wizard_id") or docids[:1]
+        )
+        wizard.ensure_one()
+        report = self.with_context(flujo_caja_project_ids=wizard.project_ids.ids)
+        return super(FlujoCajaReport, report)._get_report_values(docids, data)
@@ -1 +1,2 @@
 from . import balance_general_wizard
+from . import flujo_caja_wizard
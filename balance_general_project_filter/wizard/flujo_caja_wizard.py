@@ -0,0 +1,14 @@
+from odoo import fields, models
+
+
+class FlujoCajaWizard(models.TransientModel):
+    _inherit = "flujo.caja.wizard"
+
+    project_ids = fields.Many2many(
+        comodel_name="project.project",
+        relation="flujo_caja_wizard_project_rel",
+        column1="wizard_id",
+        column2="project_id",
+        string="Filtrar por proyecto",
+        domain="['|', ('company_id', '=', False), ('company_id', '=', company_id)]",
+    )
@@ -5,7 +5,7 @@
 {
     "name": "Document Management System",
     "summary": """Document Management System for Odoo""",
-    "version": "18.0.1.0.6",
+    "version": "18.0.1.0.8",
     "category": "Document Management",
     "license": "LGPL-3",
     "website": "https://github.com/OCA/dms",
@@ -24,6 +24,7 @@
         "security/ir.model.access.csv",
         # Actions
         "actions/file.xml",
+        "actions/directory.xml",
         # Templates
         "template/portal.xml",
         # Data
@@ -1,11 +1,10 @@
 # Copyright 2020-2021 Tecnativa - Víctor Martínez
 # Copyright 2024 Subteno - Timothée VANNIER (https://www.subteno.com).
 # License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl).
-import base64
 from typing import Optional  # noqa # pylint: disable=unused-import
 
 from odoo import _, http
-from odoo.http import content_disposition, request
+from odoo.http import request
 from odoo.osv.expression import OR
 
 from odoo.addons.portal.controllers.portal import CustomerPortal
@@ -279,10 +278,4 @@ class CustomerPortal(CustomerPortal):
 
         if res.attachment_id and request.env.user.has_group("base.group_portal"):
             res = res.sudo()
-        file_content = base64.b64decode(res.content)
-        content_type = ("Content-Type", "application/octet-stream")
-        disposition_content = (
-            "Content-Disposition",
-            content_disposition(res.name),
-        )
-        return request.make_response(file_content, [content_type, disposition_content])
+        return res._get_content_stream().get_response(as_attachment=True)
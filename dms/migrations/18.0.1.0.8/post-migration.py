@@ -0,0 +1,9 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, version):
+    # The permissions given by the access groups are materialized from this version
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env["dms.directory.permission"]._refresh()
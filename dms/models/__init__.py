@@ -2,6 +2,7 @@
 # License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl).
 
 from . import access_groups
+from . import directory_permission
 from . import base
 from . import mixins_thumbnail
 from . import dms_security_mixin
@@ -17,6 +18,8 @@ from . import dms_category
 from . import tag
 
 from . import res_company
+from . import res_groups
+from . import res_users
 from . import res_config_settings
 from . import ir_attachment
 from . import ir_binary
@@ -6,6 +6,17 @@
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
 
+# Fields changing the permissions given by the groups on their directories
+PERMISSION_FIELDS = [
+    "directory_ids",
+    "explicit_user_ids",
+    "group_ids",
+    "parent_group_id",
+    "perm_create",
+    "perm_unlink",
+    "perm_write",
+]
+
 
 class DmsAccessGroups(models.Model):
     _name = "dms.access.group"
@@ -155,6 +166,33 @@ class DmsAccessGroups(models.Model):
             )
             record.update({"users": users, "count_users": len(users)})
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.env["dms.directory.permission"]._refresh(groups=res)
+        return res
+
+    def write(self, vals):
+        if not any(key in vals for key in PERMISSION_FIELDS):
+            return super().write(vals)
+        # Directories losing these groups are computed again too
+        directories = (
+            self.sudo().search([("id", "child_of", self.ids)]).complete_directory_ids
+        )
+        res = super().write(vals)
+        self.env["dms.directory.permission"]._refresh(
+            directories=directories, groups=self
+        )
+        return res
+
+    def unlink(self):
+        directories = (
+            self.sudo().search([("id", "child_of", self.ids)]).complete_directory_ids
+        )
+        res = super().unlink()
+        self.env["dms.directory.permission"]._refresh(directories=directories)
+        return res
+
     def copy_data(self, default=None):
         vals_list = super().copy_data(default)
         for group, vals in zip(self, vals_list, strict=False):
@@ -15,7 +15,7 @@ from typing import Literal  # noqa # pylint: disable=unused-import
 from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError, ValidationError
 from odoo.osv.expression import AND, OR
-from odoo.tools import consteq, human_size
+from odoo.tools import SQL, consteq, human_size
 
 from ..tools.file import check_name, unique_name
 
@@ -175,19 +175,20 @@ class DmsDirectory(models.Model):
 
     count_elements = fields.Integer(compute="_compute_count_elements")
 
+    # Totals of the subtree, maintained by _add_to_totals
     count_total_directories = fields.Integer(
-        compute="_compute_count_total_directories", string="Total Subdirectories"
+        string="Total Subdirectories", readonly=True, copy=False, default=0
     )
 
     count_total_files = fields.Integer(
-        compute="_compute_count_total_files", string="Total Files"
+        string="Total Files", readonly=True, copy=False, default=0
     )
 
     count_total_elements = fields.Integer(
         compute="_compute_count_total_elements", string="Total Elements"
     )
 
-    size = fields.Float(compute="_compute_size")
+    size = fields.Float(readonly=True, copy=False, default=0)
     human_size = fields.Char(
         compute="_compute_human_size", string="Size (human readable)"
     )
@@ -426,41 +427,86 @@ class DmsDirectory(models.Model):
         for record in self:
             record.count_elements = record.count_files + record.count_directories
 
-    def _compute_count_total_directories(self):
-        for record in self:
-            count = (
-                self.search_count([("id", "child_of", record.id)]) if record.id else 0
-            )
-            record.count_total_directories = count - 1 if count > 0 else 0
-
-    def _compute_count_total_files(self):
-        model = self.env["dms.file"]
-        for record in self:
-            # Prevent error in some NewId cases
-            record.count_total_files = (
-                model.search_count([("directory_id", "child_of", record.id)])
-                if record.id
-                else 0
-            )
-
+    @api.depends("count_total_files", "count_total_directories")
     def _compute_count_total_elements(self):
         for record in self:
             record.count_total_elements = (
                 record.count_total_files + record.count_total_directories
             )
 
-    def _compute_size(self):
-        sudo_model = self.env["dms.file"].sudo()
-        for record in self:
-            # Avoid NewId
-            if not record.id:
-                record.size = 0
-                continue
-            recs = sudo_model.search_read(
-                domain=[("directory_id", "child_of", record.id)],
-                fields=["size"],
+    @api.model
+    def _add_to_totals(self, deltas):
+        """Add ``deltas``, lists of size, files and subdirectories by directory
+        id, to the totals of these directories and of their parents.
+        """
+        totals = defaultdict(lambda: [0.0, 0, 0])
+        directories = self.sudo().browse(
+            [directory_id for directory_id, delta in deltas.items() if any(delta)]
+        )
+        directories.flush_model(["parent_id"])
+        for directory in directories.exists():
+            delta = deltas[directory.id]
+            for directory_id in directory.parent_path.split("/")[:-1]:
+                total = totals[int(directory_id)]
+                for index, value in enumerate(delta):
+                    total[index] += value
+        if not totals:
+            return
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE dms_directory
+                SET size = COALESCE(size, 0) + delta.size,
+                    count_total_files = COALESCE(count_total_files, 0) + delta.files,
+                    count_total_directories = COALESCE(count_total_directories, 0)
+                        + delta.directories
+                FROM (VALUES %s) AS delta(id, size, files, directories)
+                WHERE dms_directory.id = delta.id
+                """,
+                SQL(", ").join(
+                    SQL("(%s, %s::float, %s, %s)", directory_id, *total)
+                    for directory_id, total in totals.items()
+                ),
+            )
+        )
+        self.invalidate_model(["size", "count_total_files", "count_total_directories"])
+
+    @api.model
+    def _rebuild_totals(self):
+        """Compute again the totals of all the directories from their files and
+        subdirectories.
+        """
+        self.env["dms.file"].flush_model(["directory_id", "size", "active"])
+        self.flush_model(["parent_id"])
+        self.env.cr.execute(
+            """
+            WITH ancestors AS (
+                SELECT id, unnest(
+                    string_to_array(rtrim(parent_path, '/'), '/')
+                )::int AS ancestor_id
+                FROM dms_directory
+            ), files AS (
+                SELECT ancestors.ancestor_id, SUM(dms_file.size) AS size,
+                    COUNT(*) AS files
+                FROM dms_file
+                JOIN ancestors ON ancestors.id = dms_file.directory_id
+                WHERE dms_file.active
+                GROUP BY ancestors.ancestor_id
+            ), directories AS (
+                SELECT ancestor_id, COUNT(*) - 1 AS directories
+                FROM ancestors
+                GROUP BY ancestor_id
             )
-            record.size = sum(rec.get("size", 0) for rec in recs)
+            UPDATE dms_directory
+            SET size = COALESCE(files.size, 0),
+                count_total_files = COALESCE(files.files, 0),
+                count_total_directories = directories.directories
+            FROM directories
+            LEFT JOIN files ON files.ancestor_id = directories.ancestor_id
+            WHERE dms_directory.id = directories.ancestor_id
+            """
+        )
+        self.invalidate_model(["size", "count_total_files", "count_total_directories"])
 
     @api.depends("size")
     def _compute_human_size(self):
@@ -665,6 +711,10 @@ class DmsDirectory(models.Model):
         ctx.update({"default_parent_id": False})
         self.env.registry.clear_cache()
         res = super(DmsDirectory, self.with_context(**ctx)).create(vals_list)
+        deltas = defaultdict(lambda: [0.0, 0, 0])
+        for directory in res.filtered("parent_id"):
+            deltas[directory.parent_id.id][2] += 1
+        self._add_to_totals(deltas)
         return res
 
     def write(self, vals):
@@ -685,6 +735,9 @@ class DmsDirectory(models.Model):
                         )
                 elif old_storage_id != new_storage_id:
                     raise UserError(_("It is not possible to change the storage."))
+        old_parents = {}
+        if any(key in vals for key in ["parent_id", "is_root_directory"]):
+            old_parents = {item: item.parent_id for item in self}
         # Groups part
         if any(key in vals for key in ["group_ids", "inherit_group_ids"]):
             res = super().write(vals)
@@ -694,8 +747,44 @@ class DmsDirectory(models.Model):
             records.flush_recordset()
         else:
             res = super().write(vals)
+        if any(
+            key in vals
+            for key in [
+                "group_ids",
+                "inherit_group_ids",
+                "parent_id",
+                "is_root_directory",
+            ]
+        ):
+            self.sudo().search([("id", "child_of", self.ids)])._refresh_permissions()
+        if old_parents:
+            self._move_totals(old_parents)
         return res
 
+    def _refresh_permissions(self):
+        self.env["dms.directory.permission"]._refresh(directories=self)
+
+    def _move_totals(self, old_parents):
+        """Move the totals of the directories from their ``old_parents`` to
+        their new parents.
+        """
+        self.flush_recordset(["parent_id"])
+        deltas = defaultdict(lambda: [0.0, 0, 0])
+        for directory, old_parent in old_parents.items():
+            if directory.parent_id == old_parent:
+                continue
+            totals = [
+                directory.size,
+                directory.count_total_files,
+                directory.count_total_directories + 1,
+            ]
+            for index, value in enumerate(totals):
+                if old_parent:
+                    deltas[old_parent.id][index] -= value
+                if directory.parent_id:
+                    deltas[directory.parent_id.id][index] += value
+        self._add_to_totals(deltas)
+
     @api.depends_context("directory_short_name")
     def _compute_display_name(self):
         if self.env.context.get("directory_short_name"):
@@ -713,7 +802,13 @@ class DmsDirectory(models.Model):
         self.file_ids.unlink()
         if self.child_directory_ids:
             self.child_directory_ids.unlink()
-        return super(DmsDirectory, self.exists()).unlink()
+        directories = self.exists()
+        deltas = defaultdict(lambda: [0.0, 0, 0])
+        for directory in directories.filtered("parent_id"):
+            deltas[directory.parent_id.id][2] -= 1
+        res = super(DmsDirectory, directories).unlink()
+        self._add_to_totals(deltas)
+        return res
 
     @api.model
     def _search_panel_domain_image(
@@ -0,0 +1,113 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+PERMISSION_OPERATIONS = [
+    ("read", "Read"),
+    ("create", "Create"),
+    ("write", "Write"),
+    ("unlink", "Delete"),
+]
+
+
+class DmsDirectoryPermission(models.Model):
+    """Operations allowed to each user on each directory by the DMS access groups.
+
+    The rows are computed again from ``dms_directory_complete_groups_rel`` and the
+    users and permissions of the access groups each time one of them changes, so
+    that the record rules only look up this table.
+    """
+
+    _name = "dms.directory.permission"
+    _description = "DMS Directory Permission"
+    _log_access = False
+
+    user_id = fields.Many2one(
+        "res.users", required=True, readonly=True, ondelete="cascade"
+    )
+    directory_id = fields.Many2one(
+        "dms.directory", required=True, readonly=True, index=True, ondelete="cascade"
+    )
+    operation = fields.Selection(PERMISSION_OPERATIONS, required=True, readonly=True)
+
+    _sql_constraints = [
+        (
+            "permission_uniq",
+            "unique (user_id, operation, directory_id)",
+            "The permission of a user on a directory must be unique!",
+        )
+    ]
+
+    @api.model
+    def _refresh(self, directories=None, groups=None, users=None):
+        """Compute again the permissions on ``directories`` and on the directories
+        of ``groups`` and their child groups, and the permissions of ``users``.
+        Everything is computed again when none of them is given.
+        """
+        self.env["dms.access.group"].flush_model(
+            [
+                "parent_path",
+                "perm_inclusive_create",
+                "perm_inclusive_unlink",
+                "perm_inclusive_write",
+                "users",
+            ]
+        )
+        self.env["dms.directory"].flush_model(["complete_group_ids"])
+        directory_ids = set(directories.ids) if directories else set()
+        if groups:
+            self.env.cr.execute(
+                SQL(
+                    """
+                    SELECT DISTINCT rel.aid
+                    FROM dms_directory_complete_groups_rel rel
+                    JOIN dms_access_group dag ON dag.id = rel.gid
+                    WHERE dag.parent_path LIKE ANY(%s)
+                    """,
+                    [f"{path}%" for path in groups.sudo().mapped("parent_path")],
+                )
+            )
+            directory_ids.update(row[0] for row in self.env.cr.fetchall())
+        user_ids = set(users.ids) if users else set()
+        if directories is None and groups is None and users is None:
+            where = rel_where = SQL("TRUE")
+        elif not directory_ids and not user_ids:
+            return
+        else:
+            where = SQL(
+                "directory_id = ANY(%s) OR user_id = ANY(%s)",
+                list(directory_ids),
+                list(user_ids),
+            )
+            rel_where = SQL(
+                "rel.aid = ANY(%s) OR users.uid = ANY(%s)",
+                list(directory_ids),
+                list(user_ids),
+            )
+        self.env.cr.execute(
+            SQL("DELETE FROM %s WHERE %s", SQL.identifier(self._table), where)
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO %(table)s (user_id, directory_id, operation)
+                SELECT DISTINCT users.uid, rel.aid, op.operation
+                FROM dms_directory_complete_groups_rel rel
+                JOIN dms_access_group dag ON dag.id = rel.gid
+                JOIN dms_access_group_users_rel users ON users.gid = dag.id
+                CROSS JOIN LATERAL (
+                    VALUES
+                        ('read', TRUE),
+                        ('create', dag.perm_inclusive_create),
+                        ('write', dag.perm_inclusive_write),
+                        ('unlink', dag.perm_inclusive_unlink)
+                ) AS op (operation, allowed)
+                WHERE op.allowed AND (%(where)s)
+                ON CONFLICT DO NOTHING
+                """,
+                table=SQL.identifier(self._table),
+                where=rel_where,
+            )
+        )
+        self.invalidate_model()
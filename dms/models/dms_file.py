@@ -14,11 +14,13 @@ from PIL import Image
 
 from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError, ValidationError
+from odoo.http import Stream
 from odoo.osv import expression
-from odoo.tools import consteq, human_size
+from odoo.tools import SQL, consteq, human_size
 from odoo.tools.mimetypes import guess_mimetype
 
 from ..tools import file
+from ..tools.stream import BinaryColumnStream
 
 _logger = logging.getLogger(__name__)
 
@@ -200,10 +202,51 @@ class DMSFile(models.Model):
         index=True,
     )
 
+    def init(self):
+        # Stored uncompressed, so that the content is streamed by chunks without
+        # decompressing it again for each of them
+        self.env.cr.execute(
+            SQL(
+                "ALTER TABLE %s ALTER COLUMN content_binary SET STORAGE EXTERNAL",
+                SQL.identifier(self._table),
+            )
+        )
+
     def get_human_size(self):
         return human_size(self.size)
 
     # Helper
+    def _get_content_stream(self):
+        """Return a stream of the content, served from the filestore when it is
+        stored there and read by chunks from the database otherwise, so that the
+        content is not loaded whole in memory. Only the contents compressed before
+        the column was stored uncompressed are still read at once.
+        """
+        self.ensure_one()
+        file_attachment = (
+            self.env["ir.attachment"]
+            .sudo()
+            .search(
+                [
+                    ("res_model", "=", self._name),
+                    ("res_id", "=", self.id),
+                    ("res_field", "=", "content_file"),
+                ],
+                limit=1,
+            )
+        )
+        if file_attachment:
+            stream = Stream.from_attachment(file_attachment)
+        elif stream := BinaryColumnStream.from_record(self, "content_binary"):
+            stream.etag = self.checksum
+        elif self.attachment_id:
+            stream = Stream.from_attachment(self.attachment_id.sudo())
+        else:
+            stream = Stream(type="data", data=b"", size=0)
+        stream.download_name = self.name
+        stream.mimetype = self.mimetype or stream.mimetype
+        return stream
+
     @api.model
     def _get_checksum(self, binary):
         return hashlib.sha1(binary or b"").hexdigest()
@@ -593,6 +636,17 @@ class DMSFile(models.Model):
             vals["name"] = file.unique_name(dms_file.name, names, dms_file.extension)
         return vals_list
 
+    def _get_directory_totals(self, deltas=None, sign=1):
+        """Add the size and the count of the active files to ``deltas``, the
+        totals by directory id given to ``dms.directory._add_to_totals``.
+        """
+        if deltas is None:
+            deltas = defaultdict(lambda: [0.0, 0, 0])
+        for record in self.filtered("active"):
+            deltas[record.directory_id.id][0] += sign * record.size
+            deltas[record.directory_id.id][1] += sign
+        return deltas
+
     @api.model_create_multi
     def create(self, vals_list):
         new_vals_list = []
@@ -600,11 +654,29 @@ class DMSFile(models.Model):
             if "attachment_id" not in vals:
                 vals = self._create_model_attachment(vals)
             new_vals_list.append(vals)
-        return super().create(new_vals_list)
+        # The totals are added once the content is written
+        res = super(DMSFile, self.with_context(dms_skip_directory_totals=True)).create(
+            new_vals_list
+        )
+        res = res.with_env(self.env)
+        self.env["dms.directory"]._add_to_totals(res._get_directory_totals())
+        return res
+
+    def write(self, vals):
+        if self.env.context.get("dms_skip_directory_totals") or not any(
+            key in vals for key in ["directory_id", "size", "active"]
+        ):
+            return super().write(vals)
+        deltas = self._get_directory_totals(sign=-1)
+        res = super().write(vals)
+        self.env["dms.directory"]._add_to_totals(self._get_directory_totals(deltas))
+        return res
 
     def unlink(self):
         attachments = self.mapped("attachment_id")
+        deltas = self._get_directory_totals(sign=-1)
         res = super().unlink()
+        self.env["dms.directory"]._add_to_totals(deltas)
         if not self.env.context.get("dms_file"):
             attachments.with_context(dms_file=True).unlink()
         return res
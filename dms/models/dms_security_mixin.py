@@ -158,30 +158,19 @@ class DmsSecurityMixin(models.AbstractModel):
 
     @api.model
     def _get_access_groups_query(self, operation):
-        """Return the query to select access groups."""
-        operation_check = {
-            "create": "AND dag.perm_inclusive_create",
-            "read": "",
-            "unlink": "AND dag.perm_inclusive_unlink",
-            "write": "AND dag.perm_inclusive_write",
-        }[operation]
-        select = f"""(
+        """Return the query to select the directories of the access groups."""
+        return SQL(
+            """(
             SELECT
-                dir_group_rel.aid
+                directory_id
             FROM
-                dms_directory_complete_groups_rel AS dir_group_rel
-                INNER JOIN dms_access_group AS dag
-                    ON dir_group_rel.gid = dag.id
-                INNER JOIN dms_access_group_users_rel AS users
-                    ON users.gid = dag.id
+                dms_directory_permission
             WHERE
-                users.uid = %s {operation_check}
-            )"""
-        sql = SQL(
-            select,
+                user_id = %s AND operation = %s
+            )""",
             self.env.uid,
+            operation,
         )
-        return sql
 
     @api.model
     def _get_domain_by_access_groups(self, operation):
@@ -275,6 +264,9 @@ class DmsSecurityMixin(models.AbstractModel):
         result |= self._filtered_access_no_recursion(operation)
         return result
 
+    def _refresh_permissions(self):
+        """Update the permissions materialized for these records, if any."""
+
     def _check_access_dms_record(self, operation: str) -> tuple | None:
         """Specific method "similar" to _check_access() but with a different
         behavior: check if you do not really have access to any of the records
@@ -294,6 +286,7 @@ class DmsSecurityMixin(models.AbstractModel):
         # Need to flush now, so all groups are stored in DB and the SELECT used
         # to check access works
         res.flush_recordset()
+        res._refresh_permissions()
         # Go back to the original sudo state and check we really had creation permission
         res = res.sudo(self.env.su)
         res._check_access_dms_record("create")
@@ -1,5 +1,7 @@
 # Copyright 2021-2025 Tecnativa - Víctor Martínez
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+from collections import defaultdict
+
 from odoo import api, models
 from odoo.tools import ormcache
 
@@ -8,9 +10,11 @@ class IrAttachment(models.Model):
     _inherit = "ir.attachment"
 
     def _get_dms_directories(self, res_model, res_id):
+        """Directories of the record ``res_id`` of ``res_model``, or of several
+        records when ``res_id`` is a list."""
         domain = [
             ("res_model", "=", res_model),
-            ("res_id", "=", res_id),
+            ("res_id", "in" if isinstance(res_id, list) else "=", res_id),
             ("storage_id.save_type", "=", "attachment"),
         ]
         if self.env.context.get("attaching_to_record"):
@@ -18,21 +22,32 @@ class IrAttachment(models.Model):
         return self.env["dms.directory"].search(domain)
 
     def _dms_directories_create(self):
-        items = self.sudo()._get_dms_directories(self.res_model, False)
-        for item in items:
-            model_item = self.env[self.res_model].browse(self.res_id)
-            ir_model_item = (
-                self.env["ir.model"].sudo().search([("model", "=", self.res_model)])
-            )
+        """Create the directories of the records of the attachments in the
+        directories of their model."""
+        records = defaultdict(set)
+        for attachment in self:
+            records[attachment.res_model].add(attachment.res_id)
+        vals_list = []
+        for res_model, res_ids in records.items():
+            items = self.sudo()._get_dms_directories(res_model, False)
+            if not items:
+                continue
+            ir_model_item = self.env["ir.model"].sudo()._get(res_model)
+            for model_item in self.env[res_model].browse(sorted(res_ids)):
+                for item in items:
+                    vals_list.append(
+                        {
+                            "name": model_item.display_name,
+                            "model_id": ir_model_item.id,
+                            "res_model": res_model,
+                            "res_id": model_item.id,
+                            "parent_id": item.id,
+                            "storage_id": item.storage_id.id,
+                        }
+                    )
+        if vals_list:
             self.env["dms.directory"].sudo().with_context(check_name=False).create(
-                {
-                    "name": model_item.display_name,
-                    "model_id": ir_model_item.id,
-                    "res_model": self.res_model,
-                    "res_id": self.res_id,
-                    "parent_id": item.id,
-                    "storage_id": item.storage_id.id,
-                }
+                vals_list
             )
 
     @ormcache("model")
@@ -41,49 +56,76 @@ class IrAttachment(models.Model):
         item = self.env["dms.storage"].sudo().search([("model_ids.model", "=", model)])
         return bool(item)
 
+    def _get_dms_directories_by_record(self, records):
+        """Directories of ``records``, a dict of sets of record ids by model,
+        grouped by (model, record id)."""
+        directories = defaultdict(lambda: self.env["dms.directory"])
+        for res_model, res_ids in records.items():
+            for directory in self._get_dms_directories(res_model, list(res_ids)):
+                directories[(res_model, directory.res_id)] |= directory
+        return directories
+
     def _dms_operations(self):
         """Perform the operation only if there is a storage with linked models.
         The directory (dms.directory) linked to the record (if it does not exist)
         and the file (dms.file) with the linked attachment would be created.
+
+        All the attachments are processed at once: the directories of their
+        records are searched and the missing ones created with one query each,
+        as well as the files.
         """
-        for attachment in self:
-            if (
-                not attachment.res_model
-                or not attachment.res_id
-                or (
-                    attachment.res_model
-                    and not self._dms_operations_from_model(attachment.res_model)
-                )
-            ):
-                continue
-            directories = attachment._get_dms_directories(
-                attachment.res_model, attachment.res_id
+        attachments = self.filtered(
+            lambda attachment: attachment.res_model
+            and attachment.res_id
+            and self._dms_operations_from_model(attachment.res_model)
+        )
+        if not attachments:
+            return
+        records = defaultdict(set)
+        for attachment in attachments:
+            records[attachment.res_model].add(attachment.res_id)
+        directories = self._get_dms_directories_by_record(records)
+        without_directory = attachments.filtered(
+            lambda attachment: (attachment.res_model, attachment.res_id)
+            not in directories
+        )
+        if without_directory:
+            without_directory._dms_directories_create()
+            # Get dms_directories again (with items previously created)
+            missing = defaultdict(set)
+            for attachment in without_directory:
+                missing[attachment.res_model].add(attachment.res_id)
+            directories.update(self._get_dms_directories_by_record(missing))
+        # Auto-create_files (if not exists)
+        dms_file_model = self.env["dms.file"].sudo()
+        all_directories = self.env["dms.directory"].union(*directories.values())
+        existing = {
+            (dms_file.attachment_id.id, dms_file.directory_id.id)
+            for dms_file in dms_file_model.search_fetch(
+                [
+                    ("attachment_id", "in", attachments.ids),
+                    ("directory_id", "in", all_directories.ids),
+                ],
+                ["attachment_id", "directory_id"],
             )
-            if not directories:
-                attachment._dms_directories_create()
-                # Get dms_directories again (with items previously created)
-                directories = attachment._get_dms_directories(
-                    attachment.res_model, attachment.res_id
+        }
+        vals_list = []
+        for attachment in attachments:
+            key = (attachment.res_model, attachment.res_id)
+            for directory in directories.get(key, []):
+                if (attachment.id, directory.id) in existing:
+                    continue
+                vals_list.append(
+                    {
+                        "name": attachment.name,
+                        "directory_id": directory.id,
+                        "attachment_id": attachment.id,
+                        "res_model": attachment.res_model,
+                        "res_id": attachment.res_id,
+                    }
                 )
-            # Auto-create_files (if not exists)
-            for directory in directories:
-                dms_file_model = self.env["dms.file"].sudo()
-                dms_file = dms_file_model.search(
-                    [
-                        ("attachment_id", "=", attachment.id),
-                        ("directory_id", "=", directory.id),
-                    ]
-                )
-                if not dms_file:
-                    dms_file_model.create(
-                        {
-                            "name": attachment.name,
-                            "directory_id": directory.id,
-                            "attachment_id": attachment.id,
-                            "res_model": attachment.res_model,
-                            "res_id": attachment.res_id,
-                        }
-                    )
+        if vals_list:
+            dms_file_model.create(vals_list)
 
     @api.model_create_multi
     def create(self, vals_list):
@@ -0,0 +1,15 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+
+from odoo import models
+
+
+class ResGroups(models.Model):
+    _inherit = "res.groups"
+
+    def write(self, vals):
+        if not any(key in vals for key in ["implied_ids", "users"]):
+            return super().write(vals)
+        users = self.users
+        res = super().write(vals)
+        self.env["dms.directory.permission"]._refresh(users=users | self.users)
+        return res
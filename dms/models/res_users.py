@@ -0,0 +1,21 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+
+from odoo import api, models
+
+from odoo.addons.base.models.res_users import is_reified_group
+
+
+class ResUsers(models.Model):
+    _inherit = "res.users"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.env["dms.directory.permission"]._refresh(users=res)
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(key == "groups_id" or is_reified_group(key) for key in vals):
+            self.env["dms.directory.permission"]._refresh(users=self)
+        return res
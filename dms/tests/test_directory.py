@@ -4,6 +4,7 @@
 # Copyright 2024 Subteno - Timothée Vannier (https://www.subteno.com).
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
 
+import base64
 import os
 
 from odoo import Command
@@ -280,6 +281,59 @@ class DirectoryTestCaseBase(StorageDatabaseBaseCase):
         with self.assertRaises(AccessError):
             root_directory.with_user(user).unlink()
 
+    def test_permission_table(self):
+        def permissions(directory):
+            return set(
+                self.env["dms.directory.permission"]
+                .search([("directory_id", "=", directory.id)])
+                .mapped(lambda permission: (permission.user_id, permission.operation))
+            )
+
+        user = new_test_user(
+            self.env, login="test-dms-permission-user", groups="dms.group_dms_user"
+        )
+        parent_group = self.access_group_model.create({"name": "Test parent group"})
+        group = self.access_group_model.create(
+            {
+                "name": "Test permission group",
+                "parent_group_id": parent_group.id,
+                "explicit_user_ids": [Command.set(user.ids)],
+            }
+        )
+        root_directory = self.create_directory(storage=self.storage)
+        sub_directory = self.create_directory(directory=root_directory)
+        self.assertNotIn((user, "read"), permissions(sub_directory))
+        root_directory.group_ids = [Command.link(group.id)]
+        self.assertEqual(
+            {(u, op) for u, op in permissions(sub_directory) if u == user},
+            {(user, "read")},
+        )
+        self.assertTrue(sub_directory.with_user(user).permission_read)
+        self.assertFalse(sub_directory.with_user(user).permission_write)
+        # Permissions inherited from the parent group
+        parent_group.perm_write = True
+        self.assertIn((user, "write"), permissions(sub_directory))
+        self.assertTrue(sub_directory.with_user(user).permission_write)
+        # Users given by the groups of the access group
+        other_user = new_test_user(self.env, login="test-dms-permission-other")
+        res_group = self.env["res.groups"].create({"name": "Test DMS permission"})
+        group.group_ids = [Command.link(res_group.id)]
+        self.assertNotIn((other_user, "read"), permissions(sub_directory))
+        other_user.groups_id = [Command.link(res_group.id)]
+        self.assertIn((other_user, "read"), permissions(sub_directory))
+        res_group.users = [Command.unlink(other_user.id)]
+        self.assertNotIn((other_user, "read"), permissions(sub_directory))
+        # Directory moved out of the tree of the group
+        sub_directory.write({"is_root_directory": True, "storage_id": self.storage.id})
+        self.assertNotIn((user, "read"), permissions(sub_directory))
+        self.assertFalse(sub_directory.with_user(user).permission_read)
+        # The rebuilt table is the same
+        expected = permissions(root_directory)
+        self.env["dms.directory.permission"]._refresh()
+        self.assertEqual(permissions(root_directory), expected)
+        group.unlink()
+        self.assertNotIn((user, "read"), permissions(root_directory))
+
 
 class DirectoryMailTestCase(StorageDatabaseBaseCase):
     @classmethod
@@ -317,3 +371,52 @@ class DirectoryMailTestCase(StorageDatabaseBaseCase):
             self.directory.alias_id.display_name,
             f"{self.directory.alias_name}@{self.domain.name}",
         )
+
+    @users("dms-manager")
+    @mute_logger("odoo.models.unlink")
+    def test_totals(self):
+        def totals(directory):
+            return (
+                directory.size,
+                directory.count_total_files,
+                directory.count_total_directories,
+            )
+
+        root_directory = self.create_directory(storage=self.storage)
+        sub_directory = self.create_directory(directory=root_directory)
+        leaf_directory = self.create_directory(directory=sub_directory)
+        leaf_file = self.create_file(directory=leaf_directory)
+        self.assertEqual(totals(root_directory), (6, 1, 2))
+        self.assertEqual(totals(leaf_directory), (6, 1, 0))
+        leaf_file.content = base64.b64encode(b"new content")
+        self.assertEqual(totals(root_directory), (11, 1, 2))
+        leaf_file.directory_id = root_directory
+        self.assertEqual(totals(root_directory), (11, 1, 2))
+        self.assertEqual(totals(sub_directory), (0, 0, 1))
+        leaf_file.active = False
+        self.assertEqual(totals(root_directory), (0, 0, 2))
+        leaf_file.active = True
+        # Move a directory with its files to another tree
+        other_directory = self.create_directory(storage=self.storage)
+        self.create_file(directory=leaf_directory)
+        leaf_directory.parent_id = other_directory
+        self.assertEqual(totals(root_directory), (11, 1, 1))
+        self.assertEqual(totals(other_directory), (6, 1, 1))
+        # The rebuilt totals are the same
+        directories = root_directory | sub_directory | other_directory
+        expected = [totals(directory) for directory in directories]
+        self.directory_model._rebuild_totals()
+        self.assertEqual([totals(directory) for directory in directories], expected)
+        leaf_directory.unlink()
+        self.assertEqual(totals(other_directory), (0, 0, 0))
+        leaf_file.unlink()
+        self.assertEqual(totals(root_directory), (0, 0, 1))
+        # Totals left empty, as on directories created before they were stored
+        self.env.cr.execute(
+            "UPDATE dms_directory SET size = NULL, count_total_files = NULL, "
+            "count_total_directories = NULL WHERE id = %s",
+            [root_directory.id],
+        )
+        root_directory.invalidate_recordset()
+        self.create_file(directory=root_directory)
+        self.assertEqual(totals(root_directory), (6, 1, 0))
@@ -1,12 +1,16 @@
 # Copyright 2021-2025 Tecnativa - Víctor Martínez
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl)
 
+import base64
+import io
+
 import odoo.tests
 from odoo.exceptions import AccessError
 from odoo.tests.common import users
 from odoo.tools import mute_logger
 
-from .common import StorageAttachmentBaseCase
+from ..tools.stream import BinaryColumnReader
+from .common import StorageAttachmentBaseCase, StorageDatabaseBaseCase
 
 
 @odoo.tests.tagged("post_install", "-at_install")
@@ -88,3 +92,57 @@ class TestDmsPortal(odoo.tests.HttpCase, StorageAttachmentBaseCase):
             file.check_access("write")
         with self.assertRaises(AccessError, msg="Portal user should not have access"):
             file.check_access("unlink")
+
+
+@odoo.tests.tagged("post_install", "-at_install")
+class TestDmsFileDownload(odoo.tests.HttpCase, StorageDatabaseBaseCase):
+    def _test_download(self, file):
+        url = file.access_url
+        response = self.url_open(url, timeout=20)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"\xff data")
+        self.assertEqual(response.headers["Accept-Ranges"], "bytes")
+        etag = response.headers["ETag"]
+        # Resumed download
+        response = self.url_open(url, headers={"Range": "bytes=2-"}, timeout=20)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, b"data")
+        self.assertEqual(response.headers["Content-Range"], "bytes 2-5/6")
+        response = self.url_open(url, headers={"If-None-Match": etag}, timeout=20)
+        self.assertEqual(response.status_code, 304)
+
+    def test_download_database(self):
+        self.authenticate("dms-manager", "dms-manager")
+        file = self.create_file(directory=self.directory)
+        self.assertTrue(file.content_binary)
+        self._test_download(file)
+
+    def test_download_database_compression(self):
+        self.authenticate("dms-manager", "dms-manager")
+        content = b"\xff data" * 10000
+        file = self.create_file(
+            directory=self.directory, content=base64.b64encode(content)
+        )
+        stream = file._get_content_stream()
+        self.assertIsInstance(stream.reader, BinaryColumnReader)
+        self.assertEqual(stream.read(), content)
+        # Content compressed before the column was stored uncompressed
+        self.env.cr.execute(
+            "ALTER TABLE dms_file ALTER COLUMN content_binary SET STORAGE EXTENDED"
+        )
+        file.content = base64.b64encode(content[::-1])
+        stream = file._get_content_stream()
+        self.assertIsInstance(stream.reader, io.BytesIO)
+        self.assertEqual(stream.read(), content[::-1])
+        response = self.url_open(
+            file.access_url, headers={"Range": "bytes=2-"}, timeout=20
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, content[::-1][2:])
+
+    def test_download_file(self):
+        self.authenticate("dms-manager", "dms-manager")
+        directory = self.create_directory(storage=self.create_storage("file"))
+        file = self.create_file(directory=directory)
+        self.assertTrue(file.content_file)
+        self._test_download(file)
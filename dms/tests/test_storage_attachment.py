@@ -166,3 +166,33 @@ class StorageAttachmentTestCase(StorageAttachmentBaseCase):
         attachment = self._create_attachment("Test file")
         self.assertEqual(attachment.name, "Test file", "Name should be Test file")
         self.assertTrue(self._get_partner_directory(), "Directory should exist")
+
+    @users("dms-manager")
+    def test_create_attachments_batch(self):
+        partners = self.partner | self.other_partner
+        self._create_attachment("existing.txt")
+        attachments = self.attachment_model.create(
+            [
+                {
+                    "name": f"batch-{partner.id}-{index}.txt",
+                    "datas": self.content_base64(),
+                    "res_model": partner._name,
+                    "res_id": partner.id,
+                }
+                for partner in partners
+                for index in range(2)
+            ]
+        )
+        for partner in partners:
+            directory = self._get_partner_directory(partner)
+            self.assertEqual(len(directory), 1, "One directory per partner")
+            self.assertEqual(
+                set(directory.file_ids.attachment_id.ids) & set(attachments.ids),
+                set(attachments.filtered(lambda x, p=partner: x.res_id == p.id).ids),
+            )
+        # Files are not duplicated when processed again
+        files = self.file_model.search([("attachment_id", "in", attachments.ids)])
+        attachments._dms_operations()
+        self.assertEqual(
+            self.file_model.search([("attachment_id", "in", attachments.ids)]), files
+        )
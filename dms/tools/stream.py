@@ -0,0 +1,157 @@
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+
+import io
+
+from werkzeug.wsgi import wrap_file
+
+from odoo.http import STATIC_CACHE_LONG, Response, Stream, content_disposition, request
+from odoo.tools import SQL
+
+# Bytes read from the database at once when streaming a binary column
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class BinaryColumnReader(io.RawIOBase):
+    """Read-only file over a binary column of a record.
+
+    The response is streamed after the cursor of the request is closed, so each
+    chunk is read with a cursor of its own, released as soon as it is read: a slow
+    client does not hold a connection of the pool during the whole download.
+    """
+
+    def __init__(self, registry, table, column, res_id, size):
+        super().__init__()
+        self._registry = registry
+        self._table = table
+        self._column = column
+        self._res_id = res_id
+        self._size = size
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = max(offset, 0)
+        return self._position
+
+    def readinto(self, buffer):
+        length = min(len(buffer), self._size - self._position)
+        if length <= 0:
+            return 0
+        with self._registry.cursor() as cr:
+            cr.execute(
+                SQL(
+                    "SELECT substring(%s FROM %s FOR %s) FROM %s WHERE id = %s",
+                    SQL.identifier(self._column),
+                    self._position + 1,
+                    length,
+                    SQL.identifier(self._table),
+                    self._res_id,
+                )
+            )
+            chunk = (cr.fetchone() or [b""])[0] or b""
+        buffer[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+
+class BinaryColumnStream(Stream):
+    """Stream of a binary column stored in the table of the record, served by
+    chunks and supporting conditional and range requests.
+    """
+
+    type = "column"
+    reader = None
+
+    @classmethod
+    def from_record(cls, record, field_name):
+        """Stream of ``field_name`` of ``record``, None when it is empty."""
+        record.ensure_one()
+        record.flush_recordset([field_name])
+        record.env.cr.execute(
+            SQL(
+                "SELECT octet_length(%s), pg_column_size(%s) FROM %s WHERE id = %s",
+                SQL.identifier(field_name),
+                SQL.identifier(field_name),
+                SQL.identifier(record._table),
+                record.id,
+            )
+        )
+        size, stored_size = record.env.cr.fetchone() or (None, None)
+        if not size:
+            return None
+        if stored_size < size:
+            # A compressed value is decompressed from its start for every
+            # substring, so it is read at once instead of by chunks
+            record.env.cr.execute(
+                SQL(
+                    "SELECT %s FROM %s WHERE id = %s",
+                    SQL.identifier(field_name),
+                    SQL.identifier(record._table),
+                    record.id,
+                )
+            )
+            reader = io.BytesIO(bytes(record.env.cr.fetchone()[0]))
+        else:
+            reader = BinaryColumnReader(
+                record.env.registry, record._table, field_name, record.id, size
+            )
+        return cls(reader=reader, size=size, last_modified=record.write_date)
+
+    def read(self):
+        self.reader.seek(0)
+        return self.reader.read()
+
+    def get_response(
+        self,
+        as_attachment=None,
+        immutable=None,
+        content_security_policy="default-src 'none'",
+        **send_file_kwargs,
+    ):
+        if as_attachment is None:
+            as_attachment = self.as_attachment
+        if immutable is None:
+            immutable = self.immutable
+        httprequest = request.httprequest
+        response = Response(
+            wrap_file(httprequest.environ, self.reader, buffer_size=STREAM_CHUNK_SIZE),
+            mimetype=self.mimetype,
+            direct_passthrough=True,
+        )
+        response.content_length = self.size
+        if self.download_name:
+            response.headers["Content-Disposition"] = content_disposition(
+                self.download_name,
+                disposition_type="attachment" if as_attachment else "inline",
+            )
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        if content_security_policy:
+            response.headers["Content-Security-Policy"] = content_security_policy
+        if self.etag and isinstance(self.etag, str):
+            response.set_etag(self.etag)
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        max_age = send_file_kwargs.get("max_age", self.max_age)
+        if immutable:
+            max_age = STATIC_CACHE_LONG
+            response.cache_control.immutable = True
+        response.cache_control.public = self.public
+        if max_age:
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.no_cache = True
+        return response.make_conditional(
+            httprequest, accept_ranges=True, complete_length=self.size
+        )
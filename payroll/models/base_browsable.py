@@ -1,6 +1,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import logging
+from collections import defaultdict
 
 from odoo import fields
 
@@ -25,13 +26,100 @@ class BaseBrowsableObject:
         return str(self.__dict__)
 
 
+class PayrollHistory:
+    """Amounts of the done payslips of some employees from a date, loaded for
+    all of them with one query by table, so that the sums of the rules of the
+    payslips computed together do not query the database.
+    Only the sums of these employees from that date can be served, the other
+    ones are queried.
+    """
+
+    def __init__(self, env, employee_ids, date_from):
+        self.employee_ids = set(employee_ids)
+        self.date_from = fields.Date.to_date(date_from)
+        params = (tuple(self.employee_ids) or (None,), self.date_from)
+        self.lines = self._load(
+            env,
+            """
+            SELECT hp.employee_id, pl.code, hp.date_from, hp.date_to,
+             sum(case when hp.credit_note = False then
+             (pl.total) else (-pl.total) end)
+            FROM hr_payslip as hp, hr_payslip_line as pl
+            WHERE hp.employee_id IN %s AND hp.state = 'done'
+            AND hp.date_from >= %s AND hp.id = pl.slip_id
+            GROUP BY 1, 2, 3, 4""",
+            params,
+        )
+        self.inputs = self._load(
+            env,
+            """
+            SELECT hp.employee_id, pi.code, hp.date_from, hp.date_to,
+             sum(amount)
+            FROM hr_payslip as hp, hr_payslip_input as pi
+            WHERE hp.employee_id IN %s AND hp.state = 'done'
+            AND hp.date_from >= %s AND hp.id = pi.payslip_id
+            GROUP BY 1, 2, 3, 4""",
+            params,
+        )
+        self.worked_days = self._load(
+            env,
+            """
+            SELECT hp.employee_id, pi.code, hp.date_from, hp.date_to,
+             sum(number_of_days), sum(number_of_hours)
+            FROM hr_payslip as hp, hr_payslip_worked_days as pi
+            WHERE hp.employee_id IN %s AND hp.state = 'done'
+            AND hp.date_from >= %s AND hp.id = pi.payslip_id
+            GROUP BY 1, 2, 3, 4""",
+            params,
+        )
+
+    def _load(self, env, query, params):
+        """Sums by (employee, code) of the rows of ``query``, with the dates
+        of their payslip.
+        """
+        env.cr.execute(query, params)
+        res = defaultdict(list)
+        for employee_id, code, date_from, date_to, *amounts in env.cr.fetchall():
+            res[employee_id, code].append((date_from, date_to, amounts))
+        return res
+
+    def covers(self, employee_id, from_date):
+        return (
+            employee_id in self.employee_ids
+            and fields.Date.to_date(from_date) >= self.date_from
+        )
+
+    def sum(self, table, employee_id, code, from_date, to_date):
+        """Sums of ``table`` as the query of the helper would return them,
+        None when no payslip matches.
+        """
+        from_date = fields.Date.to_date(from_date)
+        to_date = fields.Date.to_date(to_date)
+        res = None
+        for date_from, date_to, amounts in table.get((employee_id, code), []):
+            if date_from >= from_date and date_to <= to_date:
+                if res is None:
+                    res = list(amounts)
+                else:
+                    res = [total + amount for total, amount in zip(res, amounts)]
+        return res
+
+
 # These classes are used in the _get_payslip_lines() method
 class BrowsableObject(BaseBrowsableObject):
-    def __init__(self, employee_id, vals_dict, env):
+    def __init__(self, employee_id, vals_dict, env, history=None):
         super().__init__(vals_dict)
-        self.base_fields += ["employee_id", "env"]
+        self.base_fields += ["employee_id", "env", "history"]
         self.employee_id = employee_id
         self.env = env
+        # PayrollHistory of the payslips computed together, if any
+        self.history = history
+
+    def _get_history(self, from_date):
+        history = self.history
+        if history and history.covers(self.employee_id, from_date):
+            return history
+        return None
 
 
 class InputLine(BrowsableObject):
@@ -41,6 +129,12 @@ class InputLine(BrowsableObject):
     def sum(self, code, from_date, to_date=None):
         if to_date is None:
             to_date = fields.Date.today()
+        history = self._get_history(from_date)
+        if history:
+            res = history.sum(
+                history.inputs, self.employee_id, code, from_date, to_date
+            )
+            return res and res[0] or 0.0
         self.env.cr.execute(
             """
             SELECT sum(amount) as sum
@@ -60,6 +154,11 @@ class WorkedDays(BrowsableObject):
     def _sum(self, code, from_date, to_date=None):
         if to_date is None:
             to_date = fields.Date.today()
+        history = self._get_history(from_date)
+        if history:
+            return history.sum(
+                history.worked_days, self.employee_id, code, from_date, to_date
+            )
         self.env.cr.execute(
             """
             SELECT sum(number_of_days) as number_of_days,
@@ -88,6 +187,10 @@ class Payslips(BrowsableObject):
     def sum(self, code, from_date, to_date=None):
         if to_date is None:
             to_date = fields.Date.today()
+        history = self._get_history(from_date)
+        if history:
+            res = history.sum(history.lines, self.employee_id, code, from_date, to_date)
+            return res and res[0] or 0.0
         self.env.cr.execute(
             """SELECT sum(case when hp.credit_note = False then
             (pl.total) else (-pl.total) end)
@@ -2,11 +2,12 @@
 
 import logging
 import math
+from collections import defaultdict
 from datetime import date, datetime, time
 
 import babel
 from dateutil.relativedelta import relativedelta
-from pytz import timezone
+from pytz import timezone, utc
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
@@ -15,12 +16,17 @@ from .base_browsable import (
     BaseBrowsableObject,
     BrowsableObject,
     InputLine,
+    PayrollHistory,
     Payslips,
     WorkedDays,
 )
 
 _logger = logging.getLogger(__name__)
 
+# Months of done payslips preloaded before the period of the payslips computed
+# together, for the sums of their rules
+HISTORY_MONTHS = 12
+
 
 class HrPayslip(models.Model):
     _name = "hr.payslip"
@@ -204,11 +210,10 @@ class HrPayslip(models.Model):
         return self.write({"state": "draft"})
 
     def action_payslip_done(self):
-        if (
-            not self.env.context.get("without_compute_sheet")
-            and not self.prevent_compute_on_confirm
-        ):
-            self.compute_sheet()
+        if not self.env.context.get("without_compute_sheet"):
+            self.filtered(
+                lambda slip: not slip.prevent_compute_on_confirm
+            ).compute_sheet()
         return self.write({"state": "done"})
 
     def action_payslip_cancel(self):
@@ -275,24 +280,34 @@ class HrPayslip(models.Model):
         return super().unlink()
 
     def compute_sheet(self):
-        for payslip in self:
-            # delete old payslip lines
-            payslip.line_ids.unlink()
-            # write payslip lines
-            number = payslip.number or self.env["ir.sequence"].next_by_code(
-                "salary.slip"
-            )
-            lines = [(0, 0, line) for line in list(payslip.get_lines_dict().values())]
-            payslip.write(
-                {
-                    "line_ids": lines,
-                    "number": number,
-                    "state": "verify",
-                    "compute_date": fields.Date.today(),
-                }
-            )
+        # delete old payslip lines
+        self.line_ids.unlink()
+        line_vals = []
+        payslips = self
+        if len(self) > 1:
+            payslips = self.with_context(payroll_history=self._load_payroll_history())
+        for payslip in payslips:
+            if not payslip.number:
+                payslip.number = self.env["ir.sequence"].next_by_code("salary.slip")
+            line_vals += [
+                dict(line, slip_id=payslip.id)
+                for line in payslip.get_lines_dict().values()
+            ]
+        # write payslip lines
+        self.env["hr.payslip.line"].create(line_vals)
+        self.write({"state": "verify", "compute_date": fields.Date.today()})
         return True
 
+    def _load_payroll_history(self):
+        """Amounts of the done payslips of the employees of the payslips, used by
+        the sums of the rules while the payslips are computed.
+        """
+        self.env.flush_all()
+        date_from = min(self.mapped("date_from")).replace(day=1) - relativedelta(
+            months=HISTORY_MONTHS
+        )
+        return PayrollHistory(self.env, self.employee_id.ids, date_from)
+
     @api.model
     def get_worked_day_lines(self, contracts, date_from, date_to):
         """
@@ -328,15 +343,25 @@ class HrPayslip(models.Model):
         @return: returns a list containing the leave inputs for the period
         of the payslip. One record per leave type.
         """
+        day_leave_intervals = contract.employee_id.list_leaves(
+            day_from, day_to, calendar=contract.resource_calendar_id
+        )
+        return self._get_leave_days(contract, day_leave_intervals)
+
+    def _get_leave_days(self, contract, day_leave_intervals, work_hours=None):
+        """
+        Leave inputs of ``contract`` from the ``(day, hours, leave)`` tuples
+        of ``list_leaves``. ``work_hours`` caches the work hours of the
+        calendar by day, it can be shared by the contracts of a same calendar.
+        """
         leaves_positive = (
             self.env["ir.config_parameter"].sudo().get_param("payroll.leaves_positive")
         )
         leaves = {}
         calendar = contract.resource_calendar_id
         tz = timezone(calendar.tz)
-        day_leave_intervals = contract.employee_id.list_leaves(
-            day_from, day_to, calendar=contract.resource_calendar_id
-        )
+        if work_hours is None:
+            work_hours = {}
         for day, hours, leave in day_leave_intervals:
             holiday = leave[:1].holiday_id
             current_leave_struct = leaves.setdefault(
@@ -362,16 +387,17 @@ class HrPayslip(models.Model):
                 current_leave_struct["number_of_hours"] += hours
             else:
                 current_leave_struct["number_of_hours"] -= hours
-            work_hours = calendar.get_work_hours_count(
-                tz.localize(datetime.combine(day, time.min)),
-                tz.localize(datetime.combine(day, time.max)),
-                compute_leaves=False,
-            )
-            if work_hours:
+            if day not in work_hours:
+                work_hours[day] = calendar.get_work_hours_count(
+                    tz.localize(datetime.combine(day, time.min)),
+                    tz.localize(datetime.combine(day, time.max)),
+                    compute_leaves=False,
+                )
+            if work_hours[day]:
                 if leaves_positive:
-                    current_leave_struct["number_of_days"] += hours / work_hours
+                    current_leave_struct["number_of_days"] += hours / work_hours[day]
                 else:
-                    current_leave_struct["number_of_days"] -= hours / work_hours
+                    current_leave_struct["number_of_days"] -= hours / work_hours[day]
         return leaves.values()
 
     def _compute_worked_days(self, contract, day_from, day_to):
@@ -396,6 +422,77 @@ class HrPayslip(models.Model):
             "contract_id": contract.id,
         }
 
+    @api.model
+    def _get_worked_day_lines_batch(self, contracts, date_from, date_to):
+        """
+        Worked days and leaves of many contracts, as returned by
+        get_worked_day_lines for each of them.
+        The contracts sharing a resource calendar and a start date are computed
+        together, with one read of the attendances and leaves of the calendar.
+        @return: returns a dict of the lists of worked days by contract id
+        """
+        res = defaultdict(list)
+        day_from = datetime.combine(date_from, time.min)
+        day_to = datetime.combine(date_to, time.max)
+        contract_ids = defaultdict(list)
+        for contract in contracts.filtered(
+            lambda contract: contract.resource_calendar_id
+        ):
+            # only use payslip day_from if it's greather than contract start date
+            contract_day_from = max(
+                day_from, datetime.combine(contract.date_start, time.min)
+            )
+            contract_ids[contract.resource_calendar_id, contract_day_from].append(
+                contract.id
+            )
+        for (calendar, contract_day_from), ids in contract_ids.items():
+            # Support for the hr_public_holidays module.
+            calendar = calendar.with_context(exclude_public_holidays=True)
+            group = self.env["hr.contract"].browse(ids)
+            employees = group.employee_id
+            # == compute leave days == #
+            # same intervals as list_leaves, naive datetimes are in UTC
+            start = contract_day_from.replace(tzinfo=utc)
+            stop = day_to.replace(tzinfo=utc)
+            attendances = calendar._attendance_intervals_batch(
+                start, stop, employees.resource_id
+            )
+            leave_intervals = calendar._leave_intervals_batch(
+                start, stop, employees.resource_id
+            )
+            work_hours = {}
+            for contract in group:
+                resource_id = contract.employee_id.resource_id.id
+                day_leave_intervals = [
+                    (
+                        interval_start.date(),
+                        (interval_stop - interval_start).total_seconds() / 3600,
+                        leave,
+                    )
+                    for interval_start, interval_stop, leave in (
+                        leave_intervals[resource_id] & attendances[resource_id]
+                    )
+                ]
+                res[contract.id].extend(
+                    self._get_leave_days(contract, day_leave_intervals, work_hours)
+                )
+            # == compute worked days == #
+            work_data = employees._get_work_days_data_batch(
+                contract_day_from, day_to, calendar=calendar, compute_leaves=False
+            )
+            for contract in group:
+                res[contract.id].append(
+                    {
+                        "name": _("Normal Working Days paid at 100%"),
+                        "sequence": 1,
+                        "code": "WORK100",
+                        "number_of_days": work_data[contract.employee_id.id]["days"],
+                        "number_of_hours": work_data[contract.employee_id.id]["hours"],
+                        "contract_id": contract.id,
+                    }
+                )
+        return res
+
     @api.model
     def get_inputs(self, contracts, date_from, date_to):
         # TODO: We leave date_from and date_to params here for backwards
@@ -488,10 +585,15 @@ class HrPayslip(models.Model):
         input_lines_dict = {
             line.code: line for line in self.input_line_ids if line.code
         }
+        history = self.env.context.get("payroll_history")
         localdict = {
-            "payslips": Payslips(self.employee_id.id, self, self.env),
-            "worked_days": WorkedDays(self.employee_id.id, worked_days_dict, self.env),
-            "inputs": InputLine(self.employee_id.id, input_lines_dict, self.env),
+            "payslips": Payslips(self.employee_id.id, self, self.env, history),
+            "worked_days": WorkedDays(
+                self.employee_id.id, worked_days_dict, self.env, history
+            ),
+            "inputs": InputLine(
+                self.employee_id.id, input_lines_dict, self.env, history
+            ),
             "payroll": BrowsableObject(
                 self.employee_id.id, self.get_payroll_dict(contracts), self.env
             ),
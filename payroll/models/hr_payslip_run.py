@@ -1,8 +1,17 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+import logging
+import math
+
 from dateutil.relativedelta import relativedelta
 
-from odoo import fields, models
+from odoo import _, api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Employees of a payslip batch computed together, larger selections are
+# generated in background by the 'Generate payslips' cron, one chunk at a time
+PAYSLIP_CHUNK_SIZE = 50
 
 
 class HrPayslipRun(models.Model):
@@ -62,9 +71,130 @@ class HrPayslipRun(models.Model):
         "applied will be all the rules set on the structure of all contracts "
         "of the employee valid for the chosen period",
     )
+    pending_employee_ids = fields.Many2many(
+        "hr.employee",
+        "hr_payslip_run_pending_employee_rel",
+        "run_id",
+        "employee_id",
+        string="Pending Employees",
+        readonly=True,
+        copy=False,
+        help="Employees whose payslip is being generated in background.",
+    )
+    generation_count = fields.Integer(
+        readonly=True,
+        copy=False,
+        help="Number of payslips requested by the last generation.",
+    )
+    generation_progress = fields.Float(
+        compute="_compute_generation_progress",
+        help="Percentage of the payslips of the last generation already created.",
+    )
+
+    @api.depends("pending_employee_ids", "generation_count")
+    def _compute_generation_progress(self):
+        for run in self:
+            if run.generation_count:
+                done = run.generation_count - len(run.pending_employee_ids)
+                run.generation_progress = 100.0 * done / run.generation_count
+            else:
+                run.generation_progress = 100.0
 
     def draft_payslip_run(self):
         return self.write({"state": "draft"})
 
     def close_payslip_run(self):
         return self.write({"state": "close"})
+
+    def _prepare_payslip_vals(self, employees):
+        """Values of the payslips of ``employees``, as given by get_payslip_vals
+        of hr.payslip for each of them, with the worked days of all the
+        employees computed together.
+        """
+        self.ensure_one()
+        Payslip = self.env["hr.payslip"]
+        contracts = employees.contract_id
+        structs = {}
+        for contract in contracts:
+            structs[contract.id] = self.struct_id or contract.struct_id
+        worked_days = Payslip._get_worked_day_lines_batch(
+            contracts.filtered(lambda contract: structs[contract.id]),
+            self.date_start,
+            self.date_end,
+        )
+        vals_list = []
+        for employee in employees:
+            contract = employee.contract_id
+            struct = structs.get(contract.id)
+            vals = {
+                "employee_id": employee.id,
+                "struct_id": struct.id if struct else False,
+                "contract_id": contract.id,
+                "payslip_run_id": self.id,
+                "input_line_ids": [],
+                "worked_days_line_ids": [],
+                "date_from": self.date_start,
+                "date_to": self.date_end,
+                "credit_note": self.credit_note,
+                "company_id": employee.company_id.id,
+            }
+            if struct:
+                inputs = Payslip.get_inputs(contract, self.date_start, self.date_end)
+                vals["input_line_ids"] = [(0, 0, x) for x in inputs]
+                vals["worked_days_line_ids"] = [
+                    (0, 0, x) for x in worked_days[contract.id]
+                ]
+            vals_list.append(vals)
+        return vals_list
+
+    def _generate_payslips(self, employees):
+        """Create and compute the payslips of ``employees`` in the batch."""
+        self.ensure_one()
+        payslips = self.env["hr.payslip"].create(self._prepare_payslip_vals(employees))
+        payslips._compute_name()
+        payslips.compute_sheet()
+        return payslips
+
+    def _enqueue_payslips(self, employees):
+        """Generate the payslips of ``employees`` in background."""
+        self.ensure_one()
+        # added to the generation in progress, if any
+        generation_count = len(employees - self.pending_employee_ids)
+        if self.pending_employee_ids:
+            generation_count += self.generation_count
+        self.write(
+            {
+                "pending_employee_ids": [(4, employee.id) for employee in employees],
+                "generation_count": generation_count,
+            }
+        )
+        self.env.ref("payroll.ir_cron_payslip_run_generate")._trigger()
+
+    @api.model
+    def _cron_generate_payslips(self, chunk_size=PAYSLIP_CHUNK_SIZE):
+        """Generate the payslips of the next chunk of pending employees, the cron
+        is run again until all the payslip batches are generated.
+        """
+        runs = self.search([("pending_employee_ids", "!=", False)], order="id")
+        if not runs:
+            return
+        run = runs[0]
+        employees = run.pending_employee_ids[:chunk_size]
+        try:
+            with self.env.cr.savepoint():
+                run._generate_payslips(employees)
+        except Exception as e:
+            _logger.exception("Error while generating the payslips of %s", run.name)
+            run.message_post(
+                body=_(
+                    "The payslips of %(employees)s could not be generated: %(error)s",
+                    employees=", ".join(employees.mapped("name")),
+                    error=e,
+                )
+            )
+        run.pending_employee_ids = [(3, employee.id) for employee in employees]
+        remaining = sum(
+            math.ceil(len(pending_run.pending_employee_ids) / chunk_size)
+            for pending_run in runs
+        )
+        self.env["ir.cron"]._notify_progress(done=1, remaining=remaining)
@@ -2,9 +2,15 @@
 
 import traceback
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError, ValidationError
-from odoo.tools.safe_eval import safe_eval
+from odoo.tools.safe_eval import (
+    _BUILTINS,
+    _SAFE_OPCODES,
+    check_values,
+    test_expr,
+    unsafe_eval,
+)
 
 
 class HrSalaryRule(models.Model):
@@ -199,6 +205,23 @@ class HrSalaryRule(models.Model):
         self.require_code_and_category = require
         return require
 
+    @api.model
+    @tools.ormcache("code", "mode")
+    def _get_compiled_code(self, code, mode):
+        """Code object of ``code``, checked as safe_eval does. It is cached by
+        source, so that it is shared by all the payslips computed by the worker
+        and that a rule is compiled again when its code is changed.
+        """
+        return test_expr(code, _SAFE_OPCODES, mode=mode)
+
+    @api.model
+    def _safe_eval(self, code, localdict, mode="eval", nocopy=False):
+        """Same as safe_eval, with the compiled code of the cache."""
+        globals_dict = localdict if nocopy else dict(localdict)
+        check_values(globals_dict)
+        globals_dict["__builtins__"] = dict(_BUILTINS)
+        return unsafe_eval(self._get_compiled_code(code, mode), globals_dict)
+
     # TODO should add some checks on the type of result (should be float)
     def _compute_rule(self, localdict):
         """
@@ -216,7 +239,7 @@ class HrSalaryRule(models.Model):
         try:
             return {
                 "name": self.name,
-                "quantity": float(safe_eval(self.quantity, localdict)),
+                "quantity": float(self._safe_eval(self.quantity, localdict)),
                 "rate": 100.0,
                 "amount": self.amount_fix,
             }
@@ -233,9 +256,11 @@ class HrSalaryRule(models.Model):
         try:
             return {
                 "name": self.name,
-                "quantity": float(safe_eval(self.quantity, localdict)),
+                "quantity": float(self._safe_eval(self.quantity, localdict)),
                 "rate": self.amount_percentage,
-                "amount": float(safe_eval(self.amount_percentage_base, localdict)),
+                "amount": float(
+                    self._safe_eval(self.amount_percentage_base, localdict)
+                ),
             }
         except Exception as ex:
             raise UserError(
@@ -248,7 +273,9 @@ class HrSalaryRule(models.Model):
 
     def _compute_rule_code(self, localdict):
         try:
-            safe_eval(self.amount_python_compute, localdict, mode="exec", nocopy=True)
+            self._safe_eval(
+                self.amount_python_compute, localdict, mode="exec", nocopy=True
+            )
         except Exception as ex:
             exc_text = "".join(traceback.format_exception(ex))
             raise UserError(
@@ -299,7 +326,7 @@ Here is the error received:
 
     def _satisfy_condition_range(self, localdict):
         try:
-            result = safe_eval(self.condition_range, localdict)
+            result = self._safe_eval(self.condition_range, localdict)
             return (
                 self.condition_range_min <= result <= self.condition_range_max or False
             )
@@ -314,7 +341,9 @@ Here is the error received:
 
     def _satisfy_condition_python(self, localdict):
         try:
-            safe_eval(self.condition_python, localdict, mode="exec", nocopy=True)
+            self._safe_eval(
+                self.condition_python, localdict, mode="exec", nocopy=True
+            )
         except Exception as ex:
             exc_text = "".join(traceback.format_exception(ex))
             raise UserError(
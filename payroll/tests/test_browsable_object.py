@@ -1,6 +1,15 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+from datetime import date
 
+from dateutil.relativedelta import relativedelta
+
+from odoo.addons.payroll.models.base_browsable import (
+    InputLine,
+    PayrollHistory,
+    Payslips,
+    WorkedDays,
+)
 from odoo.addons.payroll.models.hr_payslip import BaseBrowsableObject, BrowsableObject
 
 from .common import TestPayslipBase
@@ -69,3 +78,37 @@ class TestBrowsableObject(TestPayslipBase):
             350.0,
             "Updating of attribute using dot ('.') notation succeeded",
         )
+
+    def test_payroll_history(self):
+        self.apply_contract_cron()
+        date_from = date.today().replace(day=1) - relativedelta(months=1)
+        date_to = date_from + relativedelta(months=1, days=-1)
+        payslip = self.Payslip.create(
+            {
+                "employee_id": self.richard_emp.id,
+                "contract_id": self.richard_contract.id,
+                "date_from": date_from,
+                "date_to": date_to,
+            }
+        )
+        payslip.onchange_employee()
+        payslip.compute_sheet()
+        payslip.state = "done"
+        self.env.flush_all()
+
+        history = PayrollHistory(self.env, self.richard_emp.ids, date_from)
+        emp_id = self.richard_emp.id
+        for cls in (Payslips, InputLine, WorkedDays):
+            lazy = cls(emp_id, {}, self.env)
+            preloaded = cls(emp_id, {}, self.env, history)
+            for code in ("BASIC", "NET", "WORK100", "UNKNOWN"):
+                expected = lazy.sum(code, date_from, date_to)
+                with self.assertQueryCount(0):
+                    self.assertEqual(preloaded.sum(code, date_from, date_to), expected)
+        self.assertEqual(
+            Payslips(emp_id, {}, self.env, history).sum("BASIC", date_from, date_to),
+            5000.0,
+        )
+        # Sums before the preloaded period are queried
+        self.assertFalse(history.covers(emp_id, date_from - relativedelta(days=1)))
+        self.assertFalse(history.covers(self.sally.id, date_from))
@@ -0,0 +1,51 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+
+from .common import TestPayslipBase
+
+
+class TestPayslipRun(TestPayslipBase):
+    def setUp(self):
+        super().setUp()
+        self.apply_contract_cron()
+        date_start = date.today().replace(day=1)
+        self.payslip_run = self.env["hr.payslip.run"].create(
+            {
+                "name": "Payslip Batch",
+                "date_start": date_start,
+                "date_end": date_start + relativedelta(months=1, days=-1),
+            }
+        )
+        self.employees = self.richard_emp | self.sally
+
+    def test_generate_payslips(self):
+        wizard = self.env["hr.payslip.employees"].create(
+            {"employee_ids": [(6, 0, self.employees.ids)]}
+        )
+        wizard.with_context(active_id=self.payslip_run.id).compute_sheet()
+        payslips = self.payslip_run.slip_ids
+        self.assertEqual(payslips.employee_id, self.employees)
+        self.assertEqual(set(payslips.mapped("state")), {"verify"})
+        self.assertTrue(all(payslips.mapped("number")))
+        self.assertTrue(all(payslips.mapped("worked_days_line_ids")))
+        richard_payslip = payslips.filtered(
+            lambda slip: slip.employee_id == self.richard_emp
+        )
+        self.assertEqual(richard_payslip.get_salary_line_total("BASIC"), 5000.0)
+        self.assertEqual(richard_payslip.line_ids.slip_id, richard_payslip)
+
+    def test_generate_payslips_background(self):
+        self.payslip_run._enqueue_payslips(self.employees)
+        self.assertEqual(self.payslip_run.pending_employee_ids, self.employees)
+        self.assertEqual(self.payslip_run.generation_progress, 0.0)
+        # One chunk of employees by run of the cron
+        self.env["hr.payslip.run"]._cron_generate_payslips(chunk_size=1)
+        self.assertEqual(len(self.payslip_run.slip_ids), 1)
+        self.assertEqual(self.payslip_run.generation_progress, 50.0)
+        self.env["hr.payslip.run"]._cron_generate_payslips(chunk_size=1)
+        self.assertEqual(self.payslip_run.slip_ids.employee_id, self.employees)
+        self.assertFalse(self.payslip_run.pending_employee_ids)
+        self.assertEqual(self.payslip_run.generation_progress, 100.0)
@@ -3,6 +3,8 @@
 import time
 from datetime import date, datetime
 
+from dateutil.relativedelta import relativedelta
+
 from odoo.tests import Form
 
 from .common import TestPayslipBase
@@ -145,3 +147,22 @@ class TestWorkedDays(TestPayslipBase):
             8.0,
             "The hours worked value is a POSITIVE number",
         )
+
+    def test_worked_days_batch(self):
+        self._common_contract_leave_setup()
+        contracts = self.richard_emp.contract_ids | self.sally.contract_ids
+        date_from = date.today().replace(day=1)
+        date_to = date_from + relativedelta(months=1, days=-1)
+
+        worked_days = self.Payslip._get_worked_day_lines_batch(
+            contracts, date_from, date_to
+        )
+        for contract in contracts.filtered("resource_calendar_id"):
+            self.assertEqual(
+                worked_days[contract.id],
+                list(self.Payslip.get_worked_day_lines(contract, date_from, date_to)),
+            )
+        richard_codes = [
+            line["code"] for line in worked_days[self.richard_emp.contract_id.id]
+        ]
+        self.assertEqual(richard_codes, ["GLOBAL", "WORK100"])
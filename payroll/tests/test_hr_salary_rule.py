@@ -1,5 +1,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+from odoo.exceptions import UserError
+
 from .common import TestPayslipBase
 
 
@@ -200,3 +202,30 @@ class TestSalaryRule(TestPayslipBase):
             lambda record: record.name == "rule without category"
         )
         self.assertEqual(len(line), 1, "Line found: rule without category")
+
+    def test_python_code_cache(self):
+        self.test_rule.amount_python_compute = "result = contract.wage / 10"
+        cc = self.env["hr.contract"].search([("employee_id", "=", self.richard_emp.id)])
+        cc.kanban_state = "done"
+        self.env.ref(
+            "hr_contract.ir_cron_data_contract_update_state"
+        ).method_direct_trigger()
+
+        payslip = self.Payslip.create({"employee_id": self.richard_emp.id})
+        payslip.onchange_employee()
+        payslip.compute_sheet()
+        self.assertEqual(payslip.get_salary_line_total("TEST"), 500.0)
+        self.assertIs(
+            self.Rule._get_compiled_code("result = contract.wage / 10", "exec"),
+            self.Rule._get_compiled_code("result = contract.wage / 10", "exec"),
+        )
+
+        # The new code of the rule is used
+        self.test_rule.amount_python_compute = "result = contract.wage / 5"
+        payslip.compute_sheet()
+        self.assertEqual(payslip.get_salary_line_total("TEST"), 1000.0)
+
+        # The code is checked as by safe_eval
+        self.test_rule.amount_python_compute = "import os\nresult = 0"
+        with self.assertRaises(UserError):
+            payslip.compute_sheet()
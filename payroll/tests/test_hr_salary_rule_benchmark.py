@@ -0,0 +1,54 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import time
+from unittest.mock import patch
+
+from odoo.tests import tagged
+from odoo.tools.safe_eval import _SAFE_OPCODES, test_expr
+
+from .common import TestPayslipBase
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged("-standard", "payroll_benchmark")
+class TestSalaryRuleBenchmark(TestPayslipBase):
+    """Rule evaluation time per payslip with and without the cache of the
+    compiled code of the rules, run with ``--test-tags payroll_benchmark``.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.apply_contract_cron()
+        self.payslips = self.Payslip.create(
+            [
+                {"employee_id": employee.id, "contract_id": employee.contract_id.id}
+                for employee in (self.richard_emp | self.sally)
+            ]
+        )
+        self.payslips.onchange_employee()
+
+    def _time_rules(self, rounds=50):
+        start = time.perf_counter()
+        for _i in range(rounds):
+            for payslip in self.payslips:
+                payslip.get_lines_dict()
+        return (time.perf_counter() - start) / (rounds * len(self.payslips))
+
+    def test_rule_evaluation_time(self):
+        # compile the code of the rules before timing
+        self._time_rules(rounds=1)
+        cached = self._time_rules()
+        with patch.object(
+            type(self.env["hr.salary.rule"]),
+            "_get_compiled_code",
+            lambda self, code, mode: test_expr(code, _SAFE_OPCODES, mode=mode),
+        ):
+            uncached = self._time_rules()
+        _logger.info(
+            "Rule evaluation per payslip: %.3f ms with the code cache, "
+            "%.3f ms without it",
+            cached * 1000,
+            uncached * 1000,
+        )
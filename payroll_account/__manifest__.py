@@ -8,7 +8,7 @@
     "summary": "Manage your payroll to accounting",
     "author": "Odoo SA, Odoo Community Association (OCA)",
     "depends": ["payroll", "account"],
-    "data": ["views/hr_payroll_account_views.xml"],
+    "data": ["data/ir_cron_data.xml", "views/hr_payroll_account_views.xml"],
     "demo": ["demo/hr_payroll_account_demo.xml"],
     "maintainers": ["appstogrow", "nimarosa"],
 }
@@ -34,109 +34,163 @@ class HrPayslip(models.Model):
         return res
 
     def action_payslip_cancel(self):
-        for payslip in self:
-            if not payslip.move_id.journal_id.restrict_mode_hash_table:
-                payslip.move_id.with_context(force_delete=True).button_cancel()
-                payslip.move_id.with_context(force_delete=True).unlink()
+        # A consolidated entry is shared by the payslips of a batch, it can only be
+        # removed with all of them
+        other_slips = self.search(
+            [("move_id", "in", self.move_id.ids), ("id", "not in", self.ids)]
+        )
+        if other_slips:
+            raise UserError(
+                _(
+                    "The accounting entry %(move)s is shared with the payslips "
+                    "%(slips)s, which must be cancelled together."
+                )
+                % {
+                    "move": ", ".join(other_slips.move_id.mapped("display_name")),
+                    "slips": ", ".join(other_slips.mapped("display_name")),
+                }
+            )
+        for move in self.move_id:
+            if not move.journal_id.restrict_mode_hash_table:
+                move.with_context(force_delete=True).button_cancel()
+                move.with_context(force_delete=True).unlink()
             else:
-                payslip.move_id._reverse_moves()
-                payslip.move_id = False
+                move._reverse_moves()
+                self.filtered(lambda slip, move=move: slip.move_id == move).write(
+                    {"move_id": False}
+                )
         return super().action_payslip_cancel()
 
     def action_payslip_done(self):
         res = super().action_payslip_done()
+        self._create_account_moves()
+        return res
 
-        for slip in self:
-            line_ids = []
-            debit_sum = 0.0
-            credit_sum = 0.0
-            date = slip.date or slip.date_to
-            currency = (
-                slip.company_id.currency_id or slip.journal_id.company_id.currency_id
-            )
+    def _prepare_move_line_vals(self):
+        """Lines of the accounting entry of the payslip, balanced with an
+        adjustment line on the default account of the journal if needed.
+        """
+        self.ensure_one()
+        slip = self
+        line_ids = []
+        debit_sum = 0.0
+        credit_sum = 0.0
+        date = slip.date or slip.date_to
+        currency = slip.company_id.currency_id or slip.journal_id.company_id.currency_id
+        for line in slip.line_ids:
+            amount = currency.round(slip.credit_note and -line.total or line.total)
+            if currency.is_zero(amount):
+                continue
+            debit_account_id = line.salary_rule_id.account_debit.id
+            credit_account_id = line.salary_rule_id.account_credit.id
 
-            name = _("Payslip of %s") % (slip.employee_id.name)
-            move_dict = {
-                "narration": name,
-                "ref": slip.number,
-                "journal_id": slip.journal_id.id,
-                "date": date,
-            }
-            for line in slip.line_ids:
-                amount = currency.round(slip.credit_note and -line.total or line.total)
-                if currency.is_zero(amount):
-                    continue
-                debit_account_id = line.salary_rule_id.account_debit.id
-                credit_account_id = line.salary_rule_id.account_credit.id
+            move_line_analytic_ids = {}
+            if slip.contract_id.analytic_account_id:
+                move_line_analytic_ids.update(
+                    {line.slip_id.contract_id.analytic_account_id.id: 100}
+                )
+            elif line.salary_rule_id.analytic_account_id:
+                move_line_analytic_ids.update(
+                    {line.salary_rule_id.analytic_account_id.id: 100}
+                )
 
-                move_line_analytic_ids = {}
-                if slip.contract_id.analytic_account_id:
-                    move_line_analytic_ids.update(
-                        {line.slip_id.contract_id.analytic_account_id.id: 100}
-                    )
-                elif line.salary_rule_id.analytic_account_id:
-                    move_line_analytic_ids.update(
-                        {line.salary_rule_id.analytic_account_id.id: 100}
-                    )
+            if debit_account_id:
+                debit_line = self._prepare_debit_line(
+                    line, amount, date, debit_account_id, move_line_analytic_ids
+                )
+                line_ids.append((0, 0, debit_line))
+                debit_sum += debit_line["debit"] - debit_line["credit"]
 
-                if debit_account_id:
-                    debit_line = self._prepare_debit_line(
-                        line, amount, date, debit_account_id, move_line_analytic_ids
-                    )
-                    line_ids.append((0, 0, debit_line))
-                    debit_sum += debit_line["debit"] - debit_line["credit"]
-
-                if credit_account_id:
-                    credit_line = self._prepare_credit_line(
-                        line,
-                        amount,
-                        date,
-                        credit_account_id,
-                        move_line_analytic_ids,
-                    )
-                    line_ids.append((0, 0, credit_line))
-                    credit_sum += credit_line["credit"] - credit_line["debit"]
-
-            if currency.compare_amounts(credit_sum, debit_sum) == -1:
-                acc_id = slip.journal_id.default_account_id.id
-                if not acc_id:
-                    raise UserError(
-                        _(
-                            'The Expense Journal "%s" has not properly '
-                            "configured the Credit Account!"
-                        )
-                        % (slip.journal_id.name)
+            if credit_account_id:
+                credit_line = self._prepare_credit_line(
+                    line,
+                    amount,
+                    date,
+                    credit_account_id,
+                    move_line_analytic_ids,
+                )
+                line_ids.append((0, 0, credit_line))
+                credit_sum += credit_line["credit"] - credit_line["debit"]
+
+        if currency.compare_amounts(credit_sum, debit_sum) == -1:
+            acc_id = slip.journal_id.default_account_id.id
+            if not acc_id:
+                raise UserError(
+                    _(
+                        'The Expense Journal "%s" has not properly '
+                        "configured the Credit Account!"
                     )
-                adjust_credit = self._prepare_adjust_credit_line(
-                    currency, credit_sum, debit_sum, slip.journal_id, date
+                    % (slip.journal_id.name)
                 )
-                line_ids.append([0, 0, adjust_credit])
-
-            elif currency.compare_amounts(debit_sum, credit_sum) == -1:
-                acc_id = slip.journal_id.default_account_id.id
-                if not acc_id:
-                    raise UserError(
-                        _(
-                            'The Expense Journal "%s" has not properly '
-                            "configured the Debit Account!"
-                        )
-                        % (slip.journal_id.name)
+            adjust_credit = self._prepare_adjust_credit_line(
+                currency, credit_sum, debit_sum, slip.journal_id, date
+            )
+            line_ids.append([0, 0, adjust_credit])
+
+        elif currency.compare_amounts(debit_sum, credit_sum) == -1:
+            acc_id = slip.journal_id.default_account_id.id
+            if not acc_id:
+                raise UserError(
+                    _(
+                        'The Expense Journal "%s" has not properly '
+                        "configured the Debit Account!"
                     )
-                adjust_debit = self._prepare_adjust_debit_line(
-                    currency, credit_sum, debit_sum, slip.journal_id, date
+                    % (slip.journal_id.name)
                 )
-                line_ids.append([0, 0, adjust_debit])
+            adjust_debit = self._prepare_adjust_debit_line(
+                currency, credit_sum, debit_sum, slip.journal_id, date
+            )
+            line_ids.append([0, 0, adjust_debit])
+        return line_ids
 
-            if len(line_ids) > 0:
-                move_dict["line_ids"] = line_ids
-                move = self.env["account.move"].create(move_dict)
-                slip.write({"move_id": move.id, "date": date})
-                move.action_post()
-            else:
+    def _create_account_moves(self):
+        """Create and post the accounting entries of the payslips together.
+
+        The payslips of a batch consolidating its entries share one entry by
+        journal and date, with the lines of each employee and their partner,
+        the other ones get an entry each.
+        """
+        move_vals_list = []
+        move_slips = []
+        consolidated = {}
+        for slip in self:
+            line_ids = slip._prepare_move_line_vals()
+            if not line_ids:
                 logger.info(
                     f"Payslip {slip.number} did not generate any account move lines"
                 )
-        return res
+                continue
+            date = slip.date or slip.date_to
+            payslip_run = slip.payslip_run_id
+            if payslip_run.move_consolidation:
+                key = (payslip_run, slip.journal_id, date)
+                if key in consolidated:
+                    index = consolidated[key]
+                    move_vals_list[index]["line_ids"] += line_ids
+                    move_slips[index] |= slip
+                    continue
+                consolidated[key] = len(move_vals_list)
+                move_vals = {
+                    "narration": _("Payslips of %s") % (payslip_run.name),
+                    "ref": payslip_run.name,
+                }
+            else:
+                move_vals = {
+                    "narration": _("Payslip of %s") % (slip.employee_id.name),
+                    "ref": slip.number,
+                }
+            move_vals.update(
+                {"journal_id": slip.journal_id.id, "date": date, "line_ids": line_ids}
+            )
+            move_vals_list.append(move_vals)
+            move_slips.append(slip)
+        if not move_vals_list:
+            return self.env["account.move"]
+        moves = self.env["account.move"].create(move_vals_list)
+        for move, slips in zip(moves, move_slips, strict=True):
+            slips.write({"move_id": move.id, "date": move.date})
+        moves.action_post()
+        return moves
 
     def _prepare_debit_line(
         self, line, amount, date, debit_account_id, move_line_analytic_ids
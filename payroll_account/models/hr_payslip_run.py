@@ -1,7 +1,13 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+import logging
+import math
 
-from odoo import fields, models
+from odoo import _, api, fields, models
+
+from odoo.addons.payroll.models.hr_payslip_run import PAYSLIP_CHUNK_SIZE
+
+_logger = logging.getLogger(__name__)
 
 
 class HrPayslipRun(models.Model):
@@ -15,3 +21,66 @@ class HrPayslipRun(models.Model):
             [("type", "=", "general")], limit=1
         ),
     )
+    move_consolidation = fields.Boolean(
+        "Consolidate Entries",
+        help="Post one accounting entry by journal and date for the payslips "
+        "confirmed together, with the lines of each employee, instead of one "
+        "entry by payslip.",
+    )
+    confirm_pending = fields.Boolean(
+        readonly=True,
+        copy=False,
+        help="The payslips are being confirmed in background.",
+    )
+
+    def _generate_payslips(self, employees):
+        self = self.with_context(default_journal_id=self.journal_id.id)
+        return super()._generate_payslips(employees)
+
+    def _get_payslips_to_confirm(self):
+        return self.slip_ids.filtered(lambda slip: slip.state in ("draft", "verify"))
+
+    def action_confirm_payslips(self):
+        """Confirm the payslips of the batches and post their entries, in
+        background when there are more than a chunk of them.
+        """
+        for run in self:
+            payslips = run._get_payslips_to_confirm()
+            if len(payslips) > PAYSLIP_CHUNK_SIZE:
+                run.confirm_pending = True
+                self.env.ref("payroll_account.ir_cron_payslip_run_confirm")._trigger()
+            else:
+                payslips.action_payslip_done()
+        return True
+
+    @api.model
+    def _cron_confirm_payslips(self, chunk_size=PAYSLIP_CHUNK_SIZE):
+        """Confirm the next chunk of payslips of the batches being confirmed. The
+        chunks are committed one by one, the confirmation resumes from the
+        payslips not done yet when it is interrupted.
+        """
+        runs = self.search([("confirm_pending", "=", True)], order="id")
+        if not runs:
+            return
+        run = runs[0]
+        payslips = run._get_payslips_to_confirm()[:chunk_size]
+        try:
+            with self.env.cr.savepoint():
+                payslips.action_payslip_done()
+        except Exception as e:
+            _logger.exception("Error while confirming the payslips of %s", run.name)
+            run.message_post(
+                body=_(
+                    "The payslips %(payslips)s could not be confirmed: %(error)s",
+                    payslips=", ".join(payslips.mapped("name")),
+                    error=e,
+                )
+            )
+            run.confirm_pending = False
+        if not run._get_payslips_to_confirm():
+            run.confirm_pending = False
+        remaining = sum(
+            math.ceil(len(pending_run._get_payslips_to_confirm()) / chunk_size)
+            for pending_run in runs.filtered("confirm_pending")
+        )
+        self.env["ir.cron"]._notify_progress(done=1, remaining=remaining)
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from dateutil import relativedelta
 
 from odoo import fields
+from odoo.exceptions import UserError
 from odoo.tests import common
 
 
@@ -183,3 +184,60 @@ class TestPayrollAccount(common.TransactionCase):
 
         # I verify that the payslip is in done state.
         self.assertEqual(self.hr_payslip.state, "done", "State not changed!")
+
+    def _prepare_payslip_run(self, move_consolidation):
+        self._update_account_in_rule(self.account_debit, self.account_credit)
+        employee_jane = self.env["hr.employee"].create({"name": "Jane"})
+        self.hr_contract_john.copy(
+            {"employee_id": employee_jane.id, "name": "Contract for Jane"}
+        ).state = "open"
+        self.hr_contract_john.state = "open"
+        payslip_run = self.env["hr.payslip.run"].create(
+            {
+                "name": "Payslip Batch",
+                "journal_id": self.account_journal.id,
+                "move_consolidation": move_consolidation,
+            }
+        )
+        payslip_run._generate_payslips(self.hr_employee_john | employee_jane)
+        self.assertEqual(len(payslip_run.slip_ids), 2)
+        return payslip_run
+
+    def test_payslip_run_consolidated_move(self):
+        payslip_run = self._prepare_payslip_run(move_consolidation=True)
+        payslip_run.action_confirm_payslips()
+        payslips = payslip_run.slip_ids
+        self.assertEqual(set(payslips.mapped("state")), {"done"})
+        self.assertEqual(len(payslips.move_id), 1, "One entry for the batch")
+        self.assertEqual(payslips.move_id.state, "posted")
+        self.assertEqual(payslips.move_id.ref, payslip_run.name)
+
+    def test_payslip_run_confirm_background(self):
+        payslip_run = self._prepare_payslip_run(move_consolidation=False)
+        payslip_run.confirm_pending = True
+        # One payslip by run of the cron
+        self.env["hr.payslip.run"]._cron_confirm_payslips(chunk_size=1)
+        self.assertEqual(payslip_run.slip_ids.mapped("state").count("done"), 1)
+        self.assertTrue(payslip_run.confirm_pending)
+        self.env["hr.payslip.run"]._cron_confirm_payslips(chunk_size=1)
+        self.assertEqual(set(payslip_run.slip_ids.mapped("state")), {"done"})
+        self.assertFalse(payslip_run.confirm_pending)
+        self.assertEqual(len(payslip_run.slip_ids.move_id), 2)
+
+    def test_payslip_run_consolidated_move_cancel(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "payroll.allow_cancel_payslips", True
+        )
+        payslip_run = self._prepare_payslip_run(move_consolidation=True)
+        payslip_run.action_confirm_payslips()
+        payslips = payslip_run.slip_ids
+        move = payslips.move_id
+        # The entry of the batch is shared, one payslip cannot be cancelled alone
+        with self.assertRaises(UserError):
+            payslips[0].action_payslip_cancel()
+        self.assertEqual(move.state, "posted")
+        self.assertEqual(payslips.move_id, move)
+        payslips.action_payslip_cancel()
+        self.assertEqual(set(payslips.mapped("state")), {"cancel"})
+        self.assertFalse(payslips.move_id)
+        self.assertFalse(move.exists())
@@ -196,17 +196,16 @@ class HrPayslip(models.Model):
         if normal_slips:
             res = super(HrPayslip, normal_slips).action_payslip_done()
 
-        for slip in factura_slips:
-            if (
-                not self.env.context.get("without_compute_sheet")
-                and not slip.prevent_compute_on_confirm
-            ):
-                slip.compute_sheet()
-            if not slip.number:
+        if factura_slips:
+            if not self.env.context.get("without_compute_sheet"):
+                factura_slips.filtered(
+                    lambda slip: not slip.prevent_compute_on_confirm
+                ).compute_sheet()
+            for slip in factura_slips.filtered(lambda slip: not slip.number):
                 slip.number = self.env["ir.sequence"].next_by_code("salary.slip")
-            slip.write({"state": "done"})
-            slip._create_vendor_bill()
-            slip._create_factura_provision_move()
+            factura_slips.write({"state": "done"})
+            factura_slips._create_vendor_bills()
+            factura_slips._create_factura_provision_moves()
 
         return res
 
@@ -272,10 +271,33 @@ class HrPayslip(models.Model):
 
     def _create_factura_provision_move(self):
         self.ensure_one()
-        if self.py_payment_scheme != "factura_proveedor":
-            return False
         if self.py_provision_move_id:
             return self.py_provision_move_id
+        return self._create_factura_provision_moves()
+
+    def _create_factura_provision_moves(self):
+        """Create and post the provision entries of the payslips together."""
+        slips = self.filtered(
+            lambda slip: slip.py_payment_scheme == "factura_proveedor"
+            and not slip.py_provision_move_id
+        )
+        move_vals_list = []
+        move_slips = self.browse()
+        for slip in slips:
+            move_vals = slip._prepare_factura_provision_move_vals()
+            if move_vals:
+                move_vals_list.append(move_vals)
+                move_slips |= slip
+        if not move_vals_list:
+            return self.env["account.move"]
+        moves = self.env["account.move"].create(move_vals_list)
+        moves.action_post()
+        for slip, move in zip(move_slips, moves, strict=True):
+            slip.py_provision_move_id = move.id
+        return moves
+
+    def _prepare_factura_provision_move_vals(self):
+        self.ensure_one()
 
         provision_lines = self._get_factura_provision_lines()
         if not provision_lines:
@@ -351,18 +373,13 @@ class HrPayslip(models.Model):
                 (0, 0, self._prepare_adjust_debit_line(currency, credit_sum, debit_sum, self.journal_id, date))
             )
 
-        move = self.env["account.move"].create(
-            {
-                "ref": "%s/PROV" % (self.number or self.name),
-                "date": date,
-                "journal_id": self.journal_id.id,
-                "narration": _("Provision aguinaldo de %(slip)s") % {"slip": self.display_name},
-                "line_ids": line_ids,
-            }
-        )
-        move.action_post()
-        self.py_provision_move_id = move.id
-        return move
+        return {
+            "ref": "%s/PROV" % (self.number or self.name),
+            "date": date,
+            "journal_id": self.journal_id.id,
+            "narration": _("Provision aguinaldo de %(slip)s") % {"slip": self.display_name},
+            "line_ids": line_ids,
+        }
 
     def _cancel_factura_provision_move(self):
         self.ensure_one()
@@ -391,7 +408,23 @@ class HrPayslip(models.Model):
         self.ensure_one()
         if self.vendor_bill_id:
             return self.vendor_bill_id
+        return self._create_vendor_bills()
+
+    def _create_vendor_bills(self):
+        """Create together the vendor bills of the payslips without one."""
+        slips = self.filtered(lambda slip: not slip.vendor_bill_id)
+        if not slips:
+            return self.env["account.move"]
+        bills = self.env["account.move"].create(
+            [slip._prepare_vendor_bill_vals() for slip in slips]
+        )
+        for slip, bill in zip(slips, bills, strict=True):
+            slip._apply_vendor_payable_account(bill)
+            slip.vendor_bill_id = bill.id
+        return bills
 
+    def _prepare_vendor_bill_vals(self):
+        self.ensure_one()
         contract = self.contract_id
         product = self._validate_vendor_bill_config(contract)
         vendor = contract.py_vendor_partner_id
@@ -409,7 +442,7 @@ class HrPayslip(models.Model):
 
         expense_account = self._get_vendor_bill_expense_account(product)
 
-        bill_vals = {
+        return {
             "move_type": "in_invoice",
             "partner_id": vendor.id,
             "journal_id": (
@@ -435,10 +468,6 @@ class HrPayslip(models.Model):
                 )
             ],
         }
-        bill = self.env["account.move"].create(bill_vals)
-        self._apply_vendor_payable_account(bill)
-        self.vendor_bill_id = bill.id
-        return bill
 
     def _get_vendor_bill_expense_account(self, product):
         """Prefer the expense account configured on payroll salary rules.
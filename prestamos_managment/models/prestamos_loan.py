@@ -1,4 +1,9 @@
 import calendar
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
 
 from dateutil.relativedelta import relativedelta
 
@@ -6,6 +11,10 @@ from odoo import Command, api, fields, models
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools.float_utils import float_compare
 
+_logger = logging.getLogger(__name__)
+
+RECLASSIFICATION_BATCH_SIZE = 100
+
 
 class PrestamosLoan(models.Model):
     _name = "prestamos.loan"
@@ -502,13 +511,12 @@ class PrestamosLoan(models.Model):
         return super().write(vals)
 
     def action_recompute_schedule(self):
-        for loan in self:
-            if loan.state != "draft":
-                raise UserError(
-                    "Solo se puede regenerar el plan de amortizacion en borrador."
-                )
-            loan._sync_german_interest_amount()
-            loan._create_schedule_lines()
+        if self.filtered(lambda loan: loan.state != "draft"):
+            raise UserError(
+                "Solo se puede regenerar el plan de amortizacion en borrador."
+            )
+        # El interes del sistema aleman se sincroniza al crear el plan
+        self._create_schedule_lines()
         return True
 
     def action_confirm(self):
@@ -631,38 +639,67 @@ class PrestamosLoan(models.Model):
             )
 
     def _create_schedule_lines(self):
-        self.ensure_one()
         self.schedule_line_ids.unlink()
-        due_dates = self._compute_due_dates()
-        capital_parts, interest_parts = self._compute_schedule_amounts()
-        if self.amortization_system == "aleman":
-            self.interest_amount = self.currency_id.round(sum(interest_parts))
         term_base_date = fields.Date.context_today(self)
-        commands = []
-        for sequence, (due_date, capital, interest) in enumerate(
-            zip(due_dates, capital_parts, interest_parts), start=1
-        ):
-            term_class = self._get_term_class(due_date, term_base_date)
-            commands.append(
-                Command.create(
+        vals_list = []
+        for loan, schedule in self._get_schedules().items():
+            if loan.amortization_system == "aleman":
+                loan.interest_amount = loan.currency_id.round(
+                    sum(values["interest_amount"] for values in schedule)
+                )
+            for values in schedule:
+                term_class = loan._get_term_class(values["due_date"], term_base_date)
+                vals_list.append(
                     {
-                        "sequence": sequence,
-                        "due_date": due_date,
-                        "capital_amount": capital,
-                        "interest_amount": interest,
+                        **values,
+                        "loan_id": loan.id,
                         "capital_term": term_class,
                         "interest_term": term_class,
-                        "capital_account_id": self._get_component_account(
+                        "capital_account_id": loan._get_component_account(
                             "capital", term_class
                         ).id,
-                        "interest_account_id": self._get_component_account(
+                        "interest_account_id": loan._get_component_account(
                             "interest", term_class
                         ).id,
-                        "payment_id": self.payment_id.id if self.payment_id else False,
+                        "payment_id": loan.payment_id.id if loan.payment_id else False,
                     }
                 )
+        self.env["prestamos.loan.line"].create(vals_list)
+
+    def _get_schedules(self):
+        """Devuelve el plan de amortizacion de cada prestamo, sin crear las lineas.
+
+        Tambien funciona con registros nuevos (``new``), ver ``simulate_schedules``.
+        """
+        return {loan: loan._compute_schedule() for loan in self}
+
+    @api.model
+    def simulate_schedules(self, values_list):
+        """Simulacion: devuelve el plan de amortizacion de cada diccionario de
+        valores de prestamo, completado con los valores por defecto, sin escribir
+        nada en la base de datos.
+        """
+        defaults = self.default_get(list(self._fields))
+        return [
+            self.new({**defaults, **values})._compute_schedule()
+            for values in values_list
+        ]
+
+    def _compute_schedule(self):
+        self.ensure_one()
+        due_dates = self._compute_due_dates()
+        capital_parts, interest_parts = self._compute_schedule_amounts(due_dates)
+        return [
+            {
+                "sequence": sequence,
+                "due_date": due_date,
+                "capital_amount": capital,
+                "interest_amount": interest,
+            }
+            for sequence, (due_date, capital, interest) in enumerate(
+                zip(due_dates, capital_parts, interest_parts), start=1
             )
-        self.schedule_line_ids = commands
+        ]
 
     def _compute_due_dates(self):
         self.ensure_one()
@@ -697,12 +734,12 @@ class PrestamosLoan(models.Model):
             "annual": 12,
         }.get(self.installment_frequency, 1)
 
-    def _compute_schedule_amounts(self):
+    def _compute_schedule_amounts(self, due_dates=None):
         self.ensure_one()
         if self.amortization_system == "frances":
             return self._compute_french_amounts()
         if self.amortization_system == "aleman":
-            return self._compute_german_amounts()
+            return self._compute_german_amounts(due_dates)
         if self.amortization_system == "americano":
             return self._compute_american_amounts()
         return self._compute_linear_amounts()
@@ -715,25 +752,33 @@ class PrestamosLoan(models.Model):
         periods = self.installment_count
         if currency.is_zero(interest_total):
             return self._split_evenly(principal, periods), [0.0] * periods
+        if currency.is_zero(principal):
+            # Sin capital no hay tasa: el interes queda en la ultima cuota
+            interest_parts = [0.0] * periods
+            if interest_parts:
+                interest_parts[-1] = currency.round(interest_total)
+            return self._split_evenly(principal, periods), interest_parts
 
         monthly_rate = self._solve_french_monthly_rate(principal, interest_total, periods)
         payment = principal * monthly_rate / (1 - (1 + monthly_rate) ** -periods)
         balance = principal
+        capital_sum = interest_sum = 0.0
         capital_parts = []
         interest_parts = []
-        for index in range(periods):
-            if index == periods - 1:
-                capital = currency.round(principal - sum(capital_parts))
-                interest = currency.round(interest_total - sum(interest_parts))
-            else:
-                interest = currency.round(balance * monthly_rate)
-                capital = currency.round(payment - interest)
-                balance -= capital
+        for _index in range(periods - 1):
+            interest = currency.round(balance * monthly_rate)
+            capital = currency.round(payment - interest)
+            balance -= capital
+            capital_sum += capital
+            interest_sum += interest
             capital_parts.append(capital)
             interest_parts.append(interest)
+        # La ultima cuota absorbe las diferencias de redondeo
+        capital_parts.append(currency.round(principal - capital_sum))
+        interest_parts.append(currency.round(interest_total - interest_sum))
         return capital_parts, interest_parts
 
-    def _compute_german_amounts(self):
+    def _compute_german_amounts(self, due_dates=None):
         self.ensure_one()
         currency = self.currency_id
         periods = self.installment_count
@@ -758,7 +803,7 @@ class PrestamosLoan(models.Model):
         ):
             return capital_parts, [0.0] * periods
         rate = self.interest_rate / 100.0
-        due_dates = self._compute_due_dates()
+        due_dates = due_dates or self._compute_due_dates()
         previous_date = fields.Date.to_date(self.loan_date)
         interest_parts = []
         for balance, due_date in zip(balances, due_dates):
@@ -806,21 +851,29 @@ class PrestamosLoan(models.Model):
         return values
 
     def _solve_french_monthly_rate(self, principal, target_interest, periods):
-        def total_interest(rate):
-            payment = principal * rate / (1 - (1 + rate) ** -periods)
-            return payment * periods - principal
+        """Tasa por cuota cuyo interes total del sistema frances es
+        ``target_interest``, por el metodo de Newton.
 
-        low = 0.0
-        high = 0.01
-        while total_interest(high) < target_interest and high < 100:
-            high *= 2
+        La cuota por unidad de capital es creciente y convexa en la tasa, y mayor o
+        igual a su tangente en cero: partiendo de la tasa donde esa tangente alcanza
+        el objetivo, Newton converge por la derecha sin oscilar.
+        """
+        if periods == 1:
+            return target_interest / principal
+        target = (1 + target_interest / principal) / periods
+        rate = 2 * target_interest / (principal * (periods + 1))
         for _iteration in range(100):
-            mid = (low + high) / 2
-            if total_interest(mid) < target_interest:
-                low = mid
-            else:
-                high = mid
-        return high
+            # 1 - (1 + rate) ** -periods, preciso para tasas chicas
+            discount = -math.expm1(-periods * math.log1p(rate))
+            payment = rate / discount
+            derivative = (
+                discount - rate * periods * (1 + rate) ** (-periods - 1)
+            ) / discount**2
+            step = (payment - target) / derivative
+            rate -= step
+            if step <= rate * 1e-15:
+                break
+        return rate
 
     def _get_term_class(self, due_date, base_date):
         threshold = fields.Date.to_date(base_date) + relativedelta(months=12)
@@ -1089,51 +1142,140 @@ class PrestamosLoan(models.Model):
         return payment
 
     @api.model
-    def _cron_reclassify_short_term_lines(self):
-        loans = self.search([("state", "=", "confirmed")])
+    def _cron_reclassify_short_term_lines(self, batch_size=RECLASSIFICATION_BATCH_SIZE):
         today = fields.Date.context_today(self)
         threshold = today + relativedelta(months=12)
-        for loan in loans:
+        loans = self.search([("state", "=", "confirmed")])
+        batch_loans = loans.filtered("company_id.loan_batch_reclassification")
+        for loan in loans - batch_loans:
             due_lines = loan.schedule_line_ids.filtered(
                 lambda line: line.state == "pending" and line.due_date < threshold
             )
             loan._reclassify_lines_to_short_term(due_lines, today)
+        if batch_loans:
+            batch_loans._reclassify_short_term_lines_batch(today, threshold, batch_size)
         return True
 
+    def _reclassify_short_term_lines_batch(self, move_date, threshold, batch_size):
+        """Reclasifica las cuotas de los prestamos con un asiento por prestamo,
+        confirmando la transaccion cada ``batch_size`` prestamos.
+
+        Solo se buscan las cuotas que siguen a largo plazo, por lo que una
+        ejecucion interrumpida continua donde quedo.
+        """
+        start = time.perf_counter()
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        schedule_lines = self.env["prestamos.loan.line"].search(
+            [
+                ("loan_id", "in", self.ids),
+                ("state", "=", "pending"),
+                ("due_date", "<", threshold),
+                "|",
+                ("capital_term", "=", "long"),
+                ("interest_term", "=", "long"),
+            ]
+        )
+        lines_by_loan = schedule_lines.grouped("loan_id")
+        loans = self.filtered(lambda loan: loan in lines_by_loan)
+        move_count = line_count = failed_count = 0
+        for index in range(0, len(loans), batch_size):
+            batch = loans[index : index + batch_size]
+            try:
+                with self.env.cr.savepoint():
+                    moves, reclassified = batch._reclassify_lines_to_short_term_batch(
+                        lines_by_loan, move_date
+                    )
+            except Exception:
+                _logger.exception(
+                    "Prestamos: error al reclasificar los prestamos %s", batch.ids
+                )
+                failed_count += len(batch)
+                continue
+            move_count += len(moves)
+            line_count += len(reclassified)
+            if auto_commit:
+                self.env.cr.commit()
+        _logger.info(
+            "Prestamos: %s cuotas de %s prestamos reclasificadas a corto plazo en %s "
+            "asientos (%s prestamos con error) en %.2fs",
+            line_count,
+            len(loans) - failed_count,
+            move_count,
+            failed_count,
+            time.perf_counter() - start,
+        )
+
+    def _reclassify_lines_to_short_term_batch(self, lines_by_loan, move_date):
+        move_vals_list = []
+        loan_reclassifications = []
+        for loan in self:
+            line_vals = []
+            reclassifications = []
+            for schedule in lines_by_loan[loan]:
+                (
+                    schedule_line_vals,
+                    capital_reclassified,
+                    interest_reclassified,
+                ) = loan._prepare_schedule_reclassification(schedule)
+                if schedule_line_vals:
+                    line_vals += schedule_line_vals
+                    reclassifications.append(
+                        (schedule, capital_reclassified, interest_reclassified)
+                    )
+            if not line_vals:
+                continue
+            move_vals_list.append(
+                {
+                    "move_type": "entry",
+                    "date": move_date,
+                    "journal_id": loan.journal_id.id,
+                    "ref": "%s - Reclasificacion a corto plazo" % loan.name,
+                    "company_id": loan.company_id.id,
+                    "line_ids": [Command.create(vals) for vals in line_vals],
+                }
+            )
+            loan_reclassifications.append((loan, reclassifications))
+        moves = self.env["account.move"].create(move_vals_list)
+        moves.action_post()
+        reconciliation_plan = []
+        lines_by_updates = defaultdict(lambda: self.env["prestamos.loan.line"])
+        for move, (loan, reclassifications) in zip(moves, loan_reclassifications):
+            debit_lines = move.line_ids.filtered("debit").grouped(
+                lambda line: (line.prestamos_schedule_line_id, line.account_id)
+            )
+            for schedule, capital_reclassified, interest_reclassified in reclassifications:
+                origin_lines = []
+                if capital_reclassified:
+                    origin_lines.append(schedule.capital_move_line_id)
+                if interest_reclassified:
+                    origin_lines.append(schedule.interest_move_line_id)
+                for origin_line in origin_lines:
+                    if origin_line.account_id.reconcile and not origin_line.reconciled:
+                        lines = origin_line | debit_lines.get(
+                            (schedule, origin_line.account_id),
+                            self.env["account.move.line"],
+                        )
+                        if len(lines) > 1:
+                            reconciliation_plan.append(lines)
+                updates = loan._get_reclassification_updates(
+                    capital_reclassified, interest_reclassified, move
+                )
+                lines_by_updates[tuple(sorted(updates.items()))] |= schedule
+        self.env["account.move.line"]._reconcile_plan(reconciliation_plan)
+        reclassified = self.env["prestamos.loan.line"]
+        for updates, schedules in lines_by_updates.items():
+            schedules.write(dict(updates))
+            reclassified |= schedules
+        return moves, reclassified
+
     def _reclassify_lines_to_short_term(self, schedule_lines, move_date):
         self.ensure_one()
         for schedule in schedule_lines:
-            line_vals = []
-            capital_reclassified = False
-            interest_reclassified = False
-            if (
-                schedule.capital_term == "long"
-                and schedule.capital_move_line_id
-                and schedule.capital_move_line_id.account_id == schedule.capital_account_id
-                and not self.currency_id.is_zero(schedule.capital_amount)
-            ):
-                line_vals += self._prepare_reclassification_lines(
-                    schedule,
-                    schedule.capital_account_id,
-                    self.short_loan_account_id,
-                    abs(schedule.capital_move_line_id.balance) or schedule.capital_amount,
-                    "capital",
-                )
-                capital_reclassified = True
-            if (
-                schedule.interest_term == "long"
-                and schedule.interest_move_line_id
-                and schedule.interest_move_line_id.account_id == schedule.interest_account_id
-                and not self.currency_id.is_zero(abs(schedule.interest_move_line_id.balance))
-            ):
-                line_vals += self._prepare_reclassification_lines(
-                    schedule,
-                    schedule.interest_account_id,
-                    self.short_interest_account_id,
-                    abs(schedule.interest_move_line_id.balance),
-                    "interest",
-                )
-                interest_reclassified = True
+            (
+                line_vals,
+                capital_reclassified,
+                interest_reclassified,
+            ) = self._prepare_schedule_reclassification(schedule)
             if not line_vals:
                 continue
             move = self.env["account.move"].create(
@@ -1159,24 +1301,67 @@ class PrestamosLoan(models.Model):
                     schedule.interest_move_line_id,
                     move,
                 )
-            updates = {}
-            if capital_reclassified:
-                updates.update(
-                    {
-                        "capital_term": "short",
-                        "capital_account_id": self.short_loan_account_id.id,
-                    }
-                )
-            if interest_reclassified:
-                updates.update(
-                    {
-                        "interest_term": "short",
-                        "interest_account_id": self.short_interest_account_id.id,
-                    }
+            schedule.write(
+                self._get_reclassification_updates(
+                    capital_reclassified, interest_reclassified, move
                 )
-            if updates:
-                updates["last_reclassification_move_id"] = move.id
-                schedule.write(updates)
+            )
+
+    def _prepare_schedule_reclassification(self, schedule):
+        self.ensure_one()
+        line_vals = []
+        capital_reclassified = False
+        interest_reclassified = False
+        if (
+            schedule.capital_term == "long"
+            and schedule.capital_move_line_id
+            and schedule.capital_move_line_id.account_id == schedule.capital_account_id
+            and not self.currency_id.is_zero(schedule.capital_amount)
+        ):
+            line_vals += self._prepare_reclassification_lines(
+                schedule,
+                schedule.capital_account_id,
+                self.short_loan_account_id,
+                abs(schedule.capital_move_line_id.balance) or schedule.capital_amount,
+                "capital",
+            )
+            capital_reclassified = True
+        if (
+            schedule.interest_term == "long"
+            and schedule.interest_move_line_id
+            and schedule.interest_move_line_id.account_id == schedule.interest_account_id
+            and not self.currency_id.is_zero(abs(schedule.interest_move_line_id.balance))
+        ):
+            line_vals += self._prepare_reclassification_lines(
+                schedule,
+                schedule.interest_account_id,
+                self.short_interest_account_id,
+                abs(schedule.interest_move_line_id.balance),
+                "interest",
+            )
+            interest_reclassified = True
+        return line_vals, capital_reclassified, interest_reclassified
+
+    def _get_reclassification_updates(self, capital_reclassified, interest_reclassified, move):
+        self.ensure_one()
+        updates = {}
+        if capital_reclassified:
+            updates.update(
+                {
+                    "capital_term": "short",
+                    "capital_account_id": self.short_loan_account_id.id,
+                }
+            )
+        if interest_reclassified:
+            updates.update(
+                {
+                    "interest_term": "short",
+                    "interest_account_id": self.short_interest_account_id.id,
+                }
+            )
+        if updates:
+            updates["last_reclassification_move_id"] = move.id
+        return updates
 
     def _prepare_reclassification_lines(self, schedule, origin_account, target_account, amount, component):
         if origin_account == target_account or self.currency_id.is_zero(amount):
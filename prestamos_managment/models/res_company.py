@@ -87,6 +87,11 @@ class ResCompany(models.Model):
         string="Producto de intereses",
         domain="[('purchase_ok', '=', True)]",
     )
+    loan_batch_reclassification = fields.Boolean(
+        string="Prestamos - reclasificacion agrupada",
+        help="La reclasificacion diaria a corto plazo genera un asiento por prestamo "
+        "con todas sus cuotas, en lugar de un asiento por cuota.",
+    )
     loan_bank_interest_expense_account_id = fields.Many2one(
         "account.account",
         string="Cuenta de gastos de intereses bancarios/financieros",
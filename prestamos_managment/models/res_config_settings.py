@@ -101,6 +101,11 @@ class ResConfigSettings(models.TransientModel):
         string="Producto de intereses",
         domain="[('purchase_ok', '=', True)]",
     )
+    loan_batch_reclassification = fields.Boolean(
+        related="company_id.loan_batch_reclassification",
+        readonly=False,
+        string="Reclasificacion agrupada",
+    )
     loan_bank_interest_expense_account_id = fields.Many2one(
         related="company_id.loan_bank_interest_expense_account_id",
         readonly=False,
@@ -0,0 +1,2 @@
+from . import test_prestamos_loan
+from . import test_prestamos_loan_reclassification
@@ -0,0 +1,187 @@
+import math
+from datetime import date
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase
+
+
+def previous_french_monthly_rate(principal, target_interest, periods):
+    """Tasa del sistema frances por biseccion, como se calculaba antes."""
+
+    def total_interest(rate):
+        payment = principal * rate / (1 - (1 + rate) ** -periods)
+        return payment * periods - principal
+
+    low = 0.0
+    high = 0.01
+    while total_interest(high) < target_interest and high < 100:
+        high *= 2
+    for _iteration in range(100):
+        mid = (low + high) / 2
+        if total_interest(mid) < target_interest:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def previous_french_amounts(currency, principal, interest_total, periods):
+    """Capital e interes de cada cuota del sistema frances, como se calculaban
+    antes.
+    """
+    if currency.is_zero(interest_total):
+        partial = currency.round(principal / periods)
+        capital_parts = [partial] * periods
+        capital_parts[-1] = currency.round(
+            partial + currency.round(principal - sum(capital_parts))
+        )
+        return capital_parts, [0.0] * periods
+    monthly_rate = previous_french_monthly_rate(principal, interest_total, periods)
+    payment = principal * monthly_rate / (1 - (1 + monthly_rate) ** -periods)
+    balance = principal
+    capital_parts = []
+    interest_parts = []
+    for index in range(periods):
+        if index == periods - 1:
+            capital = currency.round(principal - sum(capital_parts))
+            interest = currency.round(interest_total - sum(interest_parts))
+        else:
+            interest = currency.round(balance * monthly_rate)
+            capital = currency.round(payment - interest)
+            balance -= capital
+        capital_parts.append(capital)
+        interest_parts.append(interest)
+    return capital_parts, interest_parts
+
+
+class TestPrestamosLoanSchedule(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.loan_model = cls.env["prestamos.loan"]
+        cls.partner = cls.env["res.partner"].create({"name": "Banco de prueba"})
+        cls.currency = cls.env.company.currency_id
+
+    def _loan_values(self, capital_amount, interest_amount, installment_count):
+        return {
+            "name": "Prestamo de prueba",
+            "partner_id": self.partner.id,
+            "capital_amount": capital_amount,
+            "interest_amount": interest_amount,
+            "loan_date": date(2025, 1, 15),
+            "first_due_date": date(2025, 2, 15),
+            "installment_count": installment_count,
+            "amortization_system": "frances",
+        }
+
+    def _assert_previous_schedule(self, capital_amount, interest_amount, periods):
+        loan = self.loan_model.create(
+            self._loan_values(capital_amount, interest_amount, periods)
+        )
+        schedule = loan._get_schedules()[loan]
+        capital_parts, interest_parts = previous_french_amounts(
+            self.currency, capital_amount, interest_amount, periods
+        )
+        self.assertEqual(
+            [values["sequence"] for values in schedule], list(range(1, periods + 1))
+        )
+        self.assertEqual(
+            [values["due_date"] for values in schedule], loan._compute_due_dates()
+        )
+        self.assertEqual(
+            [values["capital_amount"] for values in schedule], capital_parts
+        )
+        self.assertEqual(
+            [values["interest_amount"] for values in schedule], interest_parts
+        )
+        self.assertAlmostEqual(
+            sum(values["capital_amount"] for values in schedule), capital_amount
+        )
+        self.assertAlmostEqual(
+            sum(values["interest_amount"] for values in schedule), interest_amount
+        )
+        return loan, schedule
+
+    def test_french_schedule(self):
+        self._assert_previous_schedule(10000.0, 1500.0, 12)
+        self._assert_previous_schedule(250000.0, 90000.0, 60)
+        self._assert_previous_schedule(5000.0, 50.0, 6)
+
+    def test_french_schedule_zero_interest(self):
+        _loan, schedule = self._assert_previous_schedule(1000.0, 0.0, 3)
+        self.assertEqual(
+            [values["capital_amount"] for values in schedule], [333.33, 333.33, 333.34]
+        )
+        self.assertEqual([values["interest_amount"] for values in schedule], [0.0] * 3)
+
+    def test_french_schedule_single_period(self):
+        _loan, schedule = self._assert_previous_schedule(1000.0, 100.0, 1)
+        self.assertEqual(len(schedule), 1)
+        self.assertEqual(schedule[0]["capital_amount"], 1000.0)
+        self.assertEqual(schedule[0]["interest_amount"], 100.0)
+
+    def test_create_schedule_lines(self):
+        loan, schedule = self._assert_previous_schedule(10000.0, 1500.0, 12)
+        other_loan = self.loan_model.create(self._loan_values(5000.0, 0.0, 3))
+        (loan | other_loan).action_recompute_schedule()
+        self.assertEqual(
+            loan.schedule_line_ids.sorted("sequence").mapped("capital_amount"),
+            [values["capital_amount"] for values in schedule],
+        )
+        self.assertEqual(len(other_loan.schedule_line_ids), 3)
+
+    def test_simulate_schedules(self):
+        values = self._loan_values(10000.0, 1500.0, 12)
+        loan = self.loan_model.create(values)
+        loan_count = self.loan_model.search_count([])
+        simulations = self.loan_model.simulate_schedules(
+            [values, self._loan_values(1000.0, 100.0, 1)]
+        )
+        self.assertEqual(self.loan_model.search_count([]), loan_count)
+        self.assertEqual(simulations[0], loan._get_schedules()[loan])
+        self.assertEqual(len(simulations[1]), 1)
+
+    def test_simulate_schedules_without_capital(self):
+        values = self._loan_values(0.0, 100.0, 3)
+        schedule = self.loan_model.simulate_schedules([values])[0]
+        capital_parts, interest_parts = previous_french_amounts(
+            self.currency, 0.0, 100.0, 3
+        )
+        self.assertEqual(
+            [values["capital_amount"] for values in schedule], capital_parts
+        )
+        self.assertEqual(
+            [values["interest_amount"] for values in schedule], interest_parts
+        )
+        self.assertEqual(interest_parts, [0.0, 0.0, 100.0])
+
+    def test_solve_french_monthly_rate(self):
+        cases = [
+            (10000.0, 1500.0, 12),
+            (100000.0, 60000.0, 120),
+            (1000000.0, 2000000.0, 240),
+            (1000.0, 10.0, 2),
+            (1000.0, 1.0, 360),
+            (1000.0, 0.01, 12),
+        ]
+        for principal, target_interest, periods in cases:
+            with patch.object(math, "expm1", wraps=math.expm1) as expm1:
+                rate = self.loan_model._solve_french_monthly_rate(
+                    principal, target_interest, periods
+                )
+            # Newton converge en pocas iteraciones
+            self.assertLessEqual(expm1.call_count, 10)
+            discount = -math.expm1(-periods * math.log1p(rate))
+            total_interest = principal * rate / discount * periods - principal
+            self.assertAlmostEqual(
+                total_interest, target_interest, delta=target_interest * 1e-9
+            )
+            if target_interest >= 10:
+                self.assertAlmostEqual(
+                    rate,
+                    previous_french_monthly_rate(principal, target_interest, periods),
+                    delta=rate * 1e-9,
+                )
+        self.assertEqual(
+            self.loan_model._solve_french_monthly_rate(1000.0, 100.0, 1), 0.1
+        )
@@ -0,0 +1,163 @@
+from unittest.mock import patch
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestPrestamosLoanReclassification(AccountTestInvoicingCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.loan_model = cls.env["prestamos.loan"]
+        cls.partner = cls.env["res.partner"].create({"name": "Banco de prueba"})
+        cls.today = fields.Date.context_today(cls.loan_model)
+
+        def account(code, account_type):
+            return cls.env["account.account"].create(
+                {
+                    "name": f"Prestamos {code}",
+                    "code": code,
+                    "account_type": account_type,
+                    "reconcile": True,
+                }
+            )
+
+        cls.short_loan_account = account("213001", "liability_current")
+        cls.long_loan_account = account("223001", "liability_non_current")
+        cls.short_interest_account = account("213002", "liability_payable")
+        cls.long_interest_account = account("223002", "liability_payable")
+
+    def _create_confirmed_loan(self, name):
+        loan = self.loan_model.create(
+            {
+                "name": name,
+                "partner_id": self.partner.id,
+                "capital_amount": 24000.0,
+                "interest_amount": 2400.0,
+                "generate_interest_invoice": False,
+                "loan_date": self.today,
+                "first_due_date": self.today + relativedelta(months=1),
+                "installment_count": 24,
+                "amortization_system": "frances",
+                "bank_journal_id": self.company_data["default_journal_bank"].id,
+                "journal_id": self.company_data["default_journal_misc"].id,
+                "short_loan_account_id": self.short_loan_account.id,
+                "long_loan_account_id": self.long_loan_account.id,
+                "short_interest_account_id": self.short_interest_account.id,
+                "long_interest_account_id": self.long_interest_account.id,
+                "expense_account_id": self.company_data["default_account_expense"].id,
+            }
+        )
+        loan.action_confirm()
+        return loan
+
+    def _get_reclassification(self, loan):
+        """Terminos, cuentas y conciliaciones de las cuotas y lineas de los
+        asientos de reclasificacion del prestamo.
+        """
+        schedule_lines = loan.schedule_line_ids.sorted("sequence")
+        moves = schedule_lines.last_reclassification_move_id
+        return {
+            "schedule_lines": [
+                (
+                    line.sequence,
+                    line.capital_term,
+                    line.interest_term,
+                    line.capital_account_id,
+                    line.interest_account_id,
+                    line.capital_move_line_id.reconciled,
+                    line.interest_move_line_id.reconciled,
+                )
+                for line in schedule_lines
+            ],
+            "move_lines": sorted(
+                (
+                    line.prestamos_schedule_line_id.sequence,
+                    line.account_id.id,
+                    line.debit,
+                    line.credit,
+                    line.reconciled,
+                )
+                for line in moves.line_ids
+            ),
+        }
+
+    def test_batch_reclassification(self):
+        threshold = self.today + relativedelta(months=18)
+        loan = self._create_confirmed_loan("Prestamo por cuota")
+        batch_loan = self._create_confirmed_loan("Prestamo agrupado")
+        due_lines = loan.schedule_line_ids.filtered(
+            lambda line: line.state == "pending"
+            and line.due_date < threshold
+            and line.capital_term == "long"
+        )
+        self.assertTrue(due_lines)
+        loan._reclassify_lines_to_short_term(due_lines, self.today)
+        batch_loan._reclassify_short_term_lines_batch(
+            self.today, threshold, batch_size=1
+        )
+        moves = loan.schedule_line_ids.last_reclassification_move_id
+        batch_moves = batch_loan.schedule_line_ids.last_reclassification_move_id
+        self.assertEqual(len(moves), len(due_lines))
+        # Un solo asiento por prestamo, con las mismas lineas y conciliaciones
+        self.assertEqual(len(batch_moves), 1)
+        self.assertEqual(batch_moves.state, "posted")
+        self.assertEqual(
+            self._get_reclassification(batch_loan), self._get_reclassification(loan)
+        )
+        reclassified = batch_loan.schedule_line_ids.filtered(
+            lambda line: line.last_reclassification_move_id
+        )
+        self.assertEqual(set(reclassified.mapped("capital_term")), {"short"})
+        self.assertTrue(all(reclassified.capital_move_line_id.mapped("reconciled")))
+        # Una nueva ejecucion solo busca las cuotas que siguen a largo plazo
+        batch_loan._reclassify_short_term_lines_batch(
+            self.today, threshold, batch_size=1
+        )
+        self.assertEqual(
+            batch_loan.schedule_line_ids.last_reclassification_move_id, batch_moves
+        )
+
+    def test_batch_reclassification_failure(self):
+        threshold = self.today + relativedelta(months=18)
+        failing_loan = self._create_confirmed_loan("Prestamo con error")
+        loan = self._create_confirmed_loan("Prestamo sin error")
+        prepare = type(self.loan_model)._prepare_schedule_reclassification
+
+        def prepare_schedule_reclassification(loan_record, schedule):
+            if loan_record == failing_loan:
+                raise UserError("Error de prueba")
+            return prepare(loan_record, schedule)
+
+        with patch.object(
+            type(self.loan_model),
+            "_prepare_schedule_reclassification",
+            autospec=True,
+            side_effect=prepare_schedule_reclassification,
+        ):
+            (failing_loan | loan)._reclassify_short_term_lines_batch(
+                self.today, threshold, batch_size=1
+            )
+        # El lote con error se revierte, los demas se reclasifican
+        self.assertFalse(failing_loan.schedule_line_ids.last_reclassification_move_id)
+        self.assertFalse(
+            failing_loan.schedule_line_ids.filtered(
+                lambda line: line.due_date < threshold
+                and line.capital_term == "long"
+                and line.capital_move_line_id.reconciled
+            )
+        )
+        self.assertEqual(len(loan.schedule_line_ids.last_reclassification_move_id), 1)
+        # La siguiente ejecucion reclasifica el prestamo que habia fallado
+        (failing_loan | loan)._reclassify_short_term_lines_batch(
+            self.today, threshold, batch_size=1
+        )
+        self.assertEqual(
+            len(failing_loan.schedule_line_ids.last_reclassification_move_id), 1
+        )
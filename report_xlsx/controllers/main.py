@@ -4,8 +4,10 @@
 
 import json
 import logging
+import os
 
 from werkzeug.urls import url_decode
+from werkzeug.wsgi import wrap_file
 
 from odoo.http import (
     content_disposition,
@@ -36,6 +38,24 @@ class ReportController(ReportController):
             if data.get("context"):
                 data["context"] = json.loads(data["context"])
                 context.update(data["context"])
+            report_model = request.env[f"report.{report.report_name}"]
+            if report_model.with_context(**context)._use_xlsx_streaming(data):
+                xlsx_file = report.with_context(**context)._render_xlsx_file(
+                    reportname, docids, data=data
+                )[0]
+                xlsxhttpheaders = [
+                    (
+                        "Content-Type",
+                        "application/vnd.openxmlformats-"
+                        "officedocument.spreadsheetml.sheet",
+                    ),
+                    ("Content-Length", os.fstat(xlsx_file.fileno()).st_size),
+                ]
+                # The file is read by chunks and closed, thus removed, once sent
+                return request.make_response(
+                    wrap_file(request.httprequest.environ, xlsx_file),
+                    headers=xlsxhttpheaders,
+                )
             xlsx = report.with_context(**context)._render_xlsx(
                 reportname, docids, data=data
             )[0]
@@ -30,6 +30,22 @@ class ReportAction(models.Model):
             report_sudo.save_xlsx_report_attachment(docids, ret[0])
         return ret
 
+    @api.model
+    def _render_xlsx_file(self, report_ref, docids, data):
+        """Same as ``_render_xlsx`` but return the report as a temporary file."""
+        report_sudo = self._get_report(report_ref)
+        report_model_name = f"report.{report_sudo.report_name}"
+        report_model = self.env[report_model_name]
+        xlsx_file, report_type = (
+            report_model.with_context(active_model=report_sudo.model)
+            .sudo(False)
+            .create_xlsx_report_file(docids, data)
+        )
+        if report_sudo.attachment:
+            report_sudo.save_xlsx_report_attachment(docids, xlsx_file.read())
+            xlsx_file.seek(0)
+        return xlsx_file, report_type
+
     @api.model
     def _get_report_from_name(self, report_name):
         res = super()._get_report_from_name(report_name)
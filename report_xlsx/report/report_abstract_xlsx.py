@@ -3,6 +3,7 @@
 
 import logging
 import re
+import tempfile
 from io import BytesIO
 
 from odoo import models
@@ -107,6 +108,33 @@ class ReportXlsxAbstract(models.AbstractModel):
         file_data.seek(0)
         return file_data.read(), "xlsx"
 
+    def create_xlsx_report_file(self, docids, data):
+        """Same as ``create_xlsx_report`` but the workbook is written in
+        constant memory mode to a temporary file, returned at its start. The
+        file is removed when closed.
+        """
+        objs = self._get_objs_for_report(docids, data)
+        file_data = tempfile.TemporaryFile()
+        try:
+            workbook = xlsxwriter.Workbook(
+                file_data, dict(self.get_workbook_options(), constant_memory=True)
+            )
+            self.generate_xlsx_report(workbook, data, objs)
+            workbook.close()
+        except Exception:
+            file_data.close()
+            raise
+        file_data.seek(0)
+        return file_data, "xlsx"
+
+    def _use_xlsx_streaming(self, data):
+        """Whether the report controller renders the report with
+        ``create_xlsx_report_file`` and sends the file by chunks. Reports opting
+        in must write their rows in order, as required by the ``constant_memory``
+        mode of xlsxwriter.
+        """
+        return False
+
     def get_workbook_options(self):
         """
         See https://xlsxwriter.readthedocs.io/workbook.html constructor options
@@ -32,6 +32,19 @@ class TestReport(common.TransactionCase):
         sheet = wb.sheet_by_index(0)
         self.assertEqual(sheet.cell(0, 0).value, self.docs.name)
 
+    def test_report_file(self):
+        xlsx_file, report_type = self.report_object._render_xlsx_file(
+            self.report_name, self.docs.ids, {}
+        )
+        self.assertEqual(report_type, "xlsx")
+        with xlsx_file:
+            wb = open_workbook(file_contents=xlsx_file.read())
+        sheet = wb.sheet_by_index(0)
+        self.assertEqual(sheet.cell(0, 0).value, self.docs.name)
+        self.assertFalse(
+            self.env["report.report_xlsx.partner_xlsx"]._use_xlsx_streaming({})
+        )
+
     def test_save_attachment(self):
         self.report.attachment = 'object.name + ".xlsx"'
         self.report_object._render(self.report_name, self.docs.ids, {})
@@ -5,7 +5,7 @@
     "summary": "Balance general y flujo de caja",
     "author": "DNS",
     "license": "LGPL-3",
-    "depends": ["account", "date_range"],
+    "depends": ["account", "date_range", "account_financial_report"],
     "data": [
         "security/ir.model.access.csv",
         "views/balance_general_wizard_views.xml",
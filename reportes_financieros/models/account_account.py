@@ -1,4 +1,5 @@
-from odoo import fields, models
+from odoo import api, fields, models
+from odoo.tools import SQL
 
 
 class AccountAccount(models.Model):
@@ -21,3 +22,43 @@ class AccountAccount(models.Model):
         string="Nombre a mostrar en flujo de caja",
         help="Etiqueta que se mostrara en el reporte de flujo de caja. Si varias cuentas usan el mismo nombre, sus movimientos se sumaran en una sola linea.",
     )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        accounts = super().create(vals_list)
+        self._invalidate_account_code_index(accounts.company_ids)
+        return accounts
+
+    def write(self, vals):
+        if not {"code", "company_ids"} & set(vals):
+            return super().write(vals)
+        companies = self.company_ids
+        res = super().write(vals)
+        self._invalidate_account_code_index(companies | self.company_ids)
+        return res
+
+    def unlink(self):
+        companies = self.company_ids
+        res = super().unlink()
+        self._invalidate_account_code_index(companies)
+        return res
+
+    @api.model
+    def _invalidate_account_code_index(self, companies):
+        """Increase the generation of the companies, so that their cached account
+        code tree is not reused in any worker.
+        """
+        if not companies:
+            return
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE res_company
+                SET account_code_index_generation
+                    = COALESCE(account_code_index_generation, 0) + 1
+                WHERE id IN %s
+                """,
+                tuple(companies.ids),
+            )
+        )
+        companies.invalidate_recordset(["account_code_index_generation"])
@@ -0,0 +1,10 @@
+from odoo import fields, models
+
+
+class ResCompany(models.Model):
+    _inherit = "res.company"
+
+    # Increased to drop the cached account code tree of the balance general report
+    account_code_index_generation = fields.Integer(
+        readonly=True, copy=False, default=0
+    )
@@ -1,7 +1,7 @@
 import re
 from datetime import date, timedelta
 
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 from odoo.tools.float_utils import float_is_zero
 
 
@@ -50,6 +50,48 @@ class BalanceGeneralReport(models.AbstractModel):
             return False
         return account_code == group_code or account_code.startswith(group_code + ".")
 
+    def _code_ancestors(self, code):
+        # Codes of the groups containing the code: the code itself and its prefixes.
+        parts = code.split(".") if code else []
+        return tuple(".".join(parts[:index]) for index in range(1, len(parts) + 1))
+
+    @api.model
+    def _get_account_code_index(self, company_id):
+        """Account code tree of the company, rebuilt when its accounts change.
+
+        ``ancestors`` maps each account to the codes of the groups containing it and
+        ``depths`` gives, per number of code segments, the accounts sorted by their
+        code truncated to that depth, for the binary searches of the code ranges.
+        """
+        company = self.env["res.company"].sudo().browse(company_id)
+        return self._get_account_code_index_cached(
+            company_id, company.account_code_index_generation
+        )
+
+    @api.model
+    @tools.ormcache("company_id", "generation")
+    def _get_account_code_index_cached(self, company_id, generation):
+        accounts = (
+            self.env["account.account"]
+            .sudo()
+            .with_company(company_id)
+            .search_fetch([("company_ids", "in", [company_id])], ["code"])
+            .filtered("code")
+        )
+        ancestors = {account.id: self._code_ancestors(account.code) for account in accounts}
+        max_depth = max((len(codes) for codes in ancestors.values()), default=0)
+        depths = {}
+        for depth in range(1, max_depth + 1):
+            entries = sorted(
+                (self._code_sort_key(codes[min(depth, len(codes)) - 1]), account_id)
+                for account_id, codes in ancestors.items()
+            )
+            depths[depth] = (
+                [key for key, __ in entries],
+                [account_id for __, account_id in entries],
+            )
+        return {"ancestors": ancestors, "depths": depths}
+
     def _get_section_key(self, code, account_type=None):
         if account_type:
             if account_type.startswith("asset") or account_type.startswith(
@@ -80,31 +122,23 @@ class BalanceGeneralReport(models.AbstractModel):
         provisional_from = wizard.date_from
         provisional_to = wizard.date_to
 
-        domain = [
-            ("company_id", "=", wizard.company_id.id),
-            ("move_id.state", "=", "posted"),
-            ("date", ">=", provisional_from),
-            ("date", "<=", provisional_to),
-            ("account_id.account_type", "in", ["income", "income_other", "expense", "expense_depreciation", "expense_direct_cost"]),
-        ]
-        grouped = self.env["account.move.line"].read_group(
-            domain=domain,
-            fields=["account_id", "balance:sum"],
-            groupby=["account_id"],
-            lazy=False,
+        accounts = self.env["account.account"].search([
+            ("company_ids", "in", wizard.company_id.ids),
+            ("account_type", "in", ["income", "income_other", "expense", "expense_depreciation", "expense_direct_cost"]),
+        ])
+        # Closed months are read from the balance snapshot of account_financial_report
+        grouped = self.env["account.balance.snapshot"].sudo()._read_balances(
+            wizard.company_id,
+            provisional_to + timedelta(days=1),
+            date_from=provisional_from,
+            account_ids=accounts.ids,
         )
-        account_model = self.env["account.account"]
-        account_ids = [line["account_id"][0] for line in grouped if line.get("account_id")]
-        account_type_map = {
-            acc.id: acc.account_type for acc in account_model.browse(account_ids)
-        }
+        account_type_map = {acc.id: acc.account_type for acc in accounts}
 
         total_ingreso = 0.0
         total_egreso = 0.0
         for line in grouped:
-            if not line.get("account_id"):
-                continue
-            acc_id = line["account_id"][0]
+            acc_id = line["account_id"]
             acc_type = account_type_map.get(acc_id, "")
             balance = line.get("balance", 0.0)
             if acc_type.startswith("income"):
@@ -124,26 +158,17 @@ class BalanceGeneralReport(models.AbstractModel):
     def _get_account_balances(self, account_ids, company_id, date_from, date_to):
         if not account_ids:
             return {}, {}, set()
-        domain = [
-            ("account_id", "in", account_ids),
-            ("company_id", "=", company_id),
-            ("move_id.state", "=", "posted"),
-            ("date", ">=", date_from),
-            ("date", "<=", date_to),
-        ]
-        grouped = self.env["account.move.line"].read_group(
-            domain=domain,
-            fields=["account_id", "balance:sum", "debit:sum", "credit:sum"],
-            groupby=["account_id"],
-            lazy=False,
+        grouped = self.env["account.balance.snapshot"].sudo()._read_balances(
+            self.env["res.company"].browse(company_id),
+            date_to + timedelta(days=1),
+            date_from=date_from,
+            account_ids=list(account_ids),
         )
         balances = {}
         debit_credit_map = {}
         moved_accounts = set()
         for item in grouped:
-            if not item["account_id"]:
-                continue
-            account_id = item["account_id"][0]
+            account_id = item["account_id"]
             balances[account_id] = item.get("balance", 0.0)
             debit_credit_map[account_id] = {
                 "debit": item.get("debit", 0.0),
@@ -181,27 +206,28 @@ class BalanceGeneralReport(models.AbstractModel):
             lambda a: self._is_report_root(a.code)
         )
 
+        # Totals of every group in a single pass over the accounts
+        ancestors = self._get_account_code_index(wizard.company_id.id)["ancestors"]
+        group_totals = {}
+        for account in visible_accounts:
+            debit_credit = account_debit_credit_map.get(account.id, {})
+            amounts = (
+                account_balance_map.get(account.id, 0.0),
+                debit_credit.get("debit", 0.0),
+                debit_credit.get("credit", 0.0),
+            )
+            codes = ancestors.get(account.id) or self._code_ancestors(account.code)
+            for code in codes:
+                totals = group_totals.setdefault(code, [0.0, 0.0, 0.0])
+                for index, amount in enumerate(amounts):
+                    totals[index] += amount
+
         lines = []
         for group in groups:
             group_code = group.code_prefix_start or ""
-            group_has_visible_accounts = any(
-                self._code_belongs_to_group(account.code, group_code)
-                for account in visible_accounts
-            )
-            group_balance = sum(
-                account_balance_map.get(account.id, 0.0)
-                for account in visible_accounts
-                if self._code_belongs_to_group(account.code, group_code)
-            )
-            group_debit = sum(
-                account_debit_credit_map.get(account.id, {}).get("debit", 0.0)
-                for account in visible_accounts
-                if self._code_belongs_to_group(account.code, group_code)
-            )
-            group_credit = sum(
-                account_debit_credit_map.get(account.id, {}).get("credit", 0.0)
-                for account in visible_accounts
-                if self._code_belongs_to_group(account.code, group_code)
+            group_has_visible_accounts = group_code in group_totals
+            group_balance, group_debit, group_credit = group_totals.get(
+                group_code, (0.0, 0.0, 0.0)
             )
             if (
                 not wizard.show_accounts_without_moves
@@ -338,14 +364,10 @@ class BalanceGeneralReport(models.AbstractModel):
                     }
                     lines.append(group_line)
                     group_lines_by_code[code] = group_line
+            target_ancestors = set(self._code_ancestors(target_code))
             for line in lines:
-                if line.get("line_type") == "group":
-                    group_code = line.get("code") or ""
-                    if group_code and (
-                        target_code == group_code
-                        or target_code.startswith(group_code + ".")
-                    ):
-                        line["balance"] = line.get("balance", 0.0) + raw_result_delta
+                if line.get("line_type") == "group" and line.get("code") in target_ancestors:
+                    line["balance"] = line.get("balance", 0.0) + raw_result_delta
 
     def _apply_display_sign(self, lines):
         for line in lines:
@@ -358,21 +380,20 @@ class BalanceGeneralReport(models.AbstractModel):
             line["display_credit"] = line.get("credit", 0.0)
 
     def _sync_group_display_with_children(self, lines):
-        account_lines = [
-            line
-            for line in lines
-            if line.get("line_type") == "account" and line.get("code")
-        ]
+        child_totals = {}
+        for line in lines:
+            if line.get("line_type") != "account" or not line.get("code"):
+                continue
+            for code in self._code_ancestors(str(line["code"]))[:-1]:
+                child_totals[code] = child_totals.get(code, 0.0) + line.get(
+                    "display_balance", 0.0
+                )
         for group_line in lines:
             if group_line.get("line_type") != "group" or not group_line.get("code"):
                 continue
-            prefix = f"{group_line['code']}."
-            child_lines = [
-                line for line in account_lines if str(line.get("code")).startswith(prefix)
-            ]
-            if not child_lines:
+            if group_line["code"] not in child_totals:
                 continue
-            child_total = sum(line.get("display_balance", 0.0) for line in child_lines)
+            child_total = child_totals[group_line["code"]]
             group_line["display_balance"] = child_total
             mult = self._sign_multiplier_for_group_code(group_line.get("code"))
             group_line["balance"] = child_total / mult if mult else child_total
@@ -2,6 +2,7 @@ from collections import defaultdict
 from datetime import timedelta
 
 from odoo import api, fields, models
+from odoo.tools import SQL
 from odoo.tools.float_utils import float_is_zero
 
 
@@ -22,20 +23,12 @@ class FlujoCajaReport(models.AbstractModel):
     def _get_balance_for_accounts(self, account_ids, company_id, date_from=None, date_to=None):
         if not account_ids:
             return 0.0
-        domain = [
-            ("company_id", "=", company_id),
-            ("move_id.state", "=", "posted"),
-            ("account_id", "in", account_ids),
-        ]
-        if date_from:
-            domain.append(("date", ">=", date_from))
-        if date_to:
-            domain.append(("date", "<=", date_to))
-        result = self.env["account.move.line"].read_group(
-            domain=domain,
-            fields=["balance:sum"],
-            groupby=[],
-            lazy=False,
+        result = self.env["account.balance.snapshot"].sudo()._read_balances(
+            self.env["res.company"].browse(company_id),
+            date_to and date_to + timedelta(days=1),
+            date_from=date_from,
+            account_ids=list(account_ids),
+            groupby=(),
         )
         return result[0]["balance"] if result else 0.0
 
@@ -71,81 +64,127 @@ class FlujoCajaReport(models.AbstractModel):
         lines.sort(key=lambda line: (-abs(line["amount"]), line["label"]))
         return lines
 
-    def _collect_configured_cash_flow_groups(self, company, date_from, date_to, cash_accounts):
-        aml_model = self.env["account.move.line"]
-        cash_lines = aml_model.search(
-            [
-                ("company_id", "=", company.id),
-                ("move_id.state", "=", "posted"),
-                ("date", ">=", date_from),
-                ("date", "<=", date_to),
-                ("account_id", "in", cash_accounts.ids),
-            ],
-            order="date, move_id, id",
+    def _get_cash_flow_line_conditions(self):
+        # Extra SQL conditions on the cash journal items (alias aml), see
+        # balance_general_project_filter.
+        return []
+
+    def _get_cash_flow_allocations_query(self, company, date_from, date_to, cash_accounts):
+        """Amounts of the configured counterparts of the cash movements per account,
+        side of the counterpart and direction of the cash movement.
+
+        The cash delta of each move is split between its counterparts of accounts
+        included in the cash flow in proportion to their balance, the last one
+        taking the remainder.
+        """
+        cash_conditions = [
+            SQL("aml.company_id = %s", company.id),
+            SQL("aml.parent_state = 'posted'"),
+            SQL("aml.date >= %s", date_from),
+            SQL("aml.date <= %s", date_to),
+            SQL("aml.account_id IN %s", tuple(cash_accounts.ids)),
+        ] + self._get_cash_flow_line_conditions()
+        return SQL(
+            """
+            WITH cash AS (
+                SELECT aml.move_id, SUM(aml.balance) AS cash_delta
+                FROM account_move_line aml
+                WHERE %(cash_conditions)s
+                GROUP BY aml.move_id
+                HAVING ABS(SUM(aml.balance)) >= %(half_rounding)s
+            ),
+            counterparts AS (
+                SELECT
+                    cash.move_id,
+                    cash.cash_delta,
+                    line.account_id,
+                    line.credit != 0 AS is_credit,
+                    ABS(line.balance) AS weight,
+                    SUM(ABS(line.balance)) OVER move_lines AS total_weight,
+                    SUM(ABS(line.balance)) OVER (move_lines ORDER BY line.id)
+                        AS cumulative_weight,
+                    ROW_NUMBER() OVER (move_lines ORDER BY line.id) AS sequence,
+                    COUNT(*) OVER move_lines AS line_count
+                FROM cash
+                JOIN account_move_line line ON line.move_id = cash.move_id
+                JOIN account_account account ON account.id = line.account_id
+                WHERE account.include_in_cash_flow
+                    AND line.account_id NOT IN %(cash_account_ids)s
+                    AND line.balance != 0
+                WINDOW move_lines AS (PARTITION BY cash.move_id)
+            )
+            SELECT
+                account_id,
+                is_credit,
+                cash_delta > 0 AS is_inflow,
+                SUM(
+                    CASE WHEN sequence = line_count
+                    THEN ABS(cash_delta)
+                        - ABS(cash_delta) * (cumulative_weight - weight) / total_weight
+                    ELSE ABS(cash_delta) * weight / total_weight
+                    END
+                ) AS amount
+            FROM counterparts
+            GROUP BY account_id, is_credit, cash_delta > 0
+            ORDER BY account_id, is_credit, cash_delta > 0
+            """,
+            cash_conditions=SQL(" AND ").join(cash_conditions),
+            half_rounding=company.currency_id.rounding / 2,
+            cash_account_ids=tuple(cash_accounts.ids),
         )
-        grouped_moves = defaultdict(lambda: self.env["account.move.line"])
-        for line in cash_lines:
-            grouped_moves[line.move_id.id] |= line
 
+    def _collect_configured_cash_flow_groups(self, company, date_from, date_to, cash_accounts):
         income_groups = {}
         expense_groups = {}
-        rounding = company.currency_id.rounding
-        cash_account_ids = set(cash_accounts.ids)
-
-        for cash_move_lines in grouped_moves.values():
-            move = cash_move_lines[:1].move_id
-            cash_delta = sum(cash_move_lines.mapped("balance"))
-            if float_is_zero(cash_delta, precision_rounding=rounding):
-                continue
-
-            configured_lines = move.line_ids.filtered(
-                lambda line: line.account_id.id not in cash_account_ids
-                and line.account_id.include_in_cash_flow
-                and line.balance
+        if cash_accounts:
+            self.env["account.move.line"].flush_model()
+            self.env.cr.execute(
+                self._get_cash_flow_allocations_query(
+                    company, date_from, date_to, cash_accounts
+                )
             )
-            if not configured_lines:
+            rows = self.env.cr.dictfetchall()
+        else:
+            rows = []
+        accounts = self.env["account.account"].browse(
+            {row["account_id"] for row in rows}
+        ).with_company(company)
+        accounts.fetch(
+            [
+                "code",
+                "name",
+                "cash_flow_display_name",
+                "cash_flow_credit_behavior",
+                "cash_flow_debit_behavior",
+            ]
+        )
+        for row in rows:
+            account = accounts.browse(row["account_id"])
+            if row["is_credit"]:
+                behavior = account.cash_flow_credit_behavior
+            else:
+                behavior = account.cash_flow_debit_behavior
+            if not behavior:
                 continue
 
-            total_weight = sum(abs(line.balance) for line in configured_lines) or len(
-                configured_lines
-            )
-            pending = abs(cash_delta)
-            for index, line in enumerate(configured_lines, start=1):
-                account = line.account_id
-                if index == len(configured_lines):
-                    current_amount = pending
-                else:
-                    weight = abs(line.balance) or 1.0
-                    current_amount = abs(cash_delta) * weight / total_weight
-                    pending -= current_amount
-
-                behavior = False
-                if line.credit:
-                    behavior = account.cash_flow_credit_behavior
-                elif line.debit:
-                    behavior = account.cash_flow_debit_behavior
-
-                if not behavior:
-                    continue
-
-                display_name = self._get_cash_flow_display_name(account)
-                detail_name = f"{account.code or ''} {account.name or ''}".strip()
-                if behavior == "income" and cash_delta > 0:
-                    self._add_group_amount(
-                        income_groups,
-                        f"income_label_{display_name}",
-                        display_name,
-                        current_amount,
-                        detail_name,
-                    )
-                elif behavior == "expense" and cash_delta < 0:
-                    self._add_group_amount(
-                        expense_groups,
-                        f"expense_label_{display_name}",
-                        display_name,
-                        current_amount,
-                        detail_name,
-                    )
+            display_name = self._get_cash_flow_display_name(account)
+            detail_name = f"{account.code or ''} {account.name or ''}".strip()
+            if behavior == "income" and row["is_inflow"]:
+                self._add_group_amount(
+                    income_groups,
+                    f"income_label_{display_name}",
+                    display_name,
+                    row["amount"],
+                    detail_name,
+                )
+            elif behavior == "expense" and not row["is_inflow"]:
+                self._add_group_amount(
+                    expense_groups,
+                    f"expense_label_{display_name}",
+                    display_name,
+                    row["amount"],
+                    detail_name,
+                )
 
         return {
             "income_lines": self._prepare_grouped_lines(income_groups),